@@ -45,6 +45,14 @@ def main():
     except Exception as e:
         print_error(f"Failed to list VMs: {e}")
     
+    # Stream VM templates as each node responds
+    try:
+        for vm in client.iter_vms():
+            if vm.is_template:
+                print_success(f"Template {vm['vmid']} ({vm.get('name')}) on {vm['node']}")
+    except Exception as e:
+        print_error(f"Failed to list templates: {e}")
+    
     # List all containers
     try:
         containers = client.get_containers()
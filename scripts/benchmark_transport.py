@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Benchmark the requests (HTTP/1.1) and httpx (HTTP/2) transports.
+
+Starts a local TLS server that speaks HTTP/1.1 and HTTP/2 (ALPN) and
+emulates the Proxmox endpoints used by `vm list`: /nodes plus one
+/nodes/{node}/qemu listing per node with artificial latency. Each transport
+then runs the same concurrent fan-out.
+
+Requires: pip install -e ".[http2]" hypercorn, and the openssl binary.
+
+Usage: python scripts/benchmark_transport.py [--nodes 40] [--workers 40] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from proxmox_cli.client import TRANSPORTS, ProxmoxClient
+
+
+def make_app(nodes, guests, latency):
+    """Build an ASGI app serving fake /nodes and /nodes/{node}/qemu listings."""
+    node_list = json.dumps({"data": [{"node": f"pve{i}"} for i in range(nodes)]}).encode()
+    guest_list = json.dumps(
+        {"data": [{"vmid": 100 + i, "name": f"vm-{i}", "status": "running"} for i in range(guests)]}
+    ).encode()
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        path = scope["path"]
+        if path.endswith("/nodes"):
+            body = node_list
+        elif path.endswith("/qemu"):
+            await asyncio.sleep(latency)
+            body = guest_list
+        else:
+            body = b'{"data": null}'
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def start_server(app, certfile, keyfile, port):
+    """Run hypercorn in a background thread; returns a stop callback."""
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.certfile = certfile
+    config.keyfile = keyfile
+    config.alpn_protocols = ["h2", "http/1.1"]
+    config.loglevel = "WARNING"
+
+    loop = asyncio.new_event_loop()
+    stop = asyncio.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(serve(app, config, shutdown_trigger=stop.wait))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    time.sleep(1.0)
+
+    def shutdown():
+        loop.call_soon_threadsafe(stop.set)
+        thread.join(timeout=5)
+
+    return shutdown
+
+
+def self_signed_cert(directory):
+    """Create a throwaway self-signed certificate with openssl."""
+    certfile, keyfile = str(Path(directory) / "cert.pem"), str(Path(directory) / "key.pem")
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=127.0.0.1",
+            "-keyout",
+            keyfile,
+            "-out",
+            certfile,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return certfile, keyfile
+
+
+def run_transport(transport, port, workers, rounds):
+    """Time `get_vms` fan-outs through one transport."""
+    client = ProxmoxClient(
+        f"127.0.0.1:{port}",
+        "root@pam",
+        token_name="bench",
+        token_value="secret",
+        verify_ssl=False,
+        max_workers=workers,
+        transport=transport,
+    )
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        vms = client.get_vms()
+        timings.append(time.perf_counter() - started)
+    return len(vms), timings, client.stats.to_dict()
+
+
+def main():
+    """Run the benchmark and print one line per transport."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=40)
+    parser.add_argument("--guests", type=int, default=50, help="Guests per node")
+    parser.add_argument("--latency", type=float, default=0.02, help="Per-node delay (s)")
+    parser.add_argument("--workers", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--port", type=int, default=18006)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        certfile, keyfile = self_signed_cert(directory)
+        shutdown = start_server(
+            make_app(args.nodes, args.guests, args.latency), certfile, keyfile, args.port
+        )
+        try:
+            for transport in TRANSPORTS:
+                count, timings, stats = run_transport(
+                    transport, args.port, args.workers, args.rounds
+                )
+                print(
+                    f"{transport:>8}: {count} VMs, "
+                    f"first {timings[0] * 1000:.1f} ms, "
+                    f"best {min(timings) * 1000:.1f} ms, "
+                    f"mean {sum(timings) / len(timings) * 1000:.1f} ms  {stats}"
+                )
+        finally:
+            shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,9 @@ setup(
         "tabulate>=0.9.0",
     ],
     extras_require={
+        "http2": [
+            "httpx[http2]>=0.24.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
@@ -0,0 +1,647 @@
+"""Asyncio Proxmox API client.
+
+Mirrors :class:`proxmox_cli.client.ProxmoxClient` for applications running an
+event loop. Requests go through one ``httpx.AsyncClient`` (HTTP/2 when
+available) and a semaphore bounds how many are in flight, so thousands of
+concurrent operations can be scheduled without exhausting connections or
+overloading pveproxy.
+
+Requires the optional ``http2`` extra (``pip install 'proxmox-cli[http2]'``).
+
+Example::
+
+    async with AsyncProxmoxClient("pve1", "root@pam", token_name="ci",
+                                  token_value="...") as client:
+        vms = await client.get_vms()
+        config = await client.api.nodes("pve1").qemu(100).config.get()
+"""
+
+import asyncio
+import time
+from http.client import responses
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from proxmoxer import AuthenticationError, ResourceException
+
+from proxmox_cli.client import TEMPLATE_STORAGE_TYPES
+from proxmox_cli.models import Guest, Node, Storage, Template, resource_from_api
+from proxmox_cli.utils.filters import Filter
+
+# Default maximum number of requests in flight
+DEFAULT_MAX_CONCURRENCY = 64
+
+# Seconds before a ticket is renewed (tickets are valid for two hours)
+TICKET_RENEW_AGE = 3600
+
+
+class AsyncProxmoxResource:
+    """Async path builder, e.g. ``await client.api.nodes("pve1").qemu.get()``."""
+
+    def __init__(self, client: "AsyncProxmoxClient", path: str = ""):
+        """Initialize resource.
+
+        Args:
+            client: Owning client
+            path: API path relative to /api2/json
+        """
+        self._client = client
+        self._path = path
+
+    def __getattr__(self, item: str) -> "AsyncProxmoxResource":
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return AsyncProxmoxResource(self._client, f"{self._path}/{item}")
+
+    def __call__(self, *resource_id: Any) -> "AsyncProxmoxResource":
+        if not resource_id or resource_id == ("",):
+            return self
+        parts = "/".join(str(r) for r in resource_id)
+        return AsyncProxmoxResource(self._client, f"{self._path}/{parts}")
+
+    def __repr__(self) -> str:
+        return f"AsyncProxmoxResource({self._path or '/'})"
+
+    async def get(self, **params: Any) -> Any:
+        """Send a GET request."""
+        return await self._client.request("GET", self._path, params=params)
+
+    async def post(self, **data: Any) -> Any:
+        """Send a POST request."""
+        return await self._client.request("POST", self._path, data=data)
+
+    async def put(self, **data: Any) -> Any:
+        """Send a PUT request."""
+        return await self._client.request("PUT", self._path, data=data)
+
+    async def delete(self, **params: Any) -> Any:
+        """Send a DELETE request."""
+        return await self._client.request("DELETE", self._path, params=params)
+
+    # proxmoxer aliases
+    create = post
+    set = put
+
+
+class AsyncProxmoxClient:
+    """Asyncio client for the Proxmox API."""
+
+    def __init__(
+        self,
+        host: str,
+        user: str,
+        password: Optional[str] = None,
+        token_name: Optional[str] = None,
+        token_value: Optional[str] = None,
+        verify_ssl: bool = True,
+        timeout: int = 30,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        http2: bool = True,
+        **httpx_options: Any,
+    ):
+        """Initialize async Proxmox client.
+
+        Password authentication logs in on the first request (or on entering
+        ``async with``).
+
+        Args:
+            host: Proxmox host address, optionally with ':port' (default 8006)
+            user: Username for authentication
+            password: Password for authentication (optional if using token)
+            token_name: API token name (optional)
+            token_value: API token value (optional)
+            verify_ssl: Whether to verify SSL certificate
+            timeout: Request timeout in seconds
+            max_concurrency: Maximum requests in flight at once
+            http2: Negotiate HTTP/2
+            **httpx_options: Extra keyword arguments for httpx.AsyncClient
+
+        Raises:
+            ValueError: If no credentials are given
+            ImportError: If httpx is not installed
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "AsyncProxmoxClient requires httpx: pip install 'proxmox-cli[http2]'"
+            ) from None
+
+        if not (token_name and token_value) and not password:
+            raise ValueError("Either password or token credentials must be provided")
+
+        self.host = host
+        self.user = user
+        self.verify_ssl = verify_ssl
+
+        if ":" not in host.strip("[]") or host.endswith("]"):
+            host = f"{host}:8006"
+        self.base_url = f"https://{host}/api2/json"
+
+        self._password = password
+        self._ticket: Optional[str] = None
+        self._csrf_token: Optional[str] = None
+        self._ticket_time = 0.0
+        # Created on first use so they bind to the running event loop
+        self._login_lock: Optional[asyncio.Lock] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.max_concurrency = max_concurrency
+
+        headers = {"Accept": "application/json"}
+        if token_name and token_value:
+            headers["Authorization"] = f"PVEAPIToken={user}!{token_name}={token_value}"
+
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                http2 = False
+
+        self._http = httpx.AsyncClient(
+            http2=http2,
+            verify=verify_ssl,
+            timeout=timeout,
+            headers=headers,
+            limits=httpx.Limits(max_connections=max_concurrency),
+            **httpx_options,
+        )
+        self.api = AsyncProxmoxResource(self)
+
+    async def __aenter__(self) -> "AsyncProxmoxClient":
+        if self._password:
+            await self._login()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._http.aclose()
+
+    async def _login(self) -> None:
+        """Get a new authentication ticket, or renew the current one."""
+        if self._login_lock is None:
+            self._login_lock = asyncio.Lock()
+        async with self._login_lock:
+            if self._ticket and time.monotonic() - self._ticket_time < TICKET_RENEW_AGE:
+                return
+            response = await self._http.post(
+                f"{self.base_url}/access/ticket",
+                data={"username": self.user, "password": self._ticket or self._password},
+            )
+            if response.status_code != 200:
+                raise AuthenticationError(
+                    f"Couldn't authenticate user: {self.user} to {self.base_url}/access/ticket "
+                    f"code: {response.status_code}"
+                )
+            data = response.json()["data"]
+            self._ticket = data["ticket"]
+            self._csrf_token = data["CSRFPreventionToken"]
+            self._ticket_time = time.monotonic()
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Send an API request, waiting for a free concurrency slot.
+
+        Args:
+            method: HTTP method
+            path: API path relative to /api2/json
+            params: Query parameters
+            data: Form data
+
+        Returns:
+            The response's 'data' member
+
+        Raises:
+            ResourceException: On HTTP error responses
+        """
+        headers = {}
+        if self._password:
+            if not self._ticket or time.monotonic() - self._ticket_time >= TICKET_RENEW_AGE:
+                await self._login()
+            headers["Cookie"] = f"PVEAuthCookie={self._ticket}"
+            if method != "GET":
+                headers["CSRFPreventionToken"] = self._csrf_token
+
+        # None values are dropped, as proxmoxer does
+        params = {k: v for k, v in (params or {}).items() if v is not None} or None
+        data = {k: v for k, v in (data or {}).items() if v is not None} or None
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            response = await self._http.request(
+                method, f"{self.base_url}{path}", params=params, data=data, headers=headers
+            )
+
+        if response.status_code >= 400:
+            try:
+                errors = response.json().get("errors")
+            except ValueError:
+                errors = None
+            raise ResourceException(
+                response.status_code,
+                # Proxy statuses such as 595 (no route to node) are not in HTTPStatus
+                responses.get(response.status_code, "Unknown"),
+                response.reason_phrase or response.text,
+                errors=errors,
+            )
+        try:
+            return response.json()["data"]
+        except ValueError:
+            return {"errors": response.content}
+
+    async def get_version(self) -> Dict[str, Any]:
+        """Get Proxmox version information.
+
+        Returns:
+            Version information dictionary
+        """
+        return await self.api.version.get()
+
+    async def get_cluster_status(self) -> list:
+        """Get cluster status.
+
+        Returns:
+            List of cluster status information
+        """
+        return await self.api.cluster.status.get()
+
+    async def get_nodes(self) -> list:
+        """Get list of nodes in the cluster.
+
+        Returns:
+            List of Node records
+        """
+        return [Node.from_api(n) for n in await self.api.nodes.get()]
+
+    async def get_storage(self) -> list:
+        """Get cluster storage definitions.
+
+        Returns:
+            List of Storage records
+        """
+        return [Storage.from_api(s) for s in await self.api.storage.get()]
+
+    async def get_cluster_resources(self, resource_type: Optional[str] = None) -> list:
+        """Get cluster-wide resource list in a single request.
+
+        Args:
+            resource_type: Optional resource type filter (vm, node, storage, sdn)
+
+        Returns:
+            List of Guest, Node and Storage records (other types stay dicts)
+        """
+        resources = await self.api.cluster.resources.get(type=resource_type)
+        return [resource_from_api(r) for r in resources]
+
+    async def _node_names(self, node: Optional[str], where: Optional[Filter]) -> List[str]:
+        """Get the nodes to query: the requested one, or all nodes the filter allows."""
+        if node:
+            return [node]
+        node_names = [n["node"] for n in await self.get_nodes()]
+        if where is not None:
+            node_names = [n for n in node_names if where.matches_node(n)]
+        return node_names
+
+    async def iter_vms(
+        self, node: Optional[str] = None, where: Optional[Filter] = None
+    ) -> AsyncIterator[Guest]:
+        """Iterate virtual machines as each node responds.
+
+        Args:
+            node: Optional node name to filter VMs
+            where: Optional compiled filter; nodes that cannot match are not queried
+
+        Yields:
+            Guest records
+        """
+        async for guest in self._iter_guests("qemu", node, where):
+            yield guest
+
+    async def iter_containers(
+        self, node: Optional[str] = None, where: Optional[Filter] = None
+    ) -> AsyncIterator[Guest]:
+        """Iterate LXC containers as each node responds.
+
+        Args:
+            node: Optional node name to filter containers
+            where: Optional compiled filter; nodes that cannot match are not queried
+
+        Yields:
+            Guest records
+        """
+        async for guest in self._iter_guests("lxc", node, where):
+            yield guest
+
+    async def _iter_guests(
+        self, kind: str, node: Optional[str], where: Optional[Filter]
+    ) -> AsyncIterator[Guest]:
+        """Iterate guests of one kind from all nodes concurrently, in completion order."""
+
+        async def fetch(node_name):
+            try:
+                return node_name, await getattr(self.api.nodes(node_name), kind).get(), None
+            except Exception as e:
+                return node_name, None, e
+
+        tasks = [asyncio.ensure_future(fetch(n)) for n in await self._node_names(node, where)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                node_name, node_guests, error = await next_done
+                if error is not None:
+                    if node:
+                        raise error
+                    # Skip nodes that fail to respond (offline, network issues, etc.)
+                    continue
+                for data in node_guests:
+                    guest = Guest.from_api(data)
+                    guest.setdefault("node", node_name)
+                    if where is None or where(guest):
+                        yield guest
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def get_vms(self, node: Optional[str] = None, where: Optional[Filter] = None) -> list:
+        """Get list of virtual machines.
+
+        Args:
+            node: Optional node name to filter VMs
+            where: Optional compiled filter; nodes that cannot match are not queried
+
+        Returns:
+            List of Guest records
+        """
+        return [vm async for vm in self.iter_vms(node=node, where=where)]
+
+    async def get_containers(
+        self, node: Optional[str] = None, where: Optional[Filter] = None
+    ) -> list:
+        """Get list of LXC containers.
+
+        Args:
+            node: Optional node name to filter containers
+            where: Optional compiled filter; nodes that cannot match are not queried
+
+        Returns:
+            List of Guest records
+        """
+        return [ct async for ct in self.iter_containers(node=node, where=where)]
+
+    async def get_pools(self) -> list:
+        """Get list of resource pools.
+
+        Returns:
+            List of resource pool information dictionaries
+        """
+        return await self.api.pools.get()
+
+    async def get_pool(self, poolid: str) -> Dict[str, Any]:
+        """Get resource pool details.
+
+        Args:
+            poolid: Pool identifier
+
+        Returns:
+            Pool information dictionary including members
+        """
+        return await self.api.pools(poolid).get()
+
+    async def create_pool(self, poolid: str, comment: Optional[str] = None) -> None:
+        """Create a new resource pool.
+
+        Args:
+            poolid: Pool identifier
+            comment: Optional comment/description
+        """
+        await self.api.pools.post(poolid=poolid, comment=comment)
+
+    async def update_pool(self, poolid: str, comment: Optional[str] = None) -> None:
+        """Update resource pool information.
+
+        Args:
+            poolid: Pool identifier
+            comment: Optional comment/description
+        """
+        if comment:
+            await self.api.pools(poolid).put(comment=comment)
+
+    async def delete_pool(self, poolid: str) -> None:
+        """Delete a resource pool.
+
+        Args:
+            poolid: Pool identifier
+        """
+        await self.api.pools(poolid).delete()
+
+    async def add_pool_members(
+        self, poolid: str, vms: Optional[list] = None, storages: Optional[list] = None
+    ) -> None:
+        """Add members to a resource pool.
+
+        Args:
+            poolid: Pool identifier
+            vms: Optional list of VM IDs
+            storages: Optional list of storage IDs
+        """
+        update_data = {}
+        if vms:
+            update_data["vms"] = ",".join(str(vm) for vm in vms)
+        if storages:
+            update_data["storage"] = ",".join(storages)
+        if update_data:
+            await self.api.pools(poolid).put(**update_data)
+
+    async def remove_pool_members(
+        self, poolid: str, vms: Optional[list] = None, storages: Optional[list] = None
+    ) -> None:
+        """Remove members from a resource pool.
+
+        Args:
+            poolid: Pool identifier
+            vms: Optional list of VM IDs
+            storages: Optional list of storage IDs
+        """
+        delete_data = {"delete": 1}
+        if vms:
+            delete_data["vms"] = ",".join(str(vm) for vm in vms)
+        if storages:
+            delete_data["storage"] = ",".join(storages)
+        if len(delete_data) > 1:
+            await self.api.pools(poolid).put(**delete_data)
+
+    async def get_storage_content(
+        self, node: str, storage: str, content_type: Optional[str] = None
+    ) -> list:
+        """Get storage content list.
+
+        Args:
+            node: Node name
+            storage: Storage identifier
+            content_type: Optional content type filter (vztmpl, iso, backup, etc.)
+
+        Returns:
+            List of storage content items
+        """
+        return await self.api.nodes(node).storage(storage).content.get(content=content_type)
+
+    async def get_container_templates(
+        self,
+        node: Optional[str] = None,
+        storage: Optional[str] = None,
+        where: Optional[Filter] = None,
+    ) -> list:
+        """Get available LXC container templates from all nodes and storages concurrently.
+
+        Args:
+            node: Optional node name to filter templates
+            storage: Optional storage name to filter templates
+            where: Optional compiled filter; nodes that cannot match are not queried
+
+        Returns:
+            List of Template records
+        """
+
+        async def node_templates(node_name):
+            try:
+                storages = await self.api.nodes(node_name).storage.get()
+            except Exception:
+                if node:
+                    raise
+                return []
+            pairs = [
+                s["storage"]
+                for s in storages
+                if (not storage or s["storage"] == storage)
+                and s.get("type", "") in TEMPLATE_STORAGE_TYPES
+            ]
+            contents = await asyncio.gather(
+                *(self.get_storage_content(node_name, name, "vztmpl") for name in pairs),
+                return_exceptions=True,
+            )
+            templates = []
+            for storage_name, content in zip(pairs, contents):
+                if isinstance(content, BaseException):
+                    if node and storage:
+                        raise content
+                    continue
+                for item in content:
+                    template = Template(
+                        volid=item.get("volid"),
+                        storage=storage_name,
+                        node=node_name,
+                        size=item.get("size", 0),
+                        format=item.get("format", ""),
+                    )
+                    if where is None or where(template):
+                        templates.append(template)
+            return templates
+
+        results = await asyncio.gather(
+            *(node_templates(n) for n in await self._node_names(node, where))
+        )
+        return [template for templates in results for template in templates]
+
+    async def download_container_template(
+        self, node: str, storage: str, template: str
+    ) -> Dict[str, Any]:
+        """Download a container template from a repository.
+
+        Args:
+            node: Node name where to download the template
+            storage: Storage identifier where to store the template
+            template: Template name
+
+        Returns:
+            Task information dictionary
+        """
+        return await self.api.nodes(node).aplinfo.post(storage=storage, template=template)
+
+    async def get_available_templates(self, node: str) -> list:
+        """Get list of available templates that can be downloaded.
+
+        Args:
+            node: Node name
+
+        Returns:
+            List of available template information
+        """
+        return await self.api.nodes(node).aplinfo.get()
+
+    async def create_container(
+        self,
+        node: str,
+        vmid: int,
+        ostemplate: str,
+        hostname: Optional[str] = None,
+        password: Optional[str] = None,
+        storage: str = "local-lvm",
+        memory: int = 512,
+        cores: int = 1,
+        rootfs_size: int = 8,
+        **kwargs,
+    ) -> str:
+        """Create a new LXC container.
+
+        Args:
+            node: Node name where to create the container
+            vmid: Container ID
+            ostemplate: Template volume ID
+            hostname: Container hostname
+            password: Root password
+            storage: Storage for container root filesystem
+            memory: Memory in MB
+            cores: Number of CPU cores
+            rootfs_size: Root filesystem size in GB
+            **kwargs: Additional parameters
+
+        Returns:
+            Task ID (UPID)
+        """
+        container_data = {
+            "vmid": vmid,
+            "ostemplate": ostemplate,
+            "storage": storage,
+            "memory": memory,
+            "cores": cores,
+            "rootfs": f"{storage}:{rootfs_size}",
+            "hostname": hostname,
+            "password": password,
+        }
+        container_data.update(kwargs)
+        return await self.api.nodes(node).lxc.post(**container_data)
+
+    async def create_storage(
+        self,
+        storage_id: str,
+        storage_type: str,
+        path: str,
+        content: Optional[str] = None,
+        nodes: Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        """Create a new storage.
+
+        Args:
+            storage_id: Storage identifier/name
+            storage_type: Storage type (dir, nfs, cifs, lvm, etc.)
+            path: Storage path on the filesystem
+            content: Content types (comma-separated)
+            nodes: Comma-separated list of nodes (optional, defaults to all nodes)
+            **kwargs: Additional storage-specific parameters
+        """
+        storage_data = {
+            "storage": storage_id,
+            "type": storage_type,
+            "path": path,
+            "content": content,
+            "nodes": nodes,
+        }
+        storage_data.update(kwargs)
+        await self.api.storage.post(**storage_data)
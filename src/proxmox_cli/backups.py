@@ -0,0 +1,529 @@
+"""Backup catalog built from one concurrent scan of the backup storages.
+
+Storages whose content includes ``backup`` are found from the cluster
+storage definitions. Each shared storage (NFS, CIFS, PBS, ...) is listed once
+through one online node; node-local storages are listed on every node that
+has them. All listings run concurrently, and the archives are indexed by
+guest and time so listing, filtering and latest-per-guest queries are answered
+locally.
+
+Listings can be cached on disk per storage (``backups-<cluster>.json`` in the
+cache directory) and reused while younger than a given age.
+"""
+
+import calendar
+import datetime
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from proxmox_cli.config import cache_dir, cache_lock, write_private
+from proxmox_cli.inventory import DEFAULT_NAME
+from proxmox_cli.models import Backup
+from proxmox_cli.session import TokenBucket
+from proxmox_cli.utils.concurrency import DEFAULT_MAX_WORKERS, fan_out
+from proxmox_cli.utils.filters import Filter
+from proxmox_cli.utils.helpers import split_list
+
+# Storage content type holding backup archives
+BACKUP_CONTENT = "backup"
+
+# Network storage types that are shared whether or not 'shared' is set
+SHARED_STORAGE_TYPES = ("nfs", "cifs", "glusterfs", "cephfs", "pbs")
+
+# Retention options of the 'prune-backups' storage setting, in the order they apply
+KEEP_OPTIONS = (
+    "keep-last",
+    "keep-hourly",
+    "keep-daily",
+    "keep-weekly",
+    "keep-monthly",
+    "keep-yearly",
+)
+
+# Bumped whenever the cache layout changes
+CACHE_VERSION = 1
+
+# vzdump archive names: vzdump-qemu-100-2024_01_31-02_00_05.vma.zst
+_VZDUMP_RE = re.compile(
+    r"vzdump-(?P<type>qemu|lxc|openvz)-(?P<vmid>\d+)-(?P<time>\d{4}_\d\d_\d\d-\d\d_\d\d_\d\d)"
+)
+
+# Proxmox Backup Server snapshots: backup/vm/100/2024-01-31T02:00:05Z
+_PBS_RE = re.compile(
+    r"backup/(?P<type>vm|ct)/(?P<vmid>\d+)/(?P<time>\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ)"
+)
+
+_SUBTYPES = {"vm": "qemu", "ct": "lxc", "openvz": "lxc"}
+
+
+class RetentionError(ValueError):
+    """Raised when a prune-backups specification cannot be parsed."""
+
+
+def parse_volid(volid: str) -> Optional[Tuple[str, int, int]]:
+    """Get the guest type, id and creation time encoded in a backup volume id.
+
+    Older servers do not return 'vmid' and 'ctime' for every archive.
+
+    Args:
+        volid: Volume identifier
+
+    Returns:
+        (subtype, vmid, ctime) or None if the name is not recognised
+    """
+    match = _VZDUMP_RE.search(volid)
+    if match:
+        # vzdump names use the node's local time
+        ctime = int(time.mktime(time.strptime(match["time"], "%Y_%m_%d-%H_%M_%S")))
+    else:
+        match = _PBS_RE.search(volid)
+        if not match:
+            return None
+        ctime = calendar.timegm(time.strptime(match["time"], "%Y-%m-%dT%H:%M:%SZ"))
+    return _SUBTYPES.get(match["type"], match["type"]), int(match["vmid"]), ctime
+
+
+def is_shared(storage: Any) -> bool:
+    """Whether a storage definition has the same content on every node."""
+    return bool(int(storage.get("shared") or 0)) or storage.get("type") in SHARED_STORAGE_TYPES
+
+
+def backup_targets(
+    storages: Iterable[Any],
+    nodes: Iterable[str],
+    node: Optional[str] = None,
+    storage: Optional[str] = None,
+) -> List[Tuple[str, str, str]]:
+    """Choose the (node, storage) listings that cover every backup storage once.
+
+    Args:
+        storages: Cluster storage definitions
+        nodes: Online node names
+        node: Only storages visible from this node
+        storage: Only this storage
+
+    Returns:
+        List of (cache key, node, storage); the key is the storage id for shared
+        storages and 'node/storage' for node-local ones
+    """
+    online = sorted(nodes)
+    targets = []
+    for definition in storages:
+        name = definition["storage"]
+        if storage and name != storage:
+            continue
+        if BACKUP_CONTENT not in split_list(definition.get("content")):
+            continue
+        if int(definition.get("disable") or 0):
+            continue
+        # 'nodes' restricts a storage to some nodes; empty means all
+        restricted = split_list(definition.get("nodes"))
+        allowed = [n for n in online if not restricted or n in restricted]
+        if node:
+            allowed = [n for n in allowed if n == node]
+        if not allowed:
+            continue
+        if is_shared(definition):
+            targets.append((name, allowed[0], name))
+        else:
+            targets.extend((f"{n}/{name}", n, name) for n in allowed)
+    return targets
+
+
+def _to_backup(item: Dict[str, Any], node: str, storage: str) -> Backup:
+    backup = Backup.from_api(item)
+    backup["node"] = node
+    backup["storage"] = storage
+    if backup.get("vmid") is None or backup.get("ctime") is None:
+        parsed = parse_volid(backup.get("volid") or "")
+        if parsed:
+            subtype, vmid, ctime = parsed
+            backup.setdefault("subtype", subtype)
+            if backup.get("vmid") is None:
+                backup["vmid"] = vmid
+            if backup.get("ctime") is None:
+                backup["ctime"] = ctime
+    if backup.get("vmid") is not None:
+        backup["vmid"] = int(backup["vmid"])
+    return backup
+
+
+class BackupCache:
+    """On-disk cache of backup storage listings, keyed by storage."""
+
+    def __init__(self, cluster: Optional[str] = None):
+        """Initialize cache.
+
+        Args:
+            cluster: Profile name, or None for the default connection
+        """
+        self.path: Path = cache_dir() / f"backups-{cluster or DEFAULT_NAME}.json"
+
+    def load(self) -> Dict[str, Any]:
+        """Read the cache file.
+
+        Returns:
+            Mapping of storage key -> {'updated': timestamp, 'items': [...]},
+            empty if the file is missing, unreadable or from another version
+        """
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("storages") or {}
+
+    def fresh(self, max_age: float) -> Dict[str, List[Dict[str, Any]]]:
+        """Get the listings younger than max_age seconds.
+
+        Args:
+            max_age: Maximum age in seconds
+
+        Returns:
+            Mapping of storage key -> archive dictionaries
+        """
+        now = time.time()
+        return {
+            key: entry["items"]
+            for key, entry in self.load().items()
+            if now - entry.get("updated", 0) <= max_age
+        }
+
+    def update(
+        self,
+        listings: Dict[str, List[Dict[str, Any]]],
+        invalidate: Iterable[str] = (),
+    ) -> None:
+        """Store fresh listings and drop stale ones.
+
+        Write errors are ignored; the cache only saves requests.
+
+        Args:
+            listings: Mapping of storage key -> archive dictionaries
+            invalidate: Storage keys to drop (e.g. after archives were removed)
+        """
+        with cache_lock(self.path):
+            storages = self.load()
+            now = time.time()
+            for key in invalidate:
+                storages.pop(key, None)
+            for key, items in listings.items():
+                storages[key] = {"updated": now, "items": items}
+            try:
+                text = json.dumps({"version": CACHE_VERSION, "storages": storages})
+                write_private(self.path, text)
+            except OSError:
+                pass
+
+
+class BackupCatalog:
+    """Backup archives indexed by guest, newest first."""
+
+    def __init__(self, archives: Iterable[Backup], storages: Iterable[Any] = ()):
+        """Index archives.
+
+        Args:
+            archives: Backup records with 'vmid' and 'ctime'
+            storages: Storage definitions, for their 'prune-backups' settings
+        """
+        self.storages = {s["storage"]: s for s in storages}
+        self.by_vmid: Dict[Optional[int], List[Backup]] = {}
+        for archive in archives:
+            self.by_vmid.setdefault(archive.get("vmid"), []).append(archive)
+        for history in self.by_vmid.values():
+            history.sort(key=lambda a: a.get("ctime") or 0, reverse=True)
+
+    def __len__(self) -> int:
+        return sum(len(history) for history in self.by_vmid.values())
+
+    def __iter__(self) -> Iterator[Backup]:
+        for vmid in self.vmids():
+            yield from self.by_vmid[vmid]
+
+    def vmids(self) -> List[Optional[int]]:
+        """Get the guest ids that have backups (unrecognised archives last)."""
+        return sorted(self.by_vmid, key=lambda v: (v is None, v or 0))
+
+    def history(self, vmid: int) -> List[Backup]:
+        """Get one guest's archives, newest first."""
+        return list(self.by_vmid.get(vmid, []))
+
+    def latest(self, vmid: int) -> Optional[Backup]:
+        """Get one guest's newest archive, or None."""
+        history = self.by_vmid.get(vmid)
+        return history[0] if history else None
+
+    def query(
+        self,
+        vmids: Optional[Iterable[int]] = None,
+        where: Optional[Filter] = None,
+        latest: bool = False,
+    ) -> Iterator[Backup]:
+        """Iterate archives by guest id, newest first within each guest.
+
+        Args:
+            vmids: Only these guests
+            where: Optional compiled filter on archive fields
+            latest: Only the newest matching archive of each guest
+
+        Yields:
+            Backup records
+        """
+        wanted = set(vmids) if vmids else None
+        for vmid in self.vmids():
+            if wanted is not None and vmid not in wanted:
+                continue
+            for archive in self.by_vmid[vmid]:
+                if where is None or where(archive):
+                    yield archive
+                    if latest:
+                        break
+
+    def groups(self) -> Dict[Tuple[Any, Any, Any], List[Backup]]:
+        """Group archives into backup groups (one guest on one storage), newest first.
+
+        Returns:
+            Mapping of (storage key, guest type, vmid) -> archives
+        """
+        groups: Dict[Tuple[Any, Any, Any], List[Backup]] = {}
+        for archive in self:
+            group = (archive.get("key"), archive.get("subtype"), archive.get("vmid"))
+            groups.setdefault(group, []).append(archive)
+        return groups
+
+
+def scan_catalog(
+    client: Any,
+    node: Optional[str] = None,
+    storage: Optional[str] = None,
+    cache: Optional[BackupCache] = None,
+    max_age: float = 0,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> BackupCatalog:
+    """List every backup storage once, concurrently, and index the archives.
+
+    Args:
+        client: ProxmoxClient instance
+        node: Only storages visible from this node
+        storage: Only this storage
+        cache: Optional listing cache
+        max_age: Reuse cached listings younger than this many seconds
+        max_workers: Maximum concurrent requests
+
+    Returns:
+        BackupCatalog instance
+
+    Raises:
+        Exception: If the one listing asked for by node and storage fails
+    """
+    reads = {"storages": client.get_storage, "nodes": client.get_nodes}
+    data = {}
+    for name, result, error in fan_out(lambda name: reads[name](), list(reads), 2):
+        if error is not None:
+            raise error
+        data[name] = result
+    online = [n["node"] for n in data["nodes"] if n.get("status", "online") == "online"]
+    targets = backup_targets(data["storages"], online, node, storage)
+
+    cached = cache.fresh(max_age) if cache is not None and max_age > 0 else {}
+    listings = {key: cached[key] for key, _, _ in targets if key in cached}
+    missing = [target for target in targets if target[0] not in listings]
+
+    def fetch(target):
+        return client.get_storage_content(target[1], target[2], content_type=BACKUP_CONTENT)
+
+    fetched = {}
+    for (key, _, _), items, error in fan_out(fetch, missing, max_workers):
+        if error is not None:
+            if node and storage:
+                raise error
+            client.stats.incr("skipped_storages")
+            continue
+        fetched[key] = [dict(item) for item in items]
+    if cache is not None and max_age > 0 and fetched:
+        cache.update(fetched)
+    listings.update(fetched)
+
+    archives = []
+    for key, target_node, target_storage in targets:
+        for item in listings.get(key, []):
+            backup = _to_backup(item, target_node, target_storage)
+            backup["key"] = key
+            archives.append(backup)
+    return BackupCatalog(archives, data["storages"])
+
+
+def parse_retention(spec: Optional[str]) -> Dict[str, int]:
+    """Parse a prune-backups specification.
+
+    Args:
+        spec: Comma-separated options, e.g. 'keep-last=3,keep-weekly=2'
+
+    Returns:
+        Dictionary of option -> count
+
+    Raises:
+        RetentionError: If an option is unknown or its count is not a number
+    """
+    retention = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        key, _, value = part.partition("=")
+        key = key.strip()
+        if key not in KEEP_OPTIONS + ("keep-all",):
+            choices = ", ".join(("keep-all",) + KEEP_OPTIONS)
+            raise RetentionError(f"Unknown retention option '{key}' (choose from {choices})")
+        try:
+            retention[key] = int(value)
+        except ValueError:
+            raise RetentionError(f"Invalid count for {key}: {value!r}") from None
+        if retention[key] < 0:
+            raise RetentionError(f"Invalid count for {key}: {value!r}")
+    return retention
+
+
+def storage_retention(definition: Any) -> Dict[str, int]:
+    """Get the retention configured on a storage.
+
+    The deprecated 'maxfiles' setting counts as keep-last.
+
+    Args:
+        definition: Storage definition
+
+    Returns:
+        Dictionary of option -> count; empty keeps every archive
+    """
+    if definition.get("prune-backups"):
+        return parse_retention(definition["prune-backups"])
+    if int(definition.get("maxfiles") or 0):
+        return {"keep-last": int(definition["maxfiles"])}
+    return {}
+
+
+def _bucket(option: str, ctime: int) -> Any:
+    """Get the time bucket of an archive for one retention option."""
+    if option == "keep-last":
+        return ctime
+    t = time.localtime(ctime)
+    if option == "keep-hourly":
+        return t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour
+    if option == "keep-daily":
+        return t.tm_year, t.tm_mon, t.tm_mday
+    if option == "keep-weekly":
+        return tuple(datetime.date(t.tm_year, t.tm_mon, t.tm_mday).isocalendar()[:2])
+    if option == "keep-monthly":
+        return t.tm_year, t.tm_mon
+    return t.tm_year
+
+
+def mark_group(
+    archives: List[Backup], retention: Dict[str, int]
+) -> List[Tuple[Backup, str, Optional[str]]]:
+    """Simulate prune-backups on one backup group, like the Proxmox storage layer.
+
+    Options apply in KEEP_OPTIONS order, newest archive first. Each option
+    keeps the newest archive of up to N time buckets (hours, days, ISO weeks,
+    ...), skipping buckets already covered by an archive kept by an earlier
+    option. Protected archives are never removed and do not count towards any
+    option. Without any option, every archive is kept.
+
+    Args:
+        archives: Archives of one guest on one storage
+        retention: Dictionary of option -> count
+
+    Returns:
+        (archive, mark, option) tuples, newest first; mark is 'keep', 'remove'
+        or 'protected' and option is the retention option that kept it
+    """
+    ordered = sorted(archives, key=lambda a: a.get("ctime") or 0, reverse=True)
+    marks: Dict[int, Tuple[str, Optional[str]]] = {}
+    for index, archive in enumerate(ordered):
+        if archive.is_protected:
+            marks[index] = ("protected", None)
+
+    if retention.get("keep-all") or not any(retention.get(o) for o in KEEP_OPTIONS):
+        return [(a, *marks.get(i, ("keep", "keep-all"))) for i, a in enumerate(ordered)]
+
+    for option in KEEP_OPTIONS:
+        count = retention.get(option) or 0
+        if not count:
+            continue
+        buckets = [_bucket(option, archive.get("ctime") or 0) for archive in ordered]
+        covered = {buckets[i] for i, (mark, _) in marks.items() if mark == "keep"}
+        kept: set = set()
+        for index, bucket in enumerate(buckets):
+            if index in marks or bucket in covered:
+                continue
+            if bucket in kept:
+                marks[index] = ("remove", None)
+                continue
+            if len(kept) >= count:
+                break
+            kept.add(bucket)
+            marks[index] = ("keep", option)
+
+    return [(a, *marks.get(i, ("remove", None))) for i, a in enumerate(ordered)]
+
+
+def prune_plan(
+    catalog: BackupCatalog,
+    retention: Optional[Dict[str, int]] = None,
+    vmids: Optional[Iterable[int]] = None,
+) -> Iterator[Tuple[Backup, str, Optional[str]]]:
+    """Simulate pruning every backup group in a catalog.
+
+    Args:
+        catalog: BackupCatalog instance
+        retention: Retention for every storage (default: each storage's own
+            prune-backups setting)
+        vmids: Only these guests
+
+    Yields:
+        (archive, mark, option) tuples as returned by mark_group(); archives
+        whose names carry no guest id are marked 'renamed' and kept
+    """
+    wanted = set(vmids) if vmids else None
+    for (_, _, vmid), archives in catalog.groups().items():
+        if wanted is not None and vmid not in wanted:
+            continue
+        if vmid is None:
+            for archive in archives:
+                yield archive, "renamed", None
+            continue
+        rules = retention
+        if rules is None:
+            rules = storage_retention(catalog.storages.get(archives[0].get("storage"), {}))
+        yield from mark_group(archives, rules)
+
+
+def delete_archives(
+    client: Any,
+    archives: Iterable[Backup],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate: Optional[float] = None,
+) -> Iterator[Tuple[Backup, Any, Optional[BaseException]]]:
+    """Delete archives concurrently, at most rate deletions per second.
+
+    Args:
+        client: ProxmoxClient instance
+        archives: Archives to delete
+        max_workers: Maximum concurrent deletions
+        rate: Optional deletions per second across all workers
+
+    Yields:
+        (archive, result, error) tuples in completion order
+    """
+    bucket = TokenBucket(rate) if rate else None
+
+    def delete(archive):
+        if bucket is not None:
+            time.sleep(bucket.reserve())
+        return client.delete_storage_content(archive["node"], archive["storage"], archive["volid"])
+
+    return fan_out(delete, archives, max_workers)
@@ -1,25 +1,66 @@
 """Main CLI entry point for proxmox-cli."""
 
+import importlib
+
 import click
 
 from proxmox_cli import __version__
-from proxmox_cli.commands import (
-    acl,
-    backup,
-    container,
-    group,
-    image,
-    node,
-    pool,
-    role,
-    storage,
-    token,
-    user,
-    vm,
-)
+from proxmox_cli.completion import complete_clusters
+
+
+class LazyGroup(click.Group):
+    """Command group importing each subcommand's module on first use.
+
+    Running or completing one command only imports that command's module,
+    which keeps startup and shell completion fast.
+    """
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        """Initialize group.
+
+        Args:
+            lazy_subcommands: Mapping of command name -> 'module:attribute'
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        """List eager and lazy subcommand names."""
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        """Get a subcommand, importing its module if needed."""
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            module_name, attribute = self.lazy_subcommands[cmd_name].split(":")
+            module = importlib.import_module(module_name)
+            self.add_command(getattr(module, attribute), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+# Command groups, imported on demand
+COMMANDS = {
+    "vm": "proxmox_cli.commands.vm:vm",
+    "container": "proxmox_cli.commands.container:container",
+    "node": "proxmox_cli.commands.node:node",
+    "storage": "proxmox_cli.commands.storage:storage",
+    "backup": "proxmox_cli.commands.backup:backup",
+    "image": "proxmox_cli.commands.image:image",
+    # IAM command groups
+    "user": "proxmox_cli.commands.user:user",
+    "group": "proxmox_cli.commands.group:group",
+    "role": "proxmox_cli.commands.role:role",
+    "acl": "proxmox_cli.commands.acl:acl",
+    "token": "proxmox_cli.commands.token:token",
+    # Resource management
+    "pool": "proxmox_cli.commands.pool:pool",
+    # Monitoring
+    "top": "proxmox_cli.commands.top:top",
+    # Declarative state
+    "apply": "proxmox_cli.commands.apply:apply",
+}
 
 
-@click.group()
+@click.group(cls=LazyGroup, lazy_subcommands=COMMANDS)
 @click.version_option(version=__version__)
 @click.option(
     "--config",
@@ -31,15 +72,32 @@ from proxmox_cli.commands import (
 @click.option("--user", "-u", help="Proxmox user")
 @click.option("--password", "-p", help="Proxmox password")
 @click.option("--verify-ssl/--no-verify-ssl", default=None, help="Verify SSL certificate")
+@click.option(
+    "--cluster",
+    help="Cluster profile(s) from the config file: a name, a comma-separated list, or 'all'",
+    shell_complete=complete_clusters,
+)
 @click.option(
     "--output",
     "-o",
-    type=click.Choice(["table", "json", "yaml", "plain"], case_sensitive=False),
+    type=click.Choice(["table", "json", "yaml", "plain", "csv", "tsv"], case_sensitive=False),
     default="json",
     help="Output format (default: json)",
 )
+@click.option(
+    "--page-size",
+    type=click.IntRange(min=1),
+    help="Stream table output in pages of N rows, repeating the header",
+)
+@click.option("--limit", type=click.IntRange(min=0), help="Show at most N rows of list output")
+@click.option(
+    "--offset", type=click.IntRange(min=0), default=0, help="Skip the first N rows of list output"
+)
+@click.option("--stats", is_flag=True, help="Print HTTP request statistics to stderr on exit")
 @click.pass_context
-def main(ctx, config, host, user, password, verify_ssl, output):
+def main(
+    ctx, config, host, user, password, verify_ssl, cluster, output, page_size, limit, offset, stats
+):
     """Proxmox CLI - Command-line interface for Proxmox Virtual Environment."""
     ctx.ensure_object(dict)
     ctx.obj["config_path"] = config
@@ -47,26 +105,12 @@ def main(ctx, config, host, user, password, verify_ssl, output):
     ctx.obj["user"] = user
     ctx.obj["password"] = password
     ctx.obj["verify_ssl"] = verify_ssl
+    ctx.obj["cluster"] = cluster
     ctx.obj["output_format"] = output
-
-
-# Register command groups
-main.add_command(vm.vm)
-main.add_command(container.container)
-main.add_command(node.node)
-main.add_command(storage.storage)
-main.add_command(backup.backup)
-main.add_command(image.image)
-
-# IAM command groups
-main.add_command(user.user)
-main.add_command(group.group)
-main.add_command(role.role)
-main.add_command(acl.acl)
-main.add_command(token.token)
-
-# Resource management
-main.add_command(pool.pool)
+    ctx.obj["page_size"] = page_size
+    ctx.obj["limit"] = limit
+    ctx.obj["offset"] = offset
+    ctx.obj["stats"] = stats
 
 
 if __name__ == "__main__":
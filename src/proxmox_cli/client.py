@@ -1,10 +1,36 @@
 """Proxmox API client wrapper."""
 
-from typing import Any, Dict, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
 
 import urllib3
 from proxmoxer import ProxmoxAPI
 
+from proxmox_cli.inventory import Inventory
+from proxmox_cli.models import Guest, Node, Storage, Template, resource_from_api
+from proxmox_cli.session import (
+    DEFAULT_POOL_SIZE,
+    CoalescingSession,
+    HttpxSession,
+    RateLimitedSession,
+    RequestStats,
+    RetryBudget,
+    RetryingSession,
+    configure_session,
+)
+from proxmox_cli.utils.concurrency import DEFAULT_MAX_WORKERS, fan_out
+from proxmox_cli.utils.filters import Filter
+
+# Supported HTTP transports
+TRANSPORTS = ("requests", "httpx")
+
+# Storage types that can hold container templates
+TEMPLATE_STORAGE_TYPES = ("dir", "nfs", "cifs", "glusterfs", "zfspool")
+
+# Pool members sent per update request; keeps each request's id list well
+# below the API's parameter length limit
+POOL_MEMBER_BATCH = 500
+
 
 class ProxmoxClient:
     """Wrapper for Proxmox API client."""
@@ -17,6 +43,18 @@ class ProxmoxClient:
         token_name: Optional[str] = None,
         token_value: Optional[str] = None,
         verify_ssl: bool = True,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: int = 30,
+        pool_size: Optional[int] = None,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        connect_retries: int = 2,
+        transport: str = "requests",
+        retries: int = 3,
+        retry_backoff: float = 0.2,
+        retry_budget: int = 30,
+        rate_limits: Optional[Dict[str, float]] = None,
+        inventory: Optional[Inventory] = None,
     ):
         """Initialize Proxmox client.
 
@@ -27,10 +65,33 @@ class ProxmoxClient:
             token_name: API token name (optional)
             token_value: API token value (optional)
             verify_ssl: Whether to verify SSL certificate
+            max_workers: Maximum concurrent per-node/per-storage requests
+            timeout: Request timeout in seconds
+            pool_size: Pooled HTTP connections per host (default: enough for
+                max_workers concurrent requests)
+            pool_block: Wait for a pooled connection instead of opening extra ones
+            keep_alive: Reuse connections between requests
+            connect_retries: Retries for failed connection attempts
+            transport: HTTP transport, 'requests' (HTTP/1.1 connection pool) or
+                'httpx' (HTTP/2 multiplexing, requires the http2 extra)
+            retries: Maximum retries per idempotent request (GETs only)
+            retry_backoff: Base backoff delay in seconds
+            retry_budget: Total retries allowed over the client's lifetime
+            rate_limits: Optional requests per second by class ('read', 'write',
+                'task') cluster-wide, or 'node_<class>' per node
+            inventory: Optional inventory recording the ids of complete
+                listings for shell completion
         """
         self.host = host
         self.user = user
         self.verify_ssl = verify_ssl
+        self.max_workers = max_workers
+        self.inventory = inventory
+
+        if transport not in TRANSPORTS:
+            raise ValueError(
+                f"Unknown transport {transport!r} (choose from {', '.join(TRANSPORTS)})"
+            )
 
         if not verify_ssl:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -43,7 +104,7 @@ class ProxmoxClient:
                 token_name=token_name,
                 token_value=token_value,
                 verify_ssl=verify_ssl,
-                timeout=30,
+                timeout=timeout,
             )
         elif password:
             self.api = ProxmoxAPI(
@@ -51,11 +112,49 @@ class ProxmoxClient:
                 user=user,
                 password=password,
                 verify_ssl=verify_ssl,
-                timeout=30,
+                timeout=timeout,
             )
         else:
             raise ValueError("Either password or token credentials must be provided")
 
+        # Every resource object shares the session in the API store
+        self.stats = RequestStats()
+        session = self.api._store["session"]
+        pool_size = pool_size or max(max_workers, DEFAULT_POOL_SIZE)
+        if transport == "httpx":
+            session = HttpxSession(session, self.stats, pool_size=pool_size, keep_alive=keep_alive)
+        else:
+            configure_session(
+                session,
+                self.stats,
+                pool_size=pool_size,
+                pool_block=pool_block,
+                keep_alive=keep_alive,
+                connect_retries=connect_retries,
+            )
+        if rate_limits:
+            session = RateLimitedSession(session, self.stats, rate_limits)
+        session = RetryingSession(
+            session,
+            self.stats,
+            retries=retries,
+            backoff=retry_backoff,
+            budget=RetryBudget(retry_budget),
+        )
+        self._session = CoalescingSession(session, self.stats)
+        self.api._store["session"] = self._session
+
+    @contextmanager
+    def request_scope(self) -> Iterator[None]:
+        """Share GET results within a block.
+
+        Identical in-flight GETs always share one HTTP request; inside this
+        block, repeated GETs also reuse earlier responses until a write is
+        sent. Use a new scope for each poll of data that is expected to change.
+        """
+        with self._session.scope():
+            yield
+
     def get_version(self) -> Dict[str, Any]:
         """Get Proxmox version information.
 
@@ -76,57 +175,131 @@ class ProxmoxClient:
         """Get list of nodes in the cluster.
 
         Returns:
-            List of node information dictionaries
+            List of Node records
         """
-        return self.api.nodes.get()
+        nodes = [Node.from_api(n) for n in self.api.nodes.get()]
+        if self.inventory is not None:
+            self.inventory.update({"node": {n.get("node"): n.get("status") for n in nodes}})
+        return nodes
+
+    def get_storage(self) -> list:
+        """Get cluster storage definitions.
+
+        Returns:
+            List of Storage records
+        """
+        storages = [Storage.from_api(s) for s in self.api.storage.get()]
+        if self.inventory is not None:
+            self.inventory.update({"storage": {s.get("storage"): s.get("type") for s in storages}})
+        return storages
+
+    def get_cluster_resources(self, resource_type: Optional[str] = None) -> list:
+        """Get cluster-wide resource list in a single request.
 
-    def get_vms(self, node: Optional[str] = None) -> list:
+        Args:
+            resource_type: Optional resource type filter (vm, node, storage, sdn)
+
+        Returns:
+            List of Guest, Node and Storage records (other types stay dicts)
+        """
+        params = {}
+        if resource_type:
+            params["type"] = resource_type
+        resources = [resource_from_api(r) for r in self.api.cluster.resources.get(**params)]
+        if self.inventory is not None:
+            self.inventory.record_resources(resources, resource_type)
+        return resources
+
+    def get_vms(self, node: Optional[str] = None, where: Optional[Filter] = None) -> list:
         """Get list of virtual machines.
 
         Args:
             node: Optional node name to filter VMs
+            where: Optional compiled filter; nodes that cannot match are not queried
 
         Returns:
-            List of VM information dictionaries
+            List of Guest records
         """
-        if node:
-            return self.api.nodes(node).qemu.get()
-
-        # Get VMs from all nodes, skipping unreachable nodes
-        vms = []
-        for node_info in self.get_nodes():
-            node_name = node_info["node"]
-            try:
-                node_vms = self.api.nodes(node_name).qemu.get()
-                vms.extend(node_vms)
-            except Exception:
-                # Skip nodes that fail to respond (offline, network issues, etc.)
-                continue
-        return vms
+        return list(self.iter_vms(node=node, where=where))
+
+    def iter_vms(
+        self, node: Optional[str] = None, where: Optional[Filter] = None
+    ) -> Iterator[Guest]:
+        """Iterate virtual machines as each node responds.
 
-    def get_containers(self, node: Optional[str] = None) -> list:
+        Nodes are queried concurrently, so records arrive in completion order.
+
+        Args:
+            node: Optional node name to filter VMs
+            where: Optional compiled filter; nodes that cannot match are not queried
+
+        Yields:
+            Guest records
+        """
+        return self._iter_guests("qemu", node, where)
+
+    def get_containers(self, node: Optional[str] = None, where: Optional[Filter] = None) -> list:
         """Get list of LXC containers.
 
         Args:
             node: Optional node name to filter containers
+            where: Optional compiled filter; nodes that cannot match are not queried
 
         Returns:
-            List of container information dictionaries
+            List of Guest records
         """
+        return list(self.iter_containers(node=node, where=where))
+
+    def iter_containers(
+        self, node: Optional[str] = None, where: Optional[Filter] = None
+    ) -> Iterator[Guest]:
+        """Iterate LXC containers as each node responds.
+
+        Nodes are queried concurrently, so records arrive in completion order.
+
+        Args:
+            node: Optional node name to filter containers
+            where: Optional compiled filter; nodes that cannot match are not queried
+
+        Yields:
+            Guest records
+        """
+        return self._iter_guests("lxc", node, where)
+
+    def _node_names(self, node: Optional[str], where: Optional[Filter]) -> list:
+        """Get the nodes to query: the requested one, or all nodes the filter allows."""
         if node:
-            return self.api.nodes(node).lxc.get()
-
-        # Get containers from all nodes, skipping unreachable nodes
-        containers = []
-        for node_info in self.get_nodes():
-            node_name = node_info["node"]
-            try:
-                node_containers = self.api.nodes(node_name).lxc.get()
-                containers.extend(node_containers)
-            except Exception:
-                # Skip nodes that fail to respond (offline, network issues, etc.)
+            return [node]
+        node_names = [n["node"] for n in self.get_nodes()]
+        if where is not None:
+            node_names = [n for n in node_names if where.matches_node(n)]
+        return node_names
+
+    def _iter_guests(
+        self, kind: str, node: Optional[str], where: Optional[Filter]
+    ) -> Iterator[Guest]:
+        """Iterate guests of one kind ('qemu' or 'lxc') from one or all nodes.
+
+        Each record is tagged with its node name, and the filter is applied
+        per node as responses arrive rather than over the combined list.
+        """
+        node_names = self._node_names(node, where)
+
+        def fetch(node_name):
+            return getattr(self.api.nodes(node_name), kind).get()
+
+        for node_name, node_guests, error in fan_out(fetch, node_names, self.max_workers):
+            if error is not None:
+                if node:
+                    raise error
+                # Skip nodes that still fail after retries (offline, etc.)
+                self.stats.incr("skipped_nodes")
                 continue
-        return containers
+            for data in node_guests:
+                guest = Guest.from_api(data)
+                guest.setdefault("node", node_name)
+                if where is None or where(guest):
+                    yield guest
 
     def get_pools(self) -> list:
         """Get list of resource pools.
@@ -134,7 +307,70 @@ class ProxmoxClient:
         Returns:
             List of resource pool information dictionaries
         """
-        return self.api.pools.get()
+        pools = self.api.pools.get()
+        if self.inventory is not None:
+            self.inventory.update({"pool": {p.get("poolid"): p.get("comment") for p in pools}})
+        return pools
+
+    def get_users(self, full: bool = False) -> list:
+        """Get list of users.
+
+        Args:
+            full: Include group memberships and API tokens of each user
+
+        Returns:
+            List of user information dictionaries
+        """
+        users = self.api.access.users.get(**({"full": 1} if full else {}))
+        if self.inventory is not None:
+            self.inventory.update({"user": {u.get("userid"): u.get("comment") for u in users}})
+        return users
+
+    def get_roles(self) -> list:
+        """Get list of roles.
+
+        Returns:
+            List of role information dictionaries
+        """
+        roles = self.api.access.roles.get()
+        if self.inventory is not None:
+            self.inventory.update({"role": {r.get("roleid"): r.get("privs") for r in roles}})
+        return roles
+
+    def get_tokens(self, userid: str) -> list:
+        """Get the API tokens of a user.
+
+        Args:
+            userid: User identifier
+
+        Returns:
+            List of token dictionaries, each with 'userid' and full token 'id'
+        """
+        tokens = self.api.access.users(userid).token.get()
+        for token in tokens:
+            token["userid"] = userid
+            token["id"] = f"{userid}!{token.get('tokenid')}"
+        return tokens
+
+    def iter_tokens(self, userids: Optional[list] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate API tokens of many users as each user's listing arrives.
+
+        Users are queried concurrently (max_workers). Users whose tokens
+        cannot be read are skipped and counted as 'skipped_users'.
+
+        Args:
+            userids: Users to query (default: every user)
+
+        Yields:
+            Token dictionaries, each with 'userid' and full token 'id'
+        """
+        if userids is None:
+            userids = [u["userid"] for u in self.get_users()]
+        for userid, tokens, error in fan_out(self.get_tokens, userids, self.max_workers):
+            if error is not None:
+                self.stats.incr("skipped_users")
+                continue
+            yield from tokens
 
     def get_pool(self, poolid: str) -> Dict[str, Any]:
         """Get resource pool details.
@@ -147,6 +383,27 @@ class ProxmoxClient:
         """
         return self.api.pools(poolid).get()
 
+    def iter_pools(self, poolids: Optional[list] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate resource pools with their members as each pool's details arrive.
+
+        Pools are read concurrently (max_workers). Pools that cannot be read
+        are skipped and counted as 'skipped_pools'.
+
+        Args:
+            poolids: Pools to read (default: every pool)
+
+        Yields:
+            Pool information dictionaries with 'poolid' and 'members'
+        """
+        if poolids is None:
+            poolids = [p["poolid"] for p in self.get_pools()]
+        for poolid, pool, error in fan_out(self.get_pool, poolids, self.max_workers):
+            if error is not None:
+                self.stats.incr("skipped_pools")
+                continue
+            pool.setdefault("poolid", poolid)
+            yield pool
+
     def create_pool(self, poolid: str, comment: Optional[str] = None) -> None:
         """Create a new resource pool.
 
@@ -178,40 +435,63 @@ class ProxmoxClient:
         self.api.pools(poolid).delete()
 
     def add_pool_members(
-        self, poolid: str, vms: Optional[list] = None, storages: Optional[list] = None
-    ) -> None:
+        self,
+        poolid: str,
+        vms: Optional[list] = None,
+        storages: Optional[list] = None,
+        allow_move: bool = False,
+    ) -> int:
         """Add members to a resource pool.
 
+        Members are sent as comma-separated lists, POOL_MEMBER_BATCH ids per
+        request.
+
         Args:
             poolid: Pool identifier
             vms: Optional list of VM IDs
             storages: Optional list of storage IDs
+            allow_move: Move guests that are members of another pool
+
+        Returns:
+            Number of update requests sent
         """
-        update_data = {}
-        if vms:
-            update_data["vms"] = ",".join(str(vm) for vm in vms)
-        if storages:
-            update_data["storage"] = ",".join(storages)
-        if update_data:
-            self.api.pools(poolid).put(**update_data)
+        extra = {"allow-move": 1} if allow_move else {}
+        return self._update_pool_members(poolid, vms, storages, extra)
 
     def remove_pool_members(
         self, poolid: str, vms: Optional[list] = None, storages: Optional[list] = None
-    ) -> None:
+    ) -> int:
         """Remove members from a resource pool.
 
         Args:
             poolid: Pool identifier
             vms: Optional list of VM IDs
             storages: Optional list of storage IDs
+
+        Returns:
+            Number of update requests sent
         """
-        delete_data = {"delete": 1}
-        if vms:
-            delete_data["vms"] = ",".join(str(vm) for vm in vms)
-        if storages:
-            delete_data["storage"] = ",".join(storages)
-        if len(delete_data) > 1:  # More than just 'delete' key
-            self.api.pools(poolid).put(**delete_data)
+        return self._update_pool_members(poolid, vms, storages, {"delete": 1})
+
+    def _update_pool_members(
+        self,
+        poolid: str,
+        vms: Optional[list],
+        storages: Optional[list],
+        extra: Dict[str, Any],
+    ) -> int:
+        vms = [str(vm) for vm in vms or []]
+        storages = list(storages or [])
+        requests = 0
+        for start in range(0, max(len(vms), len(storages)), POOL_MEMBER_BATCH):
+            update_data = dict(extra)
+            if vms[start : start + POOL_MEMBER_BATCH]:
+                update_data["vms"] = ",".join(vms[start : start + POOL_MEMBER_BATCH])
+            if storages[start : start + POOL_MEMBER_BATCH]:
+                update_data["storage"] = ",".join(storages[start : start + POOL_MEMBER_BATCH])
+            self.api.pools(poolid).put(**update_data)
+            requests += 1
+        return requests
 
     def get_storage_content(
         self, node: str, storage: str, content_type: Optional[str] = None
@@ -231,65 +511,154 @@ class ProxmoxClient:
             params["content"] = content_type
         return self.api.nodes(node).storage(storage).content.get(**params)
 
+    def delete_storage_content(self, node: str, storage: str, volid: str) -> Any:
+        """Delete a volume (e.g. a backup archive) from a storage.
+
+        Args:
+            node: Node name
+            storage: Storage identifier
+            volid: Volume identifier
+
+        Returns:
+            Task ID (UPID) on servers that delete in a worker task
+        """
+        return self.api.nodes(node).storage(storage).content(volid).delete()
+
+    def _iter_node_storages(
+        self,
+        node: Optional[str],
+        storage: Optional[str],
+        where: Optional[Filter],
+        storage_types: Optional[tuple] = None,
+    ) -> Iterator[tuple]:
+        """Iterate (node, storage) pairs as each node's storage list arrives.
+
+        Unreachable nodes are skipped unless a specific node was requested.
+        """
+
+        def fetch(node_name):
+            return self.api.nodes(node_name).storage.get()
+
+        nodes = self._node_names(node, where)
+        for node_name, storages, error in fan_out(fetch, nodes, self.max_workers):
+            if error is not None:
+                if node:
+                    raise error
+                self.stats.incr("skipped_nodes")
+                continue
+            for storage_info in storages:
+                storage_name = storage_info["storage"]
+                # Skip if specific storage requested and doesn't match
+                if storage and storage != storage_name:
+                    continue
+                if storage_types and storage_info.get("type", "") not in storage_types:
+                    continue
+                yield node_name, storage_name
+
+    def iter_storage_content(
+        self,
+        node: Optional[str] = None,
+        storage: Optional[str] = None,
+        content_type: Optional[str] = None,
+        where: Optional[Filter] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate storage content across nodes and storages as each storage responds.
+
+        Storage listings are fetched concurrently and content requests start
+        while other nodes are still answering, so items arrive out of order.
+        Storages that cannot be read are skipped unless both node and storage
+        were given.
+
+        Args:
+            node: Optional node name (default: all nodes)
+            storage: Optional storage identifier (default: all storages)
+            content_type: Optional content type filter (vztmpl, iso, backup, etc.)
+            where: Optional compiled filter; nodes that cannot match are not queried
+
+        Yields:
+            Storage content dictionaries tagged with 'node' and 'storage'
+        """
+        pairs = self._iter_node_storages(node, storage, where)
+
+        def fetch(pair):
+            return self.get_storage_content(pair[0], pair[1], content_type)
+
+        for (node_name, storage_name), content, error in fan_out(fetch, pairs, self.max_workers):
+            if error is not None:
+                if node and storage:
+                    raise error
+                # Skip storages that cannot be read
+                self.stats.incr("skipped_storages")
+                continue
+            for item in content:
+                item.setdefault("node", node_name)
+                item.setdefault("storage", storage_name)
+                if where is None or where(item):
+                    yield item
+
     def get_container_templates(
-        self, node: Optional[str] = None, storage: Optional[str] = None
+        self,
+        node: Optional[str] = None,
+        storage: Optional[str] = None,
+        where: Optional[Filter] = None,
     ) -> list:
         """Get available LXC container templates.
 
         Args:
             node: Optional node name to filter templates
             storage: Optional storage name to filter templates
+            where: Optional compiled filter; nodes that cannot match are not queried
 
         Returns:
-            List of template information dictionaries
-        """
-        templates = []
-
-        # Get nodes to check
-        nodes_to_check = [node] if node else [n["node"] for n in self.get_nodes()]
-
-        for node_name in nodes_to_check:
-            try:
-                # Get storage list for this node
-                storages = self.api.nodes(node_name).storage.get()
-
-                for storage_info in storages:
-                    storage_name = storage_info["storage"]
-
-                    # Skip if specific storage requested and doesn't match
-                    if storage and storage != storage_name:
-                        continue
-
-                    # Check if storage type supports container templates
-                    storage_type = storage_info.get("type", "")
-                    if storage_type not in ["dir", "nfs", "cifs", "glusterfs", "zfspool"]:
-                        continue
-
-                    try:
-                        # Get templates from this storage
-                        content = (
-                            self.api.nodes(node_name)
-                            .storage(storage_name)
-                            .content.get(content="vztmpl")
-                        )
-
-                        for item in content:
-                            template_info = {
-                                "volid": item.get("volid"),
-                                "storage": storage_name,
-                                "node": node_name,
-                                "size": item.get("size", 0),
-                                "format": item.get("format", ""),
-                            }
-                            templates.append(template_info)
-                    except Exception:
-                        # Skip storages that don't have template content or are inaccessible
-                        continue
-            except Exception:
-                # Skip nodes that are unreachable
-                continue
+            List of Template records
+        """
+        return list(self.iter_templates(node=node, storage=storage, where=where))
+
+    def iter_templates(
+        self,
+        node: Optional[str] = None,
+        storage: Optional[str] = None,
+        where: Optional[Filter] = None,
+    ) -> Iterator[Template]:
+        """Iterate LXC container templates as each storage responds.
 
-        return templates
+        Args:
+            node: Optional node name to filter templates
+            storage: Optional storage name to filter templates
+            where: Optional compiled filter; nodes that cannot match are not queried
+
+        Yields:
+            Template records
+        """
+        pairs = self._iter_node_storages(node, storage, where, TEMPLATE_STORAGE_TYPES)
+        # Only an unfiltered listing is complete enough for the inventory
+        inventory = self.inventory if not (node or storage or where) else None
+        seen: Optional[Dict[str, str]] = {} if inventory is not None else None
+
+        def fetch(pair):
+            return self.get_storage_content(pair[0], pair[1], "vztmpl")
+
+        for (node_name, storage_name), content, error in fan_out(fetch, pairs, self.max_workers):
+            if error is not None:
+                if node and storage:
+                    raise error
+                # Skip storages that don't have template content or are inaccessible
+                self.stats.incr("skipped_storages")
+                continue
+            for item in content:
+                template_info = Template(
+                    volid=item.get("volid"),
+                    storage=storage_name,
+                    node=node_name,
+                    size=item.get("size", 0),
+                    format=item.get("format", ""),
+                )
+                if seen is not None:
+                    seen[template_info.get("volid")] = node_name
+                if where is None or where(template_info):
+                    yield template_info
+        if inventory is not None and seen is not None:
+            inventory.update({"template": seen})
 
     def download_container_template(self, node: str, storage: str, template: str) -> Dict[str, Any]:
         """Download a container template from a repository.
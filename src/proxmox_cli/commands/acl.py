@@ -2,8 +2,10 @@
 
 import click
 
-from proxmox_cli.commands.helpers import get_proxmox_client
-from proxmox_cli.utils.output import print_error, print_json, print_success, print_table
+from proxmox_cli.commands.helpers import get_proxmox_client, print_list
+from proxmox_cli.completion import complete_role_lists, complete_user_lists, complete_users
+from proxmox_cli.permissions import fetch_resolver
+from proxmox_cli.utils.output import print_error, print_json, print_success
 
 
 @click.group()
@@ -21,17 +23,7 @@ def list_acls(ctx):
 
         acls = client.api.access.acl.get()
 
-        if acls:
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(acls)
-            else:
-                print_table(acls, title="Access Control Lists")
-        else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                print_error("No ACL entries found")
+        print_list(ctx, acls, "Access Control Lists", "No ACL entries found")
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -40,10 +32,72 @@ def list_acls(ctx):
             print_error(f"Failed to list ACLs: {str(e)}")
 
 
+@acl.command("effective")
+@click.option(
+    "--user",
+    "-u",
+    "users",
+    multiple=True,
+    shell_complete=complete_users,
+    help="User or token id (e.g. alice@pve, alice@pve!ci); repeatable (default: all)",
+)
+@click.option(
+    "--path",
+    "-p",
+    "paths",
+    multiple=True,
+    help="ACL path (e.g. /vms/100); repeatable (default: every path with an ACL)",
+)
+@click.option("--privilege", help="Only show rows that include this privilege")
+@click.pass_context
+def effective_acl(ctx, users, paths, privilege):
+    """Show effective roles and privileges of users and tokens on paths.
+
+    ACLs, group memberships and roles are fetched once; every user/path
+    combination is then resolved locally, including inherited, group and
+    pool permissions.
+    """
+    try:
+        client = get_proxmox_client(ctx)
+
+        resolver = fetch_resolver(client, client.max_workers)
+        # In bulk mode, combinations without any role are left out
+        bulk = not (users and paths)
+        users = users or resolver.principals()
+        paths = paths or sorted(resolver.paths)
+
+        def rows():
+            for userid in users:
+                for path in paths:
+                    roles, privileges = resolver.effective(userid, path)
+                    if privilege and privilege not in privileges:
+                        continue
+                    if bulk and not roles:
+                        continue
+                    yield {
+                        "userid": userid,
+                        "path": path,
+                        "roles": ",".join(sorted(roles)),
+                        "privileges": ",".join(sorted(privileges)),
+                    }
+
+        print_list(ctx, rows(), "Effective Permissions", "No matching permissions")
+
+    except Exception as e:
+        if ctx.obj.get("output_format", "json") == "json":
+            print_json({"error": str(e)})
+        else:
+            print_error(f"Failed to resolve permissions: {str(e)}")
+
+
 @acl.command("add")
 @click.option("--path", "-p", required=True, help="Access control path (e.g., /, /vms/100)")
-@click.option("--roles", "-r", required=True, help="Role to assign")
-@click.option("--users", "-u", help="Comma-separated list of users")
+@click.option(
+    "--roles", "-r", required=True, help="Role to assign", shell_complete=complete_role_lists
+)
+@click.option(
+    "--users", "-u", help="Comma-separated list of users", shell_complete=complete_user_lists
+)
 @click.option("--groups", "-g", help="Comma-separated list of groups")
 @click.option("--tokens", "-t", help="Comma-separated list of API tokens")
 @click.option("--propagate/--no-propagate", default=True, help="Propagate to child paths")
@@ -85,8 +139,12 @@ def add_acl(ctx, path, roles, users, groups, tokens, propagate):
 
 @acl.command("remove")
 @click.option("--path", "-p", required=True, help="Access control path")
-@click.option("--roles", "-r", required=True, help="Role to remove")
-@click.option("--users", "-u", help="Comma-separated list of users")
+@click.option(
+    "--roles", "-r", required=True, help="Role to remove", shell_complete=complete_role_lists
+)
+@click.option(
+    "--users", "-u", help="Comma-separated list of users", shell_complete=complete_user_lists
+)
 @click.option("--groups", "-g", help="Comma-separated list of groups")
 @click.option("--tokens", "-t", help="Comma-separated list of API tokens")
 @click.pass_context
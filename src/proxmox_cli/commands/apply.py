@@ -0,0 +1,87 @@
+"""Declarative apply command for pools and access control."""
+
+import click
+
+from proxmox_cli.commands.helpers import get_proxmox_client
+from proxmox_cli.state import apply_plan, fetch_current, load_state, plan
+from proxmox_cli.utils.output import print_error, print_json, print_success, print_table
+
+
+@click.command()
+@click.option(
+    "--file",
+    "-f",
+    "state_file",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Desired state file (YAML)",
+)
+@click.option("--dry-run", is_flag=True, help="Show the plan without making changes")
+@click.option(
+    "--prune",
+    is_flag=True,
+    help="Delete users, groups, roles, pools, tokens and ACL entries the file does not list",
+)
+@click.pass_context
+def apply(ctx, state_file, dry_run, prune):
+    """Make pools, users, groups, roles, ACLs and tokens match a state file.
+
+    Current state is read in a few bulk requests; only the calls needed to
+    reach the desired state are sent, concurrently where they are independent.
+    The plan, headed by its API call count, is shown before anything changes.
+    """
+    json_output = ctx.obj.get("output_format", "json") == "json"
+    try:
+        client = get_proxmox_client(ctx)
+
+        desired = load_state(state_file)
+        current = fetch_current(client, desired, client.max_workers)
+        actions = plan(desired, current, prune=prune)
+
+        summary = {"calls": len(actions), "reads": current["reads"], "dry_run": dry_run}
+        if not json_output:
+            print_success(
+                f"Plan: {len(actions)} API call(s) to apply "
+                f"(current state read in {current['reads']} request(s))"
+            )
+            if actions:
+                print_table(
+                    [{k: v for k, v in a.to_dict().items() if k != "params"} for a in actions],
+                    title="Plan",
+                )
+
+        if dry_run or not actions:
+            if json_output:
+                print_json({**summary, "plan": [a.to_dict() for a in actions], "success": True})
+            return
+
+        def report(result):
+            if json_output:
+                return
+            if result["success"]:
+                print_success(result["summary"])
+                value = (result.get("data") or {}).get("value")
+                if value:
+                    print_success(f"Token value (save this, it won't be shown again): {value}")
+            else:
+                print_error(f"{result['summary']}: {result['error']}")
+
+        results = apply_plan(client, actions, client.max_workers, on_result=report)
+        success = len(results) == len(actions) and all(r["success"] for r in results)
+        if json_output:
+            print_json(
+                {
+                    **summary,
+                    "plan": [a.to_dict() for a in actions],
+                    "results": results,
+                    "success": success,
+                }
+            )
+        elif not success:
+            print_error(f"Applied {sum(r['success'] for r in results)} of {len(actions)} calls")
+
+    except Exception as e:
+        if json_output:
+            print_json({"error": str(e), "success": False})
+        else:
+            print_error(f"Failed to apply state: {str(e)}")
@@ -2,9 +2,18 @@
 
 import click
 
-from proxmox_cli.client import ProxmoxClient
-from proxmox_cli.config import Config
-from proxmox_cli.utils.output import print_error, print_success, print_table
+from proxmox_cli.backups import (
+    BackupCache,
+    RetentionError,
+    delete_archives,
+    parse_retention,
+    prune_plan,
+    scan_catalog,
+)
+from proxmox_cli.commands.helpers import get_proxmox_client, print_list, where_option
+from proxmox_cli.completion import complete_nodes, complete_storages, complete_vmids
+from proxmox_cli.utils.helpers import format_size
+from proxmox_cli.utils.output import print_error, print_json, print_success
 
 
 @click.group()
@@ -13,23 +22,232 @@ def backup():
     pass
 
 
+def catalog_options(f):
+    """Add the options selecting and caching the backup storage scan."""
+    f = click.option(
+        "--max-age",
+        type=click.FloatRange(min=0),
+        default=0,
+        metavar="SECONDS",
+        help="Reuse storage listings cached within SECONDS (default: 0, always rescan)",
+    )(f)
+    f = click.option(
+        "--vmid",
+        "vmids",
+        type=int,
+        multiple=True,
+        shell_complete=complete_vmids,
+        help="Only backups of this guest (can specify multiple)",
+    )(f)
+    f = click.option(
+        "--storage",
+        "-s",
+        help="Filter by storage",
+        shell_complete=complete_storages,
+    )(f)
+    f = click.option("--node", "-n", help="Filter by node name", shell_complete=complete_nodes)(f)
+    return f
+
+
+def load_catalog(ctx, client, node, storage, max_age):
+    """Scan the backup storages, reusing cached listings younger than max_age.
+
+    Args:
+        ctx: Click context object
+        client: ProxmoxClient instance
+        node: Only storages visible from this node
+        storage: Only this storage
+        max_age: Maximum age of cached listings in seconds
+
+    Returns:
+        BackupCatalog instance
+    """
+    cache = BackupCache(ctx.obj.get("cluster")) if max_age else None
+    return scan_catalog(client, node, storage, cache, max_age, client.max_workers)
+
+
 @backup.command("list")
-@click.option("--node", "-n", help="Filter by node name")
-@click.option("--storage", "-s", help="Filter by storage")
+@catalog_options
+@where_option
+@click.option("--latest", is_flag=True, help="Only the newest backup of each guest")
+@click.pass_context
+def list_backups(ctx, node, storage, vmids, max_age, where, latest):
+    """List backups on every backup storage, grouped by guest, newest first.
+
+    Each shared storage is listed once and all storages are listed
+    concurrently.
+    """
+    try:
+        client = get_proxmox_client(ctx)
+
+        catalog = load_catalog(ctx, client, node, storage, max_age)
+        rows = (b.list_row() for b in catalog.query(vmids, where=where, latest=latest))
+
+        print_list(ctx, rows, "Backups", "No backups found")
+
+    except Exception as e:
+        if ctx.obj.get("output_format", "json") == "json":
+            print_json({"error": str(e)})
+        else:
+            print_error(f"Failed to list backups: {str(e)}")
+
+
+def _parse_retention(ctx, param, value):
+    """Click callback parsing a --prune-backups specification."""
+    if value is None:
+        return None
+    try:
+        return parse_retention(value)
+    except RetentionError as e:
+        raise click.BadParameter(str(e), ctx=ctx, param=param)
+
+
+def plan_row(archive, mark, option):
+    """Format one simulated prune decision.
+
+    Args:
+        archive: Backup record
+        mark: 'keep', 'remove', 'protected' or 'renamed'
+        option: Retention option that kept the archive, if any
+
+    Returns:
+        Row dictionary
+    """
+    row = archive.list_row()
+    return {
+        "vmid": row["vmid"],
+        "type": row["type"],
+        "date": row["date"],
+        "mark": mark,
+        "rule": option or "",
+        "size": row["size"],
+        "storage": row["storage"],
+        "node": row["node"],
+        "volid": row["volid"],
+    }
+
+
+def summarize_plan(plan):
+    """Count kept and removed archives and reclaimed bytes per storage.
+
+    Args:
+        plan: (archive, mark, option) tuples from prune_plan()
+
+    Returns:
+        One row per storage plus a 'TOTAL' row
+    """
+    fields = ("archives", "keep", "remove", "protected", "reclaim_bytes")
+    totals = {}
+    guests = {}
+    for archive, mark, _ in plan:
+        for storage in (archive.get("storage"), "TOTAL"):
+            counts = totals.setdefault(storage, dict.fromkeys(fields, 0))
+            guests.setdefault(storage, set()).add(archive.get("vmid"))
+            counts["archives"] += 1
+            if mark == "remove":
+                counts["remove"] += 1
+                counts["reclaim_bytes"] += archive.get("size") or 0
+            elif mark == "protected":
+                counts["protected"] += 1
+            else:
+                counts["keep"] += 1
+    total = totals.pop("TOTAL", dict.fromkeys(fields, 0))
+    rows = [
+        {"storage": storage, "guests": len(guests[storage]), **totals[storage]}
+        for storage in sorted(totals)
+    ]
+    return rows + [{"storage": "TOTAL", "guests": len(guests.get("TOTAL", ())), **total}]
+
+
+@backup.command("prune-plan")
+@catalog_options
+@where_option
+@click.option(
+    "--prune-backups",
+    "retention",
+    callback=_parse_retention,
+    help="Retention for every storage, e.g. 'keep-last=3,keep-weekly=2' "
+    "(default: each storage's own prune-backups setting)",
+)
+@click.option("--summary", is_flag=True, help="Show counts and reclaimed bytes per storage")
+@click.option("--execute", is_flag=True, help="Delete the archives marked 'remove'")
+@click.option(
+    "--rate",
+    type=click.FloatRange(min=0, min_open=True),
+    help="With --execute, delete at most RATE archives per second",
+)
 @click.pass_context
-def list_backups(ctx, node, storage):
-    """List all backups."""
+def prune_plan_command(
+    ctx, node, storage, vmids, max_age, where, retention, summary, execute, rate
+):
+    """Simulate prune-backups retention on every guest and storage.
+
+    Archives are grouped per guest and storage and marked like the
+    Proxmox storage layer would: kept by a keep-* option, protected, or
+    removed. --where filters the rows shown
+    (e.g. 'mark==remove'); it does not change the simulation. With
+    --execute, removals run concurrently, optionally paced by --rate.
+    """
+    json_output = ctx.obj.get("output_format", "json") == "json"
     try:
-        config = Config(ctx.obj.get("config_path"))
-        client = ProxmoxClient(
-            host=ctx.obj.get("host") or config.get("proxmox.host"),
-            user=ctx.obj.get("user") or config.get("proxmox.user"),
-            password=ctx.obj.get("password"),
-            verify_ssl=ctx.obj.get("verify_ssl", config.get("proxmox.verify_ssl", True)),
-        )
+        client = get_proxmox_client(ctx)
+
+        catalog = load_catalog(ctx, client, node, storage, max_age)
+        plan = list(prune_plan(catalog, retention, vmids))
+        removals = [archive for archive, mark, _ in plan if mark == "remove"]
+        reclaim = sum(archive.get("size") or 0 for archive in removals)
+
+        if not execute:
+            if summary:
+                rows = summarize_plan(plan)
+            else:
+                rows = (
+                    plan_row(archive, mark, option)
+                    for archive, mark, option in plan
+                    if where is None or where({**archive.to_dict(), "mark": mark, "rule": option})
+                )
+            print_list(ctx, rows, "Prune Plan", "No backups found")
+            if ctx.obj.get("output_format") == "table":
+                print_success(
+                    f"{len(removals)} of {len(plan)} archives would be removed, "
+                    f"reclaiming {format_size(reclaim)}"
+                )
+            return
+
+        removed, failed = [], []
+        for archive, _, error in delete_archives(client, removals, client.max_workers, rate):
+            if error is None:
+                removed.append(archive)
+                if not json_output:
+                    print_success(f"Removed {archive['volid']}")
+            else:
+                failed.append({"volid": archive["volid"], "error": str(error)})
+                if not json_output:
+                    print_error(f"Failed to remove {archive['volid']}: {error}")
+        if max_age:
+            BackupCache(ctx.obj.get("cluster")).update(
+                {}, invalidate={archive["key"] for archive in removals}
+            )
 
-        # Implementation depends on Proxmox backup structure
-        print_error("Backup listing not yet implemented")
+        reclaimed = sum(archive.get("size") or 0 for archive in removed)
+        if json_output:
+            print_json(
+                {
+                    "success": not failed,
+                    "archives": len(plan),
+                    "removed": [archive["volid"] for archive in removed],
+                    "failed": failed,
+                    "reclaimed_bytes": reclaimed,
+                }
+            )
+        else:
+            print_success(
+                f"Removed {len(removed)} of {len(removals)} archives, "
+                f"reclaiming {format_size(reclaimed)}"
+            )
 
     except Exception as e:
-        print_error(f"Failed to list backups: {str(e)}")
+        if json_output:
+            print_json({"error": str(e), "success": False})
+        else:
+            print_error(f"Failed to plan backup pruning: {str(e)}")
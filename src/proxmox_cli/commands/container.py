@@ -2,8 +2,24 @@
 
 import click
 
-from proxmox_cli.commands.helpers import get_proxmox_client
-from proxmox_cli.utils.output import print_error, print_json, print_success, print_table
+from proxmox_cli.commands.helpers import (
+    aggregate_options,
+    annotate_pools,
+    fetch_cluster_rows,
+    get_proxmox_client,
+    print_aggregate,
+    print_list,
+    run_watch,
+    watch_option,
+    where_option,
+)
+from proxmox_cli.completion import (
+    complete_ctids,
+    complete_nodes,
+    complete_storages,
+    complete_templates,
+)
+from proxmox_cli.utils.output import print_error, print_json, print_success
 
 
 @click.group()
@@ -12,46 +28,50 @@ def container():
     pass
 
 
+def _container_watch_row(c):
+    """Format a cluster resource container record for --watch output."""
+    container_info = c.list_row()
+    container_info["node"] = c.get("node")
+    return container_info
+
+
 @container.command("list")
-@click.option("--node", "-n", help="Filter by node name")
+@click.option("--node", "-n", help="Filter by node name", shell_complete=complete_nodes)
+@where_option
+@aggregate_options
+@watch_option
 @click.pass_context
-def list_containers(ctx, node):
+def list_containers(ctx, node, where, group_by, agg, watch):
     """List all LXC containers."""
     try:
         client = get_proxmox_client(ctx)
 
-        containers = client.get_containers(node=node)
-
-        if containers:
-            # Filter to show only relevant columns
-            filtered_containers = []
-            for c in containers:
-                filtered_containers.append(
-                    {
-                        "vmid": c.get("vmid"),
-                        "name": c.get("name"),
-                        "status": c.get("status"),
-                        "cpu": f"{c.get('cpu', 0)*100:.2f}%",
-                        "memory": f"{c.get('mem', 0) / (1024**3):.2f}GB / {c.get('maxmem', 0) / (1024**3):.2f}GB",
-                        "uptime": f"{c.get('uptime', 0) // 86400}d {(c.get('uptime', 0) % 86400) // 3600}h",
-                    }
-                )
-
-            # Check output format from context
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(filtered_containers)
-            else:
-                # Convert keys to uppercase for table display
-                table_data = []
-                for item in filtered_containers:
-                    table_data.append({k.upper(): v for k, v in item.items()})
-                print_table(table_data, title="LXC Containers")
-        else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                print_error("No containers found")
+        if watch:
+            run_watch(
+                ctx,
+                lambda: fetch_cluster_rows(
+                    client, "vm", _container_watch_row, guest_type="lxc", node=node, where=where
+                ),
+                key=lambda row: row["vmid"],
+                interval=watch,
+                title="LXC Containers",
+            )
+            return
+
+        containers = client.iter_containers(node=node, where=where)
+
+        if group_by or agg:
+            if group_by == "pool":
+                containers = annotate_pools(client, containers)
+            print_aggregate(ctx, containers, group_by, agg, "LXC Containers")
+            return
+
+        print_list(
+            ctx,
+            (c.list_row() for c in containers),
+            "LXC Containers",
+            "No containers found",
+        )
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -61,8 +81,8 @@ def list_containers(ctx, node):
 
 
 @container.command("start")
-@click.argument("ctid")
-@click.option("--node", "-n", required=True, help="Node name")
+@click.argument("ctid", shell_complete=complete_ctids)
+@click.option("--node", "-n", required=True, help="Node name", shell_complete=complete_nodes)
 @click.pass_context
 def start_container(ctx, ctid, node):
     """Start an LXC container."""
@@ -77,8 +97,8 @@ def start_container(ctx, ctid, node):
 
 
 @container.command("stop")
-@click.argument("ctid")
-@click.option("--node", "-n", required=True, help="Node name")
+@click.argument("ctid", shell_complete=complete_ctids)
+@click.option("--node", "-n", required=True, help="Node name", shell_complete=complete_nodes)
 @click.pass_context
 def stop_container(ctx, ctid, node):
     """Stop an LXC container."""
@@ -93,49 +113,23 @@ def stop_container(ctx, ctid, node):
 
 
 @container.command("templates")
-@click.option("--node", "-n", help="Filter by node name")
-@click.option("--storage", "-s", help="Filter by storage name")
+@click.option("--node", "-n", help="Filter by node name", shell_complete=complete_nodes)
+@click.option("--storage", "-s", help="Filter by storage name", shell_complete=complete_storages)
+@where_option
 @click.pass_context
-def list_templates(ctx, node, storage):
+def list_templates(ctx, node, storage, where):
     """List available LXC container templates on storage."""
     try:
         client = get_proxmox_client(ctx)
 
-        templates = client.get_container_templates(node=node, storage=storage)
-
-        if templates:
-            # Format template information
-            filtered_templates = []
-            for t in templates:
-                # Extract template name from volid (e.g., 'local:vztmpl/ubuntu-22.04.tar.zst')
-                volid = t.get("volid", "")
-                template_name = volid.split("/")[-1] if "/" in volid else volid
-
-                filtered_templates.append(
-                    {
-                        "template": template_name,
-                        "storage": t.get("storage"),
-                        "node": t.get("node"),
-                        "size": f"{t.get('size', 0) / (1024**2):.2f}MB",
-                        "volid": volid,
-                    }
-                )
-
-            # Check output format from context
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(filtered_templates)
-            else:
-                # Convert keys to uppercase for table display
-                table_data = []
-                for item in filtered_templates:
-                    table_data.append({k.upper(): v for k, v in item.items()})
-                print_table(table_data, title="LXC Container Templates")
-        else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                print_error("No templates found")
+        templates = client.iter_templates(node=node, storage=storage, where=where)
+
+        print_list(
+            ctx,
+            (t.list_row() for t in templates),
+            "LXC Container Templates",
+            "No templates found",
+        )
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -145,7 +139,7 @@ def list_templates(ctx, node, storage):
 
 
 @container.command("available-templates")
-@click.option("--node", "-n", required=True, help="Node name")
+@click.option("--node", "-n", required=True, help="Node name", shell_complete=complete_nodes)
 @click.pass_context
 def list_available_templates(ctx, node):
     """List templates available for download from repositories."""
@@ -154,41 +148,28 @@ def list_available_templates(ctx, node):
 
         templates = client.get_available_templates(node=node)
 
-        if templates:
-            # Format template information
-            filtered_templates = []
-            for t in templates:
-                filtered_templates.append(
-                    {
-                        "template": t.get("template", ""),
-                        "os": t.get("os", ""),
-                        "version": t.get("version", ""),
-                        "description": t.get("headline", ""),
-                        "architecture": t.get("architecture", ""),
-                        "section": t.get("section", ""),
-                    }
-                )
-
-            # Check output format from context
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(filtered_templates)
-            else:
-                # Convert keys to uppercase for table display
-                table_data = []
-                for item in filtered_templates:
-                    # Limit description length for table view
-                    if "DESCRIPTION" in {k.upper(): v for k, v in item.items()}:
-                        desc = item.get("description", "")
-                        if len(desc) > 50:
-                            item["description"] = desc[:47] + "..."
-                    table_data.append({k.upper(): v for k, v in item.items()})
-                print_table(table_data, title="Available Templates for Download")
-        else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                print_error("No templates available")
+        # Limit description length for table view
+        max_description = None if ctx.obj.get("output_format", "json") == "json" else 50
+
+        def template_row(t):
+            description = t.get("headline", "")
+            if max_description and len(description) > max_description:
+                description = description[: max_description - 3] + "..."
+            return {
+                "template": t.get("template", ""),
+                "os": t.get("os", ""),
+                "version": t.get("version", ""),
+                "description": description,
+                "architecture": t.get("architecture", ""),
+                "section": t.get("section", ""),
+            }
+
+        print_list(
+            ctx,
+            (template_row(t) for t in templates),
+            "Available Templates for Download",
+            "No templates available",
+        )
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -199,8 +180,14 @@ def list_available_templates(ctx, node):
 
 @container.command("download-template")
 @click.argument("template")
-@click.option("--node", "-n", required=True, help="Node name")
-@click.option("--storage", "-s", default="local", help="Storage name (default: local)")
+@click.option("--node", "-n", required=True, help="Node name", shell_complete=complete_nodes)
+@click.option(
+    "--storage",
+    "-s",
+    default="local",
+    help="Storage name (default: local)",
+    shell_complete=complete_storages,
+)
 @click.pass_context
 def download_template(ctx, template, node, storage):
     """Download a container template from repository.
@@ -229,12 +216,16 @@ def download_template(ctx, template, node, storage):
 
 @container.command("create")
 @click.argument("vmid", type=int)
-@click.argument("ostemplate")
-@click.option("--node", "-n", required=True, help="Node name")
+@click.argument("ostemplate", shell_complete=complete_templates)
+@click.option("--node", "-n", required=True, help="Node name", shell_complete=complete_nodes)
 @click.option("--hostname", help="Container hostname")
 @click.option("--password", help="Root password")
 @click.option(
-    "--storage", "-s", default="local-lvm", help="Storage for rootfs (default: local-lvm)"
+    "--storage",
+    "-s",
+    default="local-lvm",
+    help="Storage for rootfs (default: local-lvm)",
+    shell_complete=complete_storages,
 )
 @click.option("--memory", "-m", default=512, type=int, help="Memory in MB (default: 512)")
 @click.option("--cores", "-c", default=1, type=int, help="Number of CPU cores (default: 1)")
@@ -2,7 +2,8 @@
 
 import click
 
-from proxmox_cli.commands.helpers import get_proxmox_client
+from proxmox_cli.commands.helpers import get_proxmox_client, print_list
+from proxmox_cli.directory import fetch_directory
 from proxmox_cli.utils.output import print_error, print_json, print_success, print_table
 
 
@@ -13,25 +14,23 @@ def group():
 
 
 @group.command("list")
+@click.option(
+    "--expand",
+    is_flag=True,
+    help="Include member count and members, joined from one full user listing",
+)
 @click.pass_context
-def list_groups(ctx):
+def list_groups(ctx, expand):
     """List all groups."""
     try:
         client = get_proxmox_client(ctx)
 
-        groups = client.api.access.groups.get()
-
-        if groups:
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(groups)
-            else:
-                print_table(groups, title="Groups")
+        if expand:
+            groups = fetch_directory(client, client.max_workers).group_rows()
         else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                print_error("No groups found")
+            groups = client.api.access.groups.get()
+
+        print_list(ctx, groups, "Groups", "No groups found")
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
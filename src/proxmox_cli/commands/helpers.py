@@ -1,30 +1,362 @@
 """Helper functions for commands."""
 
-from proxmox_cli.client import ProxmoxClient
+import json
+from datetime import datetime
+from itertools import chain, islice
+
+import click
+
 from proxmox_cli.config import Config
+from proxmox_cli.inventory import Inventory
+from proxmox_cli.utils.aggregate import AggregateError, Aggregator, parse_aggregates
+from proxmox_cli.utils.concurrency import DEFAULT_MAX_WORKERS
+from proxmox_cli.utils.filters import FilterError, compile_filter
+from proxmox_cli.utils.output import (
+    DELIMITERS,
+    OutputFormat,
+    print_error,
+    print_json,
+    print_rows,
+    print_stats,
+    print_table,
+    write_delimited,
+)
+from proxmox_cli.utils.watch import poll_changes
 
 
-def get_proxmox_client(ctx):
-    """Get configured Proxmox client from context.
+def selected_clusters(ctx, config):
+    """Resolve the --cluster option to a list of profile names.
 
     Args:
         ctx: Click context object
+        config: Loaded configuration
+
+    Returns:
+        List of profile names, or [None] for the default 'proxmox' section
+
+    Raises:
+        click.BadParameter: If a profile is unknown or none are configured
+    """
+    value = ctx.obj.get("cluster")
+    if not value:
+        return [None]
+    known = config.cluster_names()
+    if value == "all":
+        if not known:
+            raise click.BadParameter("no clusters configured", param_hint="--cluster")
+        return known
+    names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise click.BadParameter(
+            f"unknown cluster(s): {', '.join(unknown)}", param_hint="--cluster"
+        )
+    return names
+
+
+def build_client(obj, config, settings, overrides=True, inventory=None):
+    """Create a ProxmoxClient from connection settings and the http options.
+
+    Args:
+        obj: Global command-line options (ctx.obj)
+        config: Loaded configuration
+        settings: Connection settings from Config.cluster()
+        overrides: Apply --host/--user/--password from the command line
+        inventory: Optional Inventory recording ids for shell completion
 
     Returns:
         ProxmoxClient instance
     """
-    config = Config(ctx.obj.get("config_path"))
+    # Imported here so shell completion never loads the HTTP stack
+    from proxmox_cli.client import ProxmoxClient
 
-    # Get verify_ssl with proper fallback handling
-    verify_ssl = ctx.obj.get("verify_ssl")
+    verify_ssl = obj.get("verify_ssl")
     if verify_ssl is None:
-        verify_ssl = config.get("proxmox.verify_ssl", True)
+        verify_ssl = settings.get("verify_ssl", True)
+
+    def setting(key):
+        # Command-line connection options only apply to a single cluster
+        return (overrides and obj.get(key)) or settings.get(key)
 
     return ProxmoxClient(
-        host=ctx.obj.get("host") or config.get("proxmox.host"),
-        user=ctx.obj.get("user") or config.get("proxmox.user"),
-        password=ctx.obj.get("password") or config.get("proxmox.password"),
-        token_name=config.get("proxmox.token_name"),
-        token_value=config.get("proxmox.token_value"),
+        host=setting("host"),
+        user=setting("user"),
+        password=setting("password"),
+        token_name=settings.get("token_name"),
+        token_value=settings.get("token_value"),
         verify_ssl=verify_ssl,
+        max_workers=settings.get("max_workers") or DEFAULT_MAX_WORKERS,
+        timeout=config.get("http.timeout", 30),
+        pool_size=config.get("http.pool_size"),
+        pool_block=config.get("http.pool_block", False),
+        keep_alive=config.get("http.keep_alive", True),
+        connect_retries=config.get("http.connect_retries", 2),
+        transport=config.get("http.transport", "requests"),
+        retries=config.get("http.retries", 3),
+        retry_backoff=config.get("http.retry_backoff", 0.2),
+        retry_budget=config.get("http.retry_budget", 30),
+        rate_limits=config.get("rate_limit"),
+        inventory=inventory,
     )
+
+
+def get_proxmox_client(ctx):
+    """Get configured Proxmox client from context.
+
+    With several clusters selected (``--cluster a,b`` or ``--cluster all``)
+    a MultiClusterClient is returned; its listings query every cluster
+    concurrently and tag each record with its cluster name.
+
+    Args:
+        ctx: Click context object
+
+    Returns:
+        ProxmoxClient or MultiClusterClient instance
+    """
+    config = Config(ctx.obj.get("config_path"))
+    names = selected_clusters(ctx, config)
+    record = config.get("completion.inventory", True)
+
+    def build(name, overrides):
+        inventory = Inventory(name) if record else None
+        return build_client(ctx.obj, config, config.cluster(name), overrides, inventory)
+
+    if len(names) == 1:
+        client = build(names[0], True)
+    else:
+        from proxmox_cli.multicluster import MultiClusterClient
+
+        client = MultiClusterClient(
+            {name: (lambda name=name: build(name, False)) for name in names}
+        )
+
+    # Repeated GETs within one command share a single request
+    ctx.with_resource(client.request_scope())
+    if ctx.obj.get("stats"):
+        ctx.call_on_close(lambda: print_stats(client.stats.to_dict()))
+    return client
+
+
+def _delimiter(output_format):
+    """Get the field delimiter for CSV/TSV output, or None for other formats."""
+    try:
+        return DELIMITERS.get(OutputFormat(output_format))
+    except ValueError:
+        return None
+
+
+def print_list(ctx, rows, title, empty_message):
+    """Print list command results in the selected output format.
+
+    Rows are consumed lazily: --offset/--limit are applied while iterating,
+    and large table results are streamed instead of measured up front.
+
+    Args:
+        ctx: Click context object
+        rows: Iterable of row dictionaries (may be a generator)
+        title: Table title
+        empty_message: Message shown in table mode when there are no rows
+    """
+    rows = iter(rows)
+    offset = ctx.obj.get("offset") or 0
+    limit = ctx.obj.get("limit")
+    if offset or limit is not None:
+        rows = islice(rows, offset, None if limit is None else offset + limit)
+
+    output_format = ctx.obj.get("output_format", "json")
+    delimiter = _delimiter(output_format)
+    if delimiter is not None:
+        # Header plus rows, straight from the iterator; nothing for no rows
+        write_delimited(rows, delimiter)
+        return
+
+    first = next(rows, None)
+    if first is None:
+        if output_format == "json":
+            print_json([])
+        else:
+            print_error(empty_message)
+        return
+
+    rows = chain([first], rows)
+    if output_format == "json":
+        print_json(list(rows))
+    else:
+        print_rows(rows, title=title, page_size=ctx.obj.get("page_size"))
+
+
+def _compile_where(ctx, param, value):
+    """Click callback compiling a --where expression once at parse time."""
+    try:
+        return compile_filter(value)
+    except FilterError as e:
+        raise click.BadParameter(str(e), ctx=ctx, param=param)
+
+
+def where_option(f):
+    """Add a --where filter expression option to a list command."""
+    return click.option(
+        "--where",
+        callback=_compile_where,
+        help="Filter expression, e.g. 'status==running and maxmem>8G and name~\"^db-\"'",
+    )(f)
+
+
+def _parse_agg(ctx, param, value):
+    """Click callback parsing an --agg specification."""
+    if value is None:
+        return None
+    try:
+        return parse_aggregates(value)
+    except AggregateError as e:
+        raise click.BadParameter(str(e), ctx=ctx, param=param)
+
+
+def aggregate_options(f):
+    """Add --group-by and --agg options to a list command."""
+    f = click.option(
+        "--agg",
+        callback=_parse_agg,
+        help="Aggregates to compute, e.g. 'sum(mem),count(),max(cpu)' (default: count())",
+    )(f)
+    f = click.option(
+        "--group-by",
+        help="Summarise rows grouped by a field (e.g. node, status, pool, tag)",
+    )(f)
+    return f
+
+
+def annotate_pools(client, records):
+    """Yield guest records with their resource pool attached.
+
+    Per-node guest listings do not include pool membership, so it is looked
+    up once from the cluster resource list.
+
+    Args:
+        client: ProxmoxClient instance
+        records: Iterable of guest records
+
+    Yields:
+        Guest records with a 'pool' key
+    """
+    # VMIDs are only unique within a cluster
+    pools = {
+        (r.get("cluster"), r.get("vmid")): r.get("pool")
+        for r in client.get_cluster_resources("vm")
+        if r.get("pool") is not None
+    }
+    for record in records:
+        record.setdefault("pool", pools.get((record.get("cluster"), record.get("vmid"))))
+        yield record
+
+
+def print_aggregate(ctx, records, group_by, agg, title):
+    """Aggregate records in one pass and print the summary rows.
+
+    Args:
+        ctx: Click context object
+        records: Iterable of raw API records
+        group_by: Optional field to group by
+        agg: Parsed aggregates, or None for count()
+        title: Table title
+    """
+    rows = Aggregator(agg or [("count", None)], group_by).consume(records).rows()
+
+    output_format = ctx.obj.get("output_format", "json")
+    if output_format == "json":
+        print_json(rows)
+    elif _delimiter(output_format) is not None:
+        write_delimited(rows, _delimiter(output_format))
+    else:
+        for row in rows:
+            for k, v in row.items():
+                if isinstance(v, float):
+                    row[k] = f"{v:.2f}"
+        print_table(rows, title=title)
+
+
+def watch_option(f):
+    """Add a --watch [INTERVAL] option to a list command."""
+    return click.option(
+        "--watch",
+        type=click.FloatRange(min=0.5),
+        is_flag=False,
+        flag_value=2.0,
+        default=None,
+        metavar="[SECONDS]",
+        help="Keep polling every SECONDS (default: 2) and show only changes",
+    )(f)
+
+
+def fetch_cluster_rows(client, resource_type, project, guest_type=None, node=None, where=None):
+    """Fetch one /cluster/resources listing and project it into display rows.
+
+    Args:
+        client: ProxmoxClient instance
+        resource_type: Cluster resource type (vm, node, storage)
+        project: Callable turning a resource record into a display row
+        guest_type: Optional guest type to keep ('qemu' or 'lxc')
+        node: Optional node name to keep
+        where: Optional compiled filter applied to the raw records
+
+    Returns:
+        List of display rows
+    """
+    rows = []
+    # Each poll must see fresh data, not the command-wide shared responses
+    with client.request_scope():
+        resources = client.get_cluster_resources(resource_type)
+    for resource in resources:
+        if guest_type and resource.get("type") != guest_type:
+            continue
+        if node and resource.get("node") != node:
+            continue
+        if where is not None and not where(resource):
+            continue
+        rows.append(project(resource))
+    return rows
+
+
+def run_watch(ctx, fetch, key, interval, title, max_ticks=None):
+    """Poll a data source and render only what changed between polls.
+
+    JSON output becomes NDJSON with one added/changed/removed event per line;
+    table output prints the changed rows of each tick. Runs until interrupted.
+
+    Args:
+        ctx: Click context object
+        fetch: Callable returning the current rows (one API request per call)
+        key: Callable extracting a stable id from a row
+        interval: Seconds between polls
+        title: Table title
+        max_ticks: Optional number of polls before stopping
+    """
+    json_output = ctx.obj.get("output_format", "json") == "json"
+    row_key = key
+
+    def key(row):
+        # Rows merged from several clusters are only unique per cluster
+        cluster = row.get("cluster")
+        return row_key(row) if cluster is None else f"{cluster}/{row_key(row)}"
+
+    def report_error(error):
+        if json_output:
+            print(json.dumps({"event": "error", "error": str(error)}), flush=True)
+        else:
+            print_error(f"Poll failed: {str(error)}")
+
+    changes = poll_changes(fetch, key, interval, max_ticks=max_ticks, on_error=report_error)
+    try:
+        for events in changes:
+            if json_output:
+                for event, row_id, row in events:
+                    print(json.dumps({"event": event, "id": row_id, "data": row}), flush=True)
+            elif events:
+                table_data = []
+                for event, _, row in events:
+                    table_row = {"event": event}
+                    table_row.update(row)
+                    table_data.append(table_row)
+                print_table(table_data, title=f"{title} @ {datetime.now():%H:%M:%S}")
+    except KeyboardInterrupt:
+        pass
@@ -2,7 +2,8 @@
 
 import click
 
-from proxmox_cli.commands.helpers import get_proxmox_client
+from proxmox_cli.commands.helpers import get_proxmox_client, print_list, where_option
+from proxmox_cli.completion import complete_nodes, complete_vmids
 from proxmox_cli.utils.output import print_error, print_json, print_success, print_table
 
 
@@ -13,48 +14,19 @@ def image():
 
 
 @image.command("list")
-@click.option("--node", "-n", help="Filter by node name")
+@click.option("--node", "-n", help="Filter by node name", shell_complete=complete_nodes)
+@where_option
 @click.pass_context
-def list_images(ctx, node):
+def list_images(ctx, node, where):
     """List all VM templates."""
     try:
         client = get_proxmox_client(ctx)
 
-        vms = client.get_vms(node=node)
+        vms = client.iter_vms(node=node, where=where)
 
         # Filter only templates
-        templates = [v for v in vms if v.get("template", 0) == 1]
-
-        if templates:
-            # Format template information
-            filtered_templates = []
-            for t in templates:
-                filtered_templates.append(
-                    {
-                        "vmid": t.get("vmid"),
-                        "name": t.get("name"),
-                        "node": t.get("node", "unknown"),
-                        "disk": f"{t.get('maxdisk', 0) / (1024**3):.2f}GB",
-                        "memory": f"{t.get('maxmem', 0) / (1024**3):.2f}GB",
-                        "cpu": f"{t.get('cpus', 0)} cores",
-                    }
-                )
-
-            # Check output format from context
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(filtered_templates)
-            else:
-                # Convert keys to uppercase for table display
-                table_data = []
-                for item in filtered_templates:
-                    table_data.append({k.upper(): v for k, v in item.items()})
-                print_table(table_data, title="VM Templates")
-        else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                print_error("No templates found")
+        templates = (v for v in vms if v.is_template)
+        print_list(ctx, (t.template_row() for t in templates), "VM Templates", "No templates found")
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -64,8 +36,10 @@ def list_images(ctx, node):
 
 
 @image.command("info")
-@click.argument("vmid", type=int)
-@click.option("--node", "-n", help="Node name where template is located")
+@click.argument("vmid", type=int, shell_complete=complete_vmids)
+@click.option(
+    "--node", "-n", help="Node name where template is located", shell_complete=complete_nodes
+)
 @click.pass_context
 def template_info(ctx, vmid, node):
     """Show detailed information about a VM template.
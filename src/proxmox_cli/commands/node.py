@@ -2,7 +2,15 @@
 
 import click
 
-from proxmox_cli.commands.helpers import get_proxmox_client
+from proxmox_cli.commands.helpers import (
+    fetch_cluster_rows,
+    get_proxmox_client,
+    print_list,
+    run_watch,
+    watch_option,
+    where_option,
+)
+from proxmox_cli.completion import complete_nodes
 from proxmox_cli.utils.output import print_error, print_json, print_table
 
 
@@ -13,25 +21,29 @@ def node():
 
 
 @node.command("list")
+@where_option
+@watch_option
 @click.pass_context
-def list_nodes(ctx):
+def list_nodes(ctx, where, watch):
     """List all nodes in the cluster."""
     try:
         client = get_proxmox_client(ctx)
 
+        if watch:
+            run_watch(
+                ctx,
+                lambda: fetch_cluster_rows(client, "node", lambda n: n.list_row(), where=where),
+                key=lambda row: row["node"],
+                interval=watch,
+                title="Cluster Nodes",
+            )
+            return
+
         nodes = client.get_nodes()
+        if where is not None:
+            nodes = [n for n in nodes if where(n)]
 
-        if nodes:
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(nodes)
-            else:
-                print_table(nodes, title="Cluster Nodes")
-        else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                print_error("No nodes found")
+        print_list(ctx, nodes, "Cluster Nodes", "No nodes found")
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -41,7 +53,7 @@ def list_nodes(ctx):
 
 
 @node.command("status")
-@click.argument("node_name")
+@click.argument("node_name", shell_complete=complete_nodes)
 @click.pass_context
 def node_status(ctx, node_name):
     """Get node status information."""
@@ -2,8 +2,17 @@
 
 import click
 
-from proxmox_cli.commands.helpers import get_proxmox_client
-from proxmox_cli.utils.output import print_error, print_json, print_success, print_table
+from proxmox_cli.commands.helpers import get_proxmox_client, print_list, where_option
+from proxmox_cli.completion import complete_nodes, complete_pools, complete_vmids
+from proxmox_cli.utils.concurrency import fan_out
+from proxmox_cli.utils.output import (
+    print_error,
+    print_json,
+    print_success,
+    print_table,
+    print_warning,
+)
+from proxmox_cli.utils.selectors import GuestSelector, parse_ids
 
 
 @click.group()
@@ -12,26 +21,95 @@ def pool():
     pass
 
 
+def _round(value):
+    return round(value, 2) if isinstance(value, float) else value
+
+
+def pool_rows(pools, resources, with_members=False, usage=False):
+    """Join pool members with a cluster resource snapshot.
+
+    Members are matched to resources by id ('qemu/100', 'storage/pve1/local'),
+    so usage figures come from one consistent snapshot; members missing from
+    it fall back to the figures in the pool listing.
+
+    Args:
+        pools: Pool dictionaries with 'members' (from ProxmoxClient.iter_pools)
+        resources: Records from /cluster/resources
+        with_members: Include the member ids
+        usage: Include per-pool CPU, memory and disk totals
+
+    Returns:
+        List of row dictionaries, sorted by pool
+    """
+    by_id = {(r.get("cluster"), r.get("id")): r for r in resources}
+    rows = []
+    for pool in sorted(pools, key=lambda p: (p.get("cluster") or "", p["poolid"])):
+        row = {"poolid": pool["poolid"], "comment": pool.get("comment", "")}
+        if pool.get("cluster"):
+            row = {"cluster": pool["cluster"], **row}
+        guests, storages = [], []
+        totals = dict.fromkeys(("running", "cpu", "maxcpu", "mem", "maxmem", "disk", "maxdisk"), 0)
+        totals.update(storage_used=0, storage_total=0)
+        shared = set()
+        for member in pool.get("members") or []:
+            record = by_id.get((pool.get("cluster"), member.get("id")), member)
+            if member.get("type") == "storage":
+                storages.append(member.get("storage"))
+                # Shared storage is listed once per node but counted once
+                if record.get("shared"):
+                    if member.get("storage") in shared:
+                        continue
+                    shared.add(member.get("storage"))
+                totals["storage_used"] += record.get("disk") or 0
+                totals["storage_total"] += record.get("maxdisk") or 0
+                continue
+            guests.append(str(member.get("vmid")))
+            totals["running"] += record.get("status") == "running"
+            totals["cpu"] += (record.get("cpu") or 0) * (record.get("maxcpu") or 0)
+            for field in ("maxcpu", "mem", "maxmem", "disk", "maxdisk"):
+                totals[field] += record.get(field) or 0
+        row["guests"] = len(guests)
+        row["storages"] = len(set(storages))
+        if usage:
+            row.update((field, _round(value)) for field, value in totals.items())
+        if with_members:
+            row["members"] = ",".join(guests + sorted(set(storages)))
+        rows.append(row)
+    return rows
+
+
 @pool.command("list")
+@click.option("--with-members", is_flag=True, help="Include member counts and ids")
+@click.option(
+    "--usage",
+    is_flag=True,
+    help="Include per-pool running guests and CPU (cores in use), memory and disk totals",
+)
 @click.pass_context
-def list_pools(ctx):
-    """List all resource pools."""
+def list_pools(ctx, with_members, usage):
+    """List all resource pools.
+
+    With --with-members or --usage, every pool's details are read
+    concurrently and joined with one cluster resource listing.
+    """
     try:
         client = get_proxmox_client(ctx)
 
-        pools = client.api.pools.get()
-
-        if pools:
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(pools)
-            else:
-                print_table(pools, title="Resource Pools")
+        if with_members or usage:
+            reads = {
+                "pools": lambda: list(client.iter_pools()),
+                "resources": lambda: client.get_cluster_resources() if usage else [],
+            }
+            data = {}
+            for name, result, error in fan_out(lambda name: reads[name](), list(reads), 2):
+                if error is not None:
+                    raise error
+                data[name] = result
+            pools = pool_rows(data["pools"], data["resources"], with_members, usage)
         else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                print_error("No resource pools found")
+            pools = client.api.pools.get()
+
+        print_list(ctx, pools, "Resource Pools", "No resource pools found")
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -68,7 +146,7 @@ def create_pool(ctx, poolid, comment):
 
 
 @pool.command("delete")
-@click.argument("poolid")
+@click.argument("poolid", shell_complete=complete_pools)
 @click.pass_context
 def delete_pool(ctx, poolid):
     """Delete a resource pool."""
@@ -90,7 +168,7 @@ def delete_pool(ctx, poolid):
 
 
 @pool.command("update")
-@click.argument("poolid")
+@click.argument("poolid", shell_complete=complete_pools)
 @click.option("--comment", help="Pool comment/description")
 @click.pass_context
 def update_pool(ctx, poolid, comment):
@@ -116,7 +194,7 @@ def update_pool(ctx, poolid, comment):
 
 
 @pool.command("show")
-@click.argument("poolid")
+@click.argument("poolid", shell_complete=complete_pools)
 @click.pass_context
 def show_pool(ctx, poolid):
     """Show resource pool details including members."""
@@ -151,44 +229,152 @@ def show_pool(ctx, poolid):
             print_error(f"Failed to get pool info: {str(e)}")
 
 
+def selector_options(f):
+    """Add guest selector options (--vm, --name, --tag, --node, --where, --from-stdin)."""
+    f = click.option(
+        "--from-stdin",
+        is_flag=True,
+        help="Read VM/container ids from stdin (whitespace or comma separated)",
+    )(f)
+    f = where_option(f)
+    f = click.option(
+        "--node",
+        "nodes",
+        multiple=True,
+        shell_complete=complete_nodes,
+        help="Select guests on this node (can specify multiple)",
+    )(f)
+    f = click.option(
+        "--tag", "tags", multiple=True, help="Select guests with this tag (can specify multiple)"
+    )(f)
+    f = click.option(
+        "--name",
+        "names",
+        multiple=True,
+        help="Select guests whose name matches this glob, e.g. 'web-*' (can specify multiple)",
+    )(f)
+    f = click.option(
+        "--vm",
+        "vms",
+        type=int,
+        multiple=True,
+        shell_complete=complete_vmids,
+        help="VM/container ID (can specify multiple)",
+    )(f)
+    return f
+
+
+def build_selector(vms, names, tags, nodes, where, from_stdin):
+    """Build a guest selector from the selector options.
+
+    Returns:
+        GuestSelector instance
+    """
+    ids = list(vms)
+    if from_stdin:
+        ids += parse_ids(click.get_text_stream("stdin").read())
+    return GuestSelector(names=names, tags=tags, nodes=nodes, where=where, ids=ids)
+
+
+def plan_members(client, poolid, selector, mode, allow_move=False):
+    """Resolve a selector into the guest ids to add to and remove from a pool.
+
+    Selectors with criteria are resolved against one /cluster/resources
+    snapshot, which also gives current pool membership: guests already in the
+    pool are not added again, and guests in another pool are skipped unless
+    allow_move is set. Explicit ids alone need no snapshot for add or remove.
+
+    Args:
+        client: ProxmoxClient instance
+        poolid: Pool identifier
+        selector: GuestSelector instance
+        mode: 'add', 'remove' or 'sync' (make membership exactly match)
+        allow_move: Move guests that are members of another pool
+
+    Returns:
+        Dictionary with 'add', 'remove' and 'skipped' id lists
+    """
+    if not selector.has_criteria and mode != "sync":
+        ids = sorted(selector.ids)
+        return {
+            "add": ids if mode == "add" else [],
+            "remove": ids if mode == "remove" else [],
+            "skipped": [],
+        }
+
+    guests = [g for g in client.get_cluster_resources("vm") if g.get("type") in ("qemu", "lxc")]
+    pools = {int(g["vmid"]): g.get("pool") for g in guests}
+    selected = selector.select(guests)
+    current = {vmid for vmid, pool in pools.items() if pool == poolid}
+
+    add, skipped = [], []
+    if mode in ("add", "sync"):
+        for vmid in selected:
+            if vmid in current:
+                continue
+            if pools.get(vmid) and not allow_move:
+                skipped.append(vmid)
+            else:
+                add.append(vmid)
+    if mode == "remove":
+        remove = [vmid for vmid in selected if vmid in current]
+    elif mode == "sync":
+        remove = sorted(current.difference(selected))
+    else:
+        remove = []
+    return {"add": add, "remove": remove, "skipped": skipped}
+
+
 @pool.command("add-member")
-@click.argument("poolid")
-@click.option("--vm", "vms", multiple=True, help="VM ID to add to pool (can specify multiple)")
+@click.argument("poolid", shell_complete=complete_pools)
+@selector_options
 @click.option(
     "--storage", "storages", multiple=True, help="Storage ID to add to pool (can specify multiple)"
 )
+@click.option("--move", is_flag=True, help="Move selected guests out of their current pool")
 @click.pass_context
-def add_member(ctx, poolid, vms, storages):
-    """Add VMs or storage to a resource pool."""
-    try:
-        client = get_proxmox_client(ctx)
-
-        if not vms and not storages:
-            raise ValueError("Must specify at least one VM or storage to add")
+def add_member(ctx, poolid, vms, names, tags, nodes, where, from_stdin, storages, move):
+    """Add VMs or storage to a resource pool.
 
-        # Prepare the update data
-        update_data = {}
-        if vms:
-            update_data["vms"] = ",".join(vms)
-        if storages:
-            update_data["storage"] = ",".join(storages)
+    Guests are given by id or selected by name glob, tag, node and --where
+    expression, resolved against one cluster resource snapshot. Ids are sent
+    in batches, so thousands of guests take a handful of requests.
+    """
+    try:
+        selector = build_selector(vms, names, tags, nodes, where, from_stdin)
+        if not selector and not storages:
+            raise ValueError("Must specify at least one VM, selector or storage to add")
 
-        client.api.pools(poolid).put(**update_data)
+        client = get_proxmox_client(ctx)
+        changes = plan_members(client, poolid, selector, "add", allow_move=move)
+        requests = 0
+        if changes["add"] or storages:
+            requests = client.add_pool_members(
+                poolid, changes["add"], list(storages), allow_move=move
+            )
 
         if ctx.obj.get("output_format", "json") == "json":
             print_json(
                 {
                     "success": True,
                     "poolid": poolid,
-                    "vms_added": list(vms),
+                    "vms_added": changes["add"],
                     "storages_added": list(storages),
+                    "skipped": changes["skipped"],
+                    "requests": requests,
                 }
             )
         else:
-            if vms:
-                print_success(f"Added VMs {', '.join(vms)} to pool '{poolid}'")
+            if changes["add"]:
+                print_success(f"Added {_ids(changes['add'])} to pool '{poolid}'")
+            elif selector:
+                print_warning(f"No guests to add to pool '{poolid}'")
             if storages:
                 print_success(f"Added storages {', '.join(storages)} to pool '{poolid}'")
+            if changes["skipped"]:
+                print_warning(
+                    f"Skipped {_ids(changes['skipped'])} already in another pool (use --move)"
+                )
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -198,8 +384,8 @@ def add_member(ctx, poolid, vms, storages):
 
 
 @pool.command("remove-member")
-@click.argument("poolid")
-@click.option("--vm", "vms", multiple=True, help="VM ID to remove from pool (can specify multiple)")
+@click.argument("poolid", shell_complete=complete_pools)
+@selector_options
 @click.option(
     "--storage",
     "storages",
@@ -207,35 +393,37 @@ def add_member(ctx, poolid, vms, storages):
     help="Storage ID to remove from pool (can specify multiple)",
 )
 @click.pass_context
-def remove_member(ctx, poolid, vms, storages):
-    """Remove VMs or storage from a resource pool."""
-    try:
-        client = get_proxmox_client(ctx)
+def remove_member(ctx, poolid, vms, names, tags, nodes, where, from_stdin, storages):
+    """Remove VMs or storage from a resource pool.
 
-        if not vms and not storages:
-            raise ValueError("Must specify at least one VM or storage to remove")
-
-        # Prepare the delete data
-        delete_data = {}
-        if vms:
-            delete_data["vms"] = ",".join(vms)
-        if storages:
-            delete_data["storage"] = ",".join(storages)
+    Selector options only match guests that are currently in the pool.
+    """
+    try:
+        selector = build_selector(vms, names, tags, nodes, where, from_stdin)
+        if not selector and not storages:
+            raise ValueError("Must specify at least one VM, selector or storage to remove")
 
-        client.api.pools(poolid).put(delete=1, **delete_data)
+        client = get_proxmox_client(ctx)
+        changes = plan_members(client, poolid, selector, "remove")
+        requests = 0
+        if changes["remove"] or storages:
+            requests = client.remove_pool_members(poolid, changes["remove"], list(storages))
 
         if ctx.obj.get("output_format", "json") == "json":
             print_json(
                 {
                     "success": True,
                     "poolid": poolid,
-                    "vms_removed": list(vms),
+                    "vms_removed": changes["remove"],
                     "storages_removed": list(storages),
+                    "requests": requests,
                 }
             )
         else:
-            if vms:
-                print_success(f"Removed VMs {', '.join(vms)} from pool '{poolid}'")
+            if changes["remove"]:
+                print_success(f"Removed {_ids(changes['remove'])} from pool '{poolid}'")
+            elif selector:
+                print_warning(f"No selected guests are in pool '{poolid}'")
             if storages:
                 print_success(f"Removed storages {', '.join(storages)} from pool '{poolid}'")
 
@@ -244,3 +432,71 @@ def remove_member(ctx, poolid, vms, storages):
             print_json({"error": str(e), "success": False})
         else:
             print_error(f"Failed to remove members from pool: {str(e)}")
+
+
+@pool.command("sync")
+@click.argument("poolid", shell_complete=complete_pools)
+@selector_options
+@click.option("--move", is_flag=True, help="Move selected guests out of their current pool")
+@click.option("--dry-run", is_flag=True, help="Show the changes without applying them")
+@click.pass_context
+def sync_members(ctx, poolid, vms, names, tags, nodes, where, from_stdin, move, dry_run):
+    """Make a pool's guest members exactly match a selector.
+
+    Selected guests not in the pool are added and pool guests that are not
+    selected are removed, in at most a few batched requests. Storage
+    members are left unchanged.
+    """
+    try:
+        selector = build_selector(vms, names, tags, nodes, where, from_stdin)
+        if not selector:
+            raise ValueError("Must specify at least one VM or selector")
+
+        client = get_proxmox_client(ctx)
+        changes = plan_members(client, poolid, selector, "sync", allow_move=move)
+        requests = 0
+        if not dry_run:
+            if changes["remove"]:
+                requests += client.remove_pool_members(poolid, changes["remove"])
+            if changes["add"]:
+                requests += client.add_pool_members(poolid, changes["add"], allow_move=move)
+
+        if ctx.obj.get("output_format", "json") == "json":
+            print_json(
+                {
+                    "success": True,
+                    "poolid": poolid,
+                    "dry_run": dry_run,
+                    "vms_added": changes["add"],
+                    "vms_removed": changes["remove"],
+                    "skipped": changes["skipped"],
+                    "requests": requests,
+                }
+            )
+        else:
+            prefix = "Would add" if dry_run else "Added"
+            if changes["add"]:
+                print_success(f"{prefix} {_ids(changes['add'])} to pool '{poolid}'")
+            prefix = "Would remove" if dry_run else "Removed"
+            if changes["remove"]:
+                print_success(f"{prefix} {_ids(changes['remove'])} from pool '{poolid}'")
+            if not changes["add"] and not changes["remove"]:
+                print_success(f"Pool '{poolid}' is in sync")
+            if changes["skipped"]:
+                print_warning(
+                    f"Skipped {_ids(changes['skipped'])} already in another pool (use --move)"
+                )
+
+    except Exception as e:
+        if ctx.obj.get("output_format", "json") == "json":
+            print_json({"error": str(e), "success": False})
+        else:
+            print_error(f"Failed to sync pool members: {str(e)}")
+
+
+def _ids(ids, shown=10):
+    """Format a list of guest ids for a message, abbreviating long lists."""
+    text = ", ".join(str(i) for i in ids[:shown])
+    if len(ids) > shown:
+        text += f" and {len(ids) - shown} more"
+    return f"{len(ids)} guest(s) ({text})"
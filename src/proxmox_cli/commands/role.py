@@ -2,7 +2,8 @@
 
 import click
 
-from proxmox_cli.commands.helpers import get_proxmox_client
+from proxmox_cli.commands.helpers import get_proxmox_client, print_list
+from proxmox_cli.completion import complete_roles
 from proxmox_cli.utils.output import print_error, print_json, print_success, print_table
 
 
@@ -19,19 +20,9 @@ def list_roles(ctx):
     try:
         client = get_proxmox_client(ctx)
 
-        roles = client.api.access.roles.get()
+        roles = client.get_roles()
 
-        if roles:
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(roles)
-            else:
-                print_table(roles, title="Roles")
-        else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                print_error("No roles found")
+        print_list(ctx, roles, "Roles", "No roles found")
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -68,7 +59,7 @@ def create_role(ctx, roleid, privs):
 
 
 @role.command("delete")
-@click.argument("roleid")
+@click.argument("roleid", shell_complete=complete_roles)
 @click.pass_context
 def delete_role(ctx, roleid):
     """Delete a role."""
@@ -90,7 +81,7 @@ def delete_role(ctx, roleid):
 
 
 @role.command("update")
-@click.argument("roleid")
+@click.argument("roleid", shell_complete=complete_roles)
 @click.option("--privs", required=True, help="Comma-separated list of privileges")
 @click.option("--append/--no-append", default=False, help="Append privileges instead of replacing")
 @click.pass_context
@@ -118,7 +109,7 @@ def update_role(ctx, roleid, privs, append):
 
 
 @role.command("show")
-@click.argument("roleid")
+@click.argument("roleid", shell_complete=complete_roles)
 @click.pass_context
 def show_role(ctx, roleid):
     """Show role details."""
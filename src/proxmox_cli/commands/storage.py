@@ -2,8 +2,18 @@
 
 import click
 
-from proxmox_cli.commands.helpers import get_proxmox_client
-from proxmox_cli.utils.output import print_error, print_json, print_success, print_table
+from proxmox_cli.commands.helpers import (
+    aggregate_options,
+    fetch_cluster_rows,
+    get_proxmox_client,
+    print_aggregate,
+    print_list,
+    run_watch,
+    watch_option,
+    where_option,
+)
+from proxmox_cli.completion import complete_node_lists, complete_storages
+from proxmox_cli.utils.output import print_error, print_json, print_success
 
 
 @click.group()
@@ -13,25 +23,41 @@ def storage():
 
 
 @storage.command("list")
+@where_option
+@aggregate_options
+@watch_option
 @click.pass_context
-def list_storage(ctx):
-    """List all storage."""
+def list_storage(ctx, where, group_by, agg, watch):
+    """List all storage.
+
+    With --group-by/--agg or --watch, per-node storage usage (disk, maxdisk,
+    node, status, plugintype, shared) from the cluster resource list is used.
+    """
     try:
         client = get_proxmox_client(ctx)
 
-        storage_list = client.api.storage.get()
-
-        if storage_list:
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(storage_list)
-            else:
-                print_table(storage_list, title="Storage")
-        else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                print_error("No storage found")
+        if watch:
+            run_watch(
+                ctx,
+                lambda: fetch_cluster_rows(client, "storage", lambda s: s.usage_row(), where=where),
+                key=lambda row: f"{row['node']}/{row['storage']}",
+                interval=watch,
+                title="Storage",
+            )
+            return
+
+        if group_by or agg:
+            usage = client.get_cluster_resources("storage")
+            if where is not None:
+                usage = (s for s in usage if where(s))
+            print_aggregate(ctx, usage, group_by, agg, "Storage")
+            return
+
+        storage_list = client.get_storage()
+        if where is not None:
+            storage_list = [s for s in storage_list if where(s)]
+
+        print_list(ctx, storage_list, "Storage", "No storage found")
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -41,7 +67,7 @@ def list_storage(ctx):
 
 
 @storage.command("create")
-@click.argument("storage_id")
+@click.argument("storage_id", shell_complete=complete_storages)
 @click.option("--type", "-t", "storage_type", default="dir", help="Storage type (default: dir)")
 @click.option("--path", "-p", required=True, help="Path on the filesystem")
 @click.option(
@@ -49,7 +75,12 @@ def list_storage(ctx):
     "-c",
     help="Content types (comma-separated: vztmpl,iso,backup,images,rootdir,snippets)",
 )
-@click.option("--nodes", "-n", help="Comma-separated list of cluster nodes (optional)")
+@click.option(
+    "--nodes",
+    "-n",
+    help="Comma-separated list of cluster nodes (optional)",
+    shell_complete=complete_node_lists,
+)
 @click.option(
     "--shared/--no-shared",
     default=False,
@@ -1,9 +1,18 @@
 """API Token management commands."""
 
+import time
+
 import click
 
-from proxmox_cli.commands.helpers import get_proxmox_client
-from proxmox_cli.utils.output import print_error, print_json, print_success, print_table
+from proxmox_cli.commands.helpers import get_proxmox_client, print_list
+from proxmox_cli.completion import complete_users
+from proxmox_cli.utils.output import (
+    print_error,
+    print_json,
+    print_success,
+    print_table,
+    print_warning,
+)
 
 
 @click.group()
@@ -12,27 +21,112 @@ def token():
     pass
 
 
+def token_row(token, now):
+    """Format a token with its expiry and privilege-separation status.
+
+    Args:
+        token: Token dictionary from ProxmoxClient.get_tokens()
+        now: Current Unix time
+
+    Returns:
+        Row dictionary
+    """
+    expire = int(token.get("expire") or 0)
+    if not expire:
+        status = "never"
+    elif expire <= now:
+        status = "expired"
+    else:
+        status = f"in {(expire - now) // 86400}d"
+    return {
+        "id": token.get("id"),
+        "userid": token.get("userid"),
+        "tokenid": token.get("tokenid"),
+        "privsep": "yes" if int(token.get("privsep", 1)) else "no",
+        "expire": expire,
+        "expires": status,
+        "comment": token.get("comment", ""),
+    }
+
+
+def summarize_tokens(rows, now, warn_days):
+    """Count tokens per user by expiry and privilege separation.
+
+    Args:
+        rows: Rows from token_row()
+        now: Current Unix time
+        warn_days: Days within which an expiry counts as 'expiring'
+
+    Returns:
+        One summary row per user plus a 'TOTAL' row
+    """
+    fields = ("tokens", "expired", "expiring", "no_expiry", "no_privsep")
+    totals = {}
+    for row in rows:
+        for userid in (row["userid"], "TOTAL"):
+            counts = totals.setdefault(userid, dict.fromkeys(fields, 0))
+            counts["tokens"] += 1
+            if not row["expire"]:
+                counts["no_expiry"] += 1
+            elif row["expire"] <= now:
+                counts["expired"] += 1
+            elif row["expire"] <= now + warn_days * 86400:
+                counts["expiring"] += 1
+            if row["privsep"] == "no":
+                counts["no_privsep"] += 1
+    total = totals.pop("TOTAL", dict.fromkeys(fields, 0))
+    summary = [{"userid": userid, **totals[userid]} for userid in sorted(totals)]
+    return summary + [{"userid": "TOTAL", **total}]
+
+
 @token.command("list")
-@click.argument("userid")
+@click.argument("userid", required=False, shell_complete=complete_users)
+@click.option("--all-users", is_flag=True, help="List the tokens of every user")
+@click.option(
+    "--summary",
+    is_flag=True,
+    help="Show per-user counts of expired, expiring, non-expiring and non-privsep tokens",
+)
+@click.option(
+    "--expiring-days",
+    default=30,
+    type=click.IntRange(min=0),
+    help="Days ahead counted as expiring in --summary (default: 30)",
+)
 @click.pass_context
-def list_tokens(ctx, userid):
-    """List all API tokens for a user."""
+def list_tokens(ctx, userid, all_users, summary, expiring_days):
+    """List API tokens for a user, or for every user with --all-users.
+
+    With --all-users, users are listed once and their tokens are fetched
+    concurrently; rows are printed as each user's tokens arrive. Users
+    whose tokens cannot be read are reported on stderr.
+    """
+    if bool(userid) == all_users:
+        raise click.UsageError("Give either USERID or --all-users")
+
     try:
         client = get_proxmox_client(ctx)
+        now = int(time.time())
+        skipped = client.stats.get("skipped_users")
 
-        tokens = client.api.access.users(userid).token.get()
+        if all_users:
+            tokens = client.iter_tokens()
+            title = "API Tokens"
+            empty = "No tokens found"
+        else:
+            tokens = client.get_tokens(userid)
+            title = f"API Tokens for {userid}"
+            empty = f"No tokens found for user '{userid}'"
 
-        if tokens:
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(tokens)
-            else:
-                print_table(tokens, title=f"API Tokens for {userid}")
+        rows = (token_row(t, now) for t in tokens)
+        if summary:
+            print_list(ctx, summarize_tokens(rows, now, expiring_days), "Token Summary", empty)
         else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                print_error(f"No tokens found for user '{userid}'")
+            print_list(ctx, rows, title, empty)
+
+        skipped = int(client.stats.get("skipped_users") - skipped)
+        if skipped:
+            print_warning(f"Skipped {skipped} user(s) whose tokens could not be read", err=True)
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -42,7 +136,7 @@ def list_tokens(ctx, userid):
 
 
 @token.command("create")
-@click.argument("userid")
+@click.argument("userid", shell_complete=complete_users)
 @click.argument("tokenid")
 @click.option("--privsep/--no-privsep", default=True, help="Enable privilege separation")
 @click.option("--expire", type=int, help="Token expiration date (Unix epoch)")
@@ -85,7 +179,7 @@ def create_token(ctx, userid, tokenid, privsep, expire, comment):
 
 
 @token.command("delete")
-@click.argument("userid")
+@click.argument("userid", shell_complete=complete_users)
 @click.argument("tokenid")
 @click.pass_context
 def delete_token(ctx, userid, tokenid):
@@ -108,7 +202,7 @@ def delete_token(ctx, userid, tokenid):
 
 
 @token.command("update")
-@click.argument("userid")
+@click.argument("userid", shell_complete=complete_users)
 @click.argument("tokenid")
 @click.option("--privsep/--no-privsep", default=None, help="Enable privilege separation")
 @click.option("--expire", type=int, help="Token expiration date (Unix epoch)")
@@ -146,7 +240,7 @@ def update_token(ctx, userid, tokenid, privsep, expire, comment):
 
 
 @token.command("show")
-@click.argument("userid")
+@click.argument("userid", shell_complete=complete_users)
 @click.argument("tokenid")
 @click.pass_context
 def show_token(ctx, userid, tokenid):
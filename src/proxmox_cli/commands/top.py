@@ -0,0 +1,191 @@
+"""Live cluster dashboard command."""
+
+import heapq
+import time
+
+import click
+from rich.console import Group
+from rich.live import Live
+from rich.table import Table
+
+from proxmox_cli.commands.helpers import get_proxmox_client, where_option
+from proxmox_cli.utils.helpers import format_size, format_uptime
+from proxmox_cli.utils.output import console, print_error
+
+# Cumulative counters reported per guest by /cluster/resources
+RATE_FIELDS = ("diskread", "diskwrite", "netin", "netout")
+
+SORT_FIELDS = ("cpu", "mem") + RATE_FIELDS
+
+
+def compute_rates(previous, current, elapsed):
+    """Attach per-second rates derived from two consecutive samples.
+
+    Counters that went backwards (guest restarted or migrated) and guests
+    that were not in the previous sample get a rate of 0.
+
+    Args:
+        previous: Previous sample keyed by resource id
+        current: Current sample keyed by resource id
+        elapsed: Seconds between the two samples
+
+    Returns:
+        List of resource dictionaries with '<field>_rate' keys added
+    """
+    rows = []
+    for resource_id, resource in current.items():
+        before = previous.get(resource_id)
+        row = dict(resource)
+        for field in RATE_FIELDS:
+            rate = 0.0
+            if before is not None and elapsed > 0:
+                delta = resource.get(field, 0) - before.get(field, 0)
+                if delta > 0:
+                    rate = delta / elapsed
+            row[f"{field}_rate"] = rate
+        rows.append(row)
+    return rows
+
+
+def top_guests(rows, sort, limit):
+    """Select the top guests with a bounded heap.
+
+    Args:
+        rows: Guest rows from compute_rates()
+        sort: Field to sort by (cpu, mem or a rate field)
+        limit: Number of guests to keep
+
+    Returns:
+        Up to ``limit`` rows in descending order
+    """
+    field = f"{sort}_rate" if sort in RATE_FIELDS else sort
+    return heapq.nlargest(limit, rows, key=lambda r: r.get(field) or 0)
+
+
+def _rate(value):
+    return f"{format_size(value)}/s"
+
+
+def _qualified(resource, name):
+    """Prefix a name with the resource's cluster when several are shown."""
+    cluster = resource.get("cluster")
+    return str(name) if cluster is None else f"{cluster}/{name}"
+
+
+def _render(nodes, guests, sort, interval):
+    node_table = Table(title="Nodes", show_header=True, header_style="bold magenta")
+    for column in ("NODE", "STATUS", "CPU", "MEMORY", "DISK", "UPTIME"):
+        node_table.add_column(column)
+    for n in sorted(nodes, key=lambda n: (n.get("cluster") or "", n.get("node", ""))):
+        node_table.add_row(
+            _qualified(n, n.get("node")),
+            str(n.get("status")),
+            f"{n.get('cpu', 0)*100:.1f}%",
+            f"{format_size(n.get('mem', 0))} / {format_size(n.get('maxmem', 0))}",
+            f"{format_size(n.get('disk', 0))} / {format_size(n.get('maxdisk', 0))}",
+            format_uptime(n.get("uptime", 0)),
+        )
+
+    guest_table = Table(
+        title=f"Top guests by {sort} (refresh {interval:g}s)",
+        show_header=True,
+        header_style="bold magenta",
+    )
+    guest_columns = (
+        "ID",
+        "NAME",
+        "NODE",
+        "STATUS",
+        "CPU",
+        "MEMORY",
+        "DISK READ",
+        "DISK WRITE",
+        "NET IN",
+        "NET OUT",
+    )
+    for column in guest_columns:
+        guest_table.add_column(column)
+    for g in guests:
+        guest_table.add_row(
+            _qualified(g, g.get("id")),
+            str(g.get("name", "")),
+            str(g.get("node")),
+            str(g.get("status")),
+            f"{g.get('cpu', 0)*100:.1f}%",
+            f"{format_size(g.get('mem', 0))} / {format_size(g.get('maxmem', 0))}",
+            _rate(g["diskread_rate"]),
+            _rate(g["diskwrite_rate"]),
+            _rate(g["netin_rate"]),
+            _rate(g["netout_rate"]),
+        )
+
+    return Group(node_table, guest_table)
+
+
+@click.command()
+@click.option(
+    "--interval",
+    "-i",
+    default=2.0,
+    type=click.FloatRange(min=0.5),
+    help="Seconds between refreshes (default: 2)",
+)
+@click.option("--limit", "-k", default=20, type=click.IntRange(min=1), help="Guests to show")
+@click.option(
+    "--sort",
+    "-s",
+    default="cpu",
+    type=click.Choice(SORT_FIELDS),
+    help="Sort guests by field (default: cpu)",
+)
+@click.option("--all", "show_all", is_flag=True, help="Include stopped guests")
+@click.option("--iterations", "-n", type=click.IntRange(min=1), help="Stop after N refreshes")
+@where_option
+@click.pass_context
+def top(ctx, interval, limit, sort, show_all, iterations, where):
+    """Live dashboard of node and guest resource usage.
+
+    Each refresh is a single /cluster/resources request; disk and network
+    rates are computed from the difference between consecutive samples.
+    """
+    try:
+        client = get_proxmox_client(ctx)
+
+        previous = {}
+        previous_time = None
+        tick = 0
+        with Live(console=console, auto_refresh=False) as live:
+            while True:
+                started = time.monotonic()
+                with client.request_scope():
+                    resources = client.get_cluster_resources()
+                sampled = time.monotonic()
+
+                nodes = [r for r in resources if r.get("type") == "node"]
+                current = {}
+                for r in resources:
+                    if r.get("type") not in ("qemu", "lxc"):
+                        continue
+                    if not show_all and r.get("status") != "running":
+                        continue
+                    if where is not None and not where(r):
+                        continue
+                    # Guest ids repeat across clusters
+                    current[(r.get("cluster"), r["id"])] = r
+
+                elapsed = sampled - previous_time if previous_time is not None else 0
+                rows = compute_rates(previous, current, elapsed)
+                live.update(
+                    _render(nodes, top_guests(rows, sort, limit), sort, interval), refresh=True
+                )
+                previous, previous_time = current, sampled
+
+                tick += 1
+                if iterations is not None and tick >= iterations:
+                    break
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print_error(f"Failed to run dashboard: {str(e)}")
@@ -2,7 +2,9 @@
 
 import click
 
-from proxmox_cli.commands.helpers import get_proxmox_client
+from proxmox_cli.commands.helpers import get_proxmox_client, print_list
+from proxmox_cli.completion import complete_users
+from proxmox_cli.directory import fetch_directory
 from proxmox_cli.utils.output import print_error, print_json, print_success, print_table
 
 
@@ -13,25 +15,23 @@ def user():
 
 
 @user.command("list")
+@click.option(
+    "--expand",
+    is_flag=True,
+    help="Include group memberships and API token ids, joined from one full user listing",
+)
 @click.pass_context
-def list_users(ctx):
+def list_users(ctx, expand):
     """List all users."""
     try:
         client = get_proxmox_client(ctx)
 
-        users = client.api.access.users.get()
-
-        if users:
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(users)
-            else:
-                print_table(users, title="Users")
+        if expand:
+            users = fetch_directory(client, client.max_workers).user_rows()
         else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                print_error("No users found")
+            users = client.get_users()
+
+        print_list(ctx, users, "Users", "No users found")
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -92,7 +92,7 @@ def create_user(ctx, userid, password, email, firstname, lastname, groups, enabl
 
 
 @user.command("delete")
-@click.argument("userid")
+@click.argument("userid", shell_complete=complete_users)
 @click.pass_context
 def delete_user(ctx, userid):
     """Delete a user."""
@@ -114,7 +114,7 @@ def delete_user(ctx, userid):
 
 
 @user.command("update")
-@click.argument("userid")
+@click.argument("userid", shell_complete=complete_users)
 @click.option("--email", "-e", help="User email address")
 @click.option("--firstname", help="First name")
 @click.option("--lastname", help="Last name")
@@ -163,7 +163,7 @@ def update_user(ctx, userid, email, firstname, lastname, groups, enable, expire,
 
 
 @user.command("show")
-@click.argument("userid")
+@click.argument("userid", shell_complete=complete_users)
 @click.pass_context
 def show_user(ctx, userid):
     """Show user details."""
@@ -186,7 +186,7 @@ def show_user(ctx, userid):
 
 
 @user.command("set-password")
-@click.argument("userid")
+@click.argument("userid", shell_complete=complete_users)
 @click.option("--password", "-p", required=True, help="New password")
 @click.pass_context
 def set_password(ctx, userid, password):
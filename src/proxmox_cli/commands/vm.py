@@ -2,7 +2,18 @@
 
 import click
 
-from proxmox_cli.commands.helpers import get_proxmox_client
+from proxmox_cli.commands.helpers import (
+    aggregate_options,
+    annotate_pools,
+    fetch_cluster_rows,
+    get_proxmox_client,
+    print_aggregate,
+    print_list,
+    run_watch,
+    watch_option,
+    where_option,
+)
+from proxmox_cli.completion import complete_nodes, complete_pools, complete_storages, complete_vmids
 from proxmox_cli.utils.output import print_error, print_json, print_success, print_table
 
 
@@ -12,54 +23,60 @@ def vm():
     pass
 
 
+def _vm_watch_row(v):
+    """Format a cluster resource VM record for --watch output."""
+    vm_info = v.list_row()
+    vm_info.pop("template", None)
+    vm_info["node"] = v.get("node")
+    return vm_info
+
+
 @vm.command("list")
-@click.option("--node", "-n", help="Filter by node name")
+@click.option("--node", "-n", help="Filter by node name", shell_complete=complete_nodes)
 @click.option("--templates-only", is_flag=True, help="Show only VM templates")
+@where_option
+@aggregate_options
+@watch_option
 @click.pass_context
-def list_vms(ctx, node, templates_only):
+def list_vms(ctx, node, templates_only, where, group_by, agg, watch):
     """List all virtual machines."""
     try:
         client = get_proxmox_client(ctx)
 
-        vms = client.get_vms(node=node)
+        if watch:
+
+            def keep(v):
+                if templates_only and not v.is_template:
+                    return False
+                return where is None or where(v)
+
+            run_watch(
+                ctx,
+                lambda: fetch_cluster_rows(
+                    client, "vm", _vm_watch_row, guest_type="qemu", node=node, where=keep
+                ),
+                key=lambda row: row["vmid"],
+                interval=watch,
+                title="Virtual Machines",
+            )
+            return
+
+        vms = client.iter_vms(node=node, where=where)
 
-        if vms:
-            # Filter templates if requested
+        if group_by or agg:
             if templates_only:
-                vms = [v for v in vms if v.get("template", 0) == 1]
-
-            # Filter to show only relevant columns
-            filtered_vms = []
-            for v in vms:
-                vm_info = {
-                    "vmid": v.get("vmid"),
-                    "name": v.get("name"),
-                    "status": v.get("status"),
-                    "cpu": f"{v.get('cpu', 0)*100:.2f}%",
-                    "memory": f"{v.get('mem', 0) / (1024**3):.2f}GB / {v.get('maxmem', 0) / (1024**3):.2f}GB",
-                    "uptime": f"{v.get('uptime', 0) // 86400}d {(v.get('uptime', 0) % 86400) // 3600}h",
-                }
-                # Add template indicator if it's a template
-                if v.get("template", 0) == 1:
-                    vm_info["template"] = "yes"
-                filtered_vms.append(vm_info)
-
-            # Check output format from context
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(filtered_vms)
-            else:
-                # Convert keys to uppercase for table display
-                table_data = []
-                for item in filtered_vms:
-                    table_data.append({k.upper(): v for k, v in item.items()})
-                print_table(table_data, title="Virtual Machines")
-        else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                message = "No templates found" if templates_only else "No virtual machines found"
-                print_error(message)
+                vms = (v for v in vms if v.is_template)
+            if group_by == "pool":
+                vms = annotate_pools(client, vms)
+            print_aggregate(ctx, vms, group_by, agg, "Virtual Machines")
+            return
+
+        # Filter templates if requested
+        if templates_only:
+            vms = (v for v in vms if v.is_template)
+
+        message = "No templates found" if templates_only else "No virtual machines found"
+        print_list(ctx, (v.list_row() for v in vms), "Virtual Machines", message)
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -69,48 +86,19 @@ def list_vms(ctx, node, templates_only):
 
 
 @vm.command("templates")
-@click.option("--node", "-n", help="Filter by node name")
+@click.option("--node", "-n", help="Filter by node name", shell_complete=complete_nodes)
+@where_option
 @click.pass_context
-def list_templates(ctx, node):
+def list_templates(ctx, node, where):
     """List all VM templates."""
     try:
         client = get_proxmox_client(ctx)
 
-        vms = client.get_vms(node=node)
+        vms = client.iter_vms(node=node, where=where)
 
         # Filter only templates
-        templates = [v for v in vms if v.get("template", 0) == 1]
-
-        if templates:
-            # Format template information
-            filtered_templates = []
-            for t in templates:
-                filtered_templates.append(
-                    {
-                        "vmid": t.get("vmid"),
-                        "name": t.get("name"),
-                        "node": t.get("node", "unknown"),
-                        "disk": f"{t.get('maxdisk', 0) / (1024**3):.2f}GB",
-                        "memory": f"{t.get('maxmem', 0) / (1024**3):.2f}GB",
-                        "cpu": f"{t.get('cpus', 0)} cores",
-                    }
-                )
-
-            # Check output format from context
-            output_format = ctx.obj.get("output_format", "json")
-            if output_format == "json":
-                print_json(filtered_templates)
-            else:
-                # Convert keys to uppercase for table display
-                table_data = []
-                for item in filtered_templates:
-                    table_data.append({k.upper(): v for k, v in item.items()})
-                print_table(table_data, title="VM Templates")
-        else:
-            if ctx.obj.get("output_format", "json") == "json":
-                print_json([])
-            else:
-                print_error("No templates found")
+        templates = (v for v in vms if v.is_template)
+        print_list(ctx, (t.template_row() for t in templates), "VM Templates", "No templates found")
 
     except Exception as e:
         if ctx.obj.get("output_format", "json") == "json":
@@ -120,8 +108,8 @@ def list_templates(ctx, node):
 
 
 @vm.command("start")
-@click.argument("vmid")
-@click.option("--node", "-n", required=True, help="Node name")
+@click.argument("vmid", shell_complete=complete_vmids)
+@click.option("--node", "-n", required=True, help="Node name", shell_complete=complete_nodes)
 @click.pass_context
 def start_vm(ctx, vmid, node):
     """Start a virtual machine."""
@@ -136,8 +124,8 @@ def start_vm(ctx, vmid, node):
 
 
 @vm.command("stop")
-@click.argument("vmid")
-@click.option("--node", "-n", required=True, help="Node name")
+@click.argument("vmid", shell_complete=complete_vmids)
+@click.option("--node", "-n", required=True, help="Node name", shell_complete=complete_nodes)
 @click.pass_context
 def stop_vm(ctx, vmid, node):
     """Stop a virtual machine."""
@@ -152,8 +140,8 @@ def stop_vm(ctx, vmid, node):
 
 
 @vm.command("status")
-@click.argument("vmid")
-@click.option("--node", "-n", required=True, help="Node name")
+@click.argument("vmid", shell_complete=complete_vmids)
+@click.option("--node", "-n", required=True, help="Node name", shell_complete=complete_nodes)
 @click.pass_context
 def vm_status(ctx, vmid, node):
     """Get virtual machine status."""
@@ -168,14 +156,25 @@ def vm_status(ctx, vmid, node):
 
 
 @vm.command("create")
-@click.option("--node", "-n", required=True, help="Node name where VM will be created")
+@click.option(
+    "--node",
+    "-n",
+    required=True,
+    help="Node name where VM will be created",
+    shell_complete=complete_nodes,
+)
 @click.option("--vmid", required=True, type=int, help="VM ID (must be unique)")
 @click.option("--name", required=True, help="VM name")
 @click.option("--memory", "-m", default=2048, type=int, help="Memory in MB (default: 2048)")
 @click.option("--cores", "-c", default=2, type=int, help="Number of CPU cores (default: 2)")
 @click.option("--sockets", "-s", default=1, type=int, help="Number of CPU sockets (default: 1)")
 @click.option("--disk-size", "-d", default="32G", help="Disk size (e.g., 32G, 64G)")
-@click.option("--storage", default="local-lvm", help="Storage for disk (default: local-lvm)")
+@click.option(
+    "--storage",
+    default="local-lvm",
+    help="Storage for disk (default: local-lvm)",
+    shell_complete=complete_storages,
+)
 @click.option("--iso", help="ISO image name (e.g., debian-12.0.0-amd64-netinst.iso)")
 @click.option("--ostype", default="l26", help="OS type (l26=Linux 2.6+, win10=Windows 10)")
 @click.option("--network-bridge", default="vmbr0", help="Network bridge (default: vmbr0)")
@@ -245,15 +244,33 @@ def create_vm(
 
 
 @vm.command("clone")
-@click.option("--node", "-n", required=True, help="Node name where VM/template exists")
-@click.option("--source-vmid", required=True, type=int, help="Source VM/template ID to clone from")
+@click.option(
+    "--node",
+    "-n",
+    required=True,
+    help="Node name where VM/template exists",
+    shell_complete=complete_nodes,
+)
+@click.option(
+    "--source-vmid",
+    required=True,
+    type=int,
+    help="Source VM/template ID to clone from",
+    shell_complete=complete_vmids,
+)
 @click.option("--new-vmid", required=True, type=int, help="New VM ID (must be unique)")
 @click.option("--name", required=True, help="Name for the cloned VM")
-@click.option("--target-node", help="Target node (defaults to same as source)")
-@click.option("--storage", help="Target storage (defaults to same as source)")
+@click.option(
+    "--target-node", help="Target node (defaults to same as source)", shell_complete=complete_nodes
+)
+@click.option(
+    "--storage",
+    help="Target storage (defaults to same as source)",
+    shell_complete=complete_storages,
+)
 @click.option("--full", is_flag=True, help="Create a full clone (default: linked clone)")
 @click.option("--description", help="Description for the cloned VM")
-@click.option("--pool", help="Add VM to resource pool")
+@click.option("--pool", help="Add VM to resource pool", shell_complete=complete_pools)
 @click.option("--start", is_flag=True, help="Start VM after cloning")
 @click.pass_context
 def clone_vm(
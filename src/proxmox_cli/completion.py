@@ -0,0 +1,107 @@
+"""Shell completion callbacks served from the local inventory.
+
+Completion never calls the API: candidates come from the inventory files
+written by earlier commands (see :mod:`proxmox_cli.inventory`). When an
+inventory is missing or stale, a detached refresh is started and the current
+(possibly empty) candidates are returned immediately.
+"""
+
+from typing import Callable, List, Optional
+
+from click.shell_completion import CompletionItem
+
+from proxmox_cli.inventory import Inventory, inventory_names
+
+# Candidates returned per TAB press; larger inventories are truncated
+MAX_COMPLETIONS = 200
+
+
+def _selected_clusters(ctx) -> List[Optional[str]]:
+    """Get the inventories to read from the --cluster option on the command line."""
+    value = ctx.find_root().params.get("cluster")
+    if not value:
+        return [None]
+    if value == "all":
+        return list(inventory_names())
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def _sort_key(value: str):
+    return (0, int(value), "") if value.isdigit() else (1, 0, value)
+
+
+def complete_inventory(ctx, kind: str, incomplete: str) -> List[CompletionItem]:
+    """Get completion candidates of one kind from the selected inventories.
+
+    Args:
+        ctx: Click context being completed
+        kind: Inventory kind (vmid, node, storage, ...)
+        incomplete: Text typed so far
+
+    Returns:
+        Matching completion items with their descriptions as help
+    """
+    config_path = ctx.find_root().params.get("config")
+    candidates = {}
+    for cluster in _selected_clusters(ctx):
+        inventory = Inventory(None if cluster == "default" else cluster)
+        data = inventory.load()
+        if inventory.is_stale(data):
+            inventory.refresh_in_background(config_path)
+        for value, description in inventory.items(kind, data).items():
+            if value.startswith(incomplete):
+                candidates.setdefault(value, description)
+
+    values = sorted(candidates, key=_sort_key)[:MAX_COMPLETIONS]
+    return [CompletionItem(value, help=candidates[value] or None) for value in values]
+
+
+def inventory_completer(kind: str, separator: Optional[str] = None) -> Callable:
+    """Build a Click ``shell_complete`` callback for one inventory kind.
+
+    Args:
+        kind: Inventory kind (vmid, node, storage, ...)
+        separator: Complete the last item of a list joined by this separator
+
+    Returns:
+        Callback taking (ctx, param, incomplete)
+    """
+
+    def complete(ctx, param, incomplete):
+        head = ""
+        if separator and separator in incomplete:
+            head, _, incomplete = incomplete.rpartition(separator)
+            head += separator
+        items = complete_inventory(ctx, kind, incomplete)
+        if head:
+            items = [CompletionItem(head + item.value, help=item.help) for item in items]
+        return items
+
+    return complete
+
+
+def complete_clusters(ctx, param, incomplete):
+    """Complete cluster profile names from the configuration file."""
+    from proxmox_cli.config import Config
+
+    head = ""
+    if "," in incomplete:
+        head, _, incomplete = incomplete.rpartition(",")
+        head += ","
+    names = Config(ctx.params.get("config")).cluster_names()
+    if not head:
+        names = ["all"] + names
+    return [CompletionItem(head + name) for name in names if name.startswith(incomplete)]
+
+
+complete_vmids = inventory_completer("vmid")
+complete_ctids = inventory_completer("ctid")
+complete_nodes = inventory_completer("node")
+complete_node_lists = inventory_completer("node", separator=",")
+complete_storages = inventory_completer("storage")
+complete_pools = inventory_completer("pool")
+complete_users = inventory_completer("user")
+complete_user_lists = inventory_completer("user", separator=",")
+complete_roles = inventory_completer("role")
+complete_role_lists = inventory_completer("role", separator=",")
+complete_templates = inventory_completer("template")
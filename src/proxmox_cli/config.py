@@ -1,10 +1,171 @@
-"""Configuration management for proxmox-cli."""
+"""Configuration management for proxmox-cli.
 
+Parsing YAML (and importing the yaml module) costs tens of milliseconds on
+every command. The parsed file is therefore compiled once into a flattened
+key -> value snapshot, stored as JSON in the cache directory and keyed by the
+YAML file's mtime and size. Warm starts read the snapshot and never import
+yaml.
+"""
+
+import copy
+import hashlib
+import json
 import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+# Prefix of environment variables overriding config keys, with '__' separating
+# key parts: PROXMOX_CLI_HTTP__TRANSPORT=httpx sets http.transport
+ENV_PREFIX = "PROXMOX_CLI_"
+
+# Sections and keys whose environment overrides are parsed as bools or numbers;
+# everything else (hosts, users, passwords, tokens) stays a string
+TYPED_SECTIONS = ("http", "rate_limit")
+TYPED_KEYS = ("verify_ssl", "max_workers", "color", "inventory")
+
+# Bumped whenever the compiled snapshot layout changes
+CACHE_VERSION = 2
+
+# Snapshots compiled by this process, keyed by (path, mtime, size, overlay digest)
+_compiled: Dict[Tuple[str, int, int, str], Dict[str, Any]] = {}
+
+# Locks serializing read-modify-write updates of one cache file, keyed by path
+_cache_locks: Dict[str, threading.Lock] = {}
+_cache_locks_guard = threading.Lock()
+
+
+def cache_dir() -> Path:
+    """Get the per-user cache directory."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "proxmox-cli"
+
+
+def cache_lock(path: Path) -> threading.Lock:
+    """Get the lock serializing updates of one cache file within this process.
+
+    Args:
+        path: Cache file path
+
+    Returns:
+        The same Lock for every caller passing the same path
+    """
+    with _cache_locks_guard:
+        return _cache_locks.setdefault(str(path), threading.Lock())
+
+
+def write_private(path: Path, text: str) -> None:
+    """Atomically replace a file with text readable only by the user.
+
+    Each writer uses its own temporary file, so concurrent writers in one or
+    several processes never interleave; the last os.replace() wins.
+
+    Args:
+        path: Destination file
+        text: New contents
+
+    Raises:
+        OSError: If the directory or file cannot be written
+    """
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    # mkstemp creates the file with mode 0600
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _coerced(key: str) -> bool:
+    """Whether an environment override of a key is parsed as a bool or number."""
+    last = key.rsplit(".", 1)[-1]
+    return key.split(".", 1)[0] in TYPED_SECTIONS or last in TYPED_KEYS
+
+
+def _env_overlay() -> Dict[str, Any]:
+    """Collect config overrides from PROXMOX_CLI_* environment variables.
+
+    Values stay strings, so credentials such as '1e3' or 'true' are kept as
+    given. Only keys known to hold bools or numbers (TYPED_SECTIONS,
+    TYPED_KEYS) are parsed, and only when the value is a JSON bool or number.
+
+    Returns:
+        Dictionary of dotted key -> value
+    """
+    overlay: Dict[str, Any] = {}
+    for name, raw in os.environ.items():
+        if not name.startswith(ENV_PREFIX) or "__" not in name:
+            continue
+        key = name[len(ENV_PREFIX) :].lower().replace("__", ".")
+        overlay[key] = raw
+        if _coerced(key):
+            try:
+                value = json.loads(raw)
+            except ValueError:
+                continue
+            if isinstance(value, (bool, int, float)):
+                overlay[key] = value
+    return overlay
+
+
+def _overlay_digest(overlay: Dict[str, Any]) -> str:
+    """Hash an overlay for the in-process memo key, so values are not kept in it."""
+    text = json.dumps(sorted(overlay.items()), default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _set_path(config: Dict[str, Any], key: str, value: Any) -> None:
+    """Set a dotted key in a nested dictionary, creating parents as needed."""
+    keys = key.split(".")
+    for k in keys[:-1]:
+        if not isinstance(config.get(k), dict):
+            config[k] = {}
+        config = config[k]
+    config[keys[-1]] = value
+
+
+def _flatten(config: Dict[str, Any], prefix: str = "", flat: Optional[Dict] = None) -> Dict:
+    """Map every dotted key path (including sections) to its value."""
+    flat = {} if flat is None else flat
+    for key, value in config.items():
+        path = f"{prefix}{key}"
+        flat[path] = value
+        if isinstance(value, dict):
+            _flatten(value, f"{path}.", flat)
+    return flat
 
-import yaml
+
+def compile_config(config: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve overlays and cluster profiles into a lookup snapshot.
+
+    Args:
+        config: Parsed configuration file
+        overlay: Dotted key -> value overrides (from the environment)
+
+    Returns:
+        Snapshot with the file's 'source', the merged 'config', the flattened
+        'flat' lookup table and the resolved 'profiles' (cluster settings
+        merged over 'proxmox')
+    """
+    merged = copy.deepcopy(config) if overlay else config
+    for key, value in overlay.items():
+        _set_path(merged, key, value)
+
+    base = merged.get("proxmox") or {}
+    clusters = merged.get("clusters")
+    profiles = {}
+    if isinstance(clusters, dict):
+        for name, settings in clusters.items():
+            profiles[name] = {**base, **(settings or {})}
+
+    return {"source": config, "config": merged, "flat": _flatten(merged), "profiles": profiles}
 
 
 class Config:
@@ -12,29 +173,111 @@ class Config:
 
     DEFAULT_CONFIG_PATH = Path.home() / ".config" / "proxmox-cli" / "config.yaml"
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, cache: bool = True):
         """Initialize configuration.
 
         Args:
             config_path: Path to configuration file. If None, uses default path.
+            cache: Read and write the compiled config cache
         """
         self.config_path = Path(config_path) if config_path else self.DEFAULT_CONFIG_PATH
+        self.cache = cache
+        self._source: Dict[str, Any] = {}
         self._config: Dict[str, Any] = {}
+        self._flat: Dict[str, Any] = {}
+        self._profiles: Dict[str, Dict[str, Any]] = {}
         self.load()
 
+    @property
+    def cache_path(self) -> Path:
+        """Path of the compiled snapshot for this config file."""
+        digest = hashlib.sha1(str(self.config_path.resolve()).encode()).hexdigest()[:16]
+        return cache_dir() / f"config-{digest}.json"
+
     def load(self) -> None:
-        """Load configuration from file."""
-        if self.config_path.exists():
-            with open(self.config_path, "r") as f:
-                self._config = yaml.safe_load(f) or {}
-        else:
-            self._config = self._default_config()
+        """Load configuration from the compiled cache, or from file."""
+        overlay = _env_overlay()
+        try:
+            stat = self.config_path.stat()
+        except OSError:
+            self._apply(compile_config(self._default_config(), overlay))
+            return
+
+        stamp = (str(self.config_path), stat.st_mtime_ns, stat.st_size)
+        memo_key = stamp + (_overlay_digest(overlay),)
+        compiled = _compiled.get(memo_key)
+        if compiled is None:
+            compiled = self._load_compiled(stamp, overlay)
+            _compiled[memo_key] = compiled
+        self._apply(compiled)
+
+    def _load_compiled(self, stamp: Tuple[str, int, int], overlay: Dict[str, Any]) -> Dict:
+        """Read the file snapshot for an mtime/size stamp and apply the overlay.
+
+        Only the snapshot of the file itself is cached on disk; environment
+        overrides (which may hold credentials) are applied in memory.
+        """
+        cached = self._read_cache() if self.cache else None
+        if cached is not None and [cached.get("mtime_ns"), cached.get("size")] == list(stamp[1:]):
+            # Same file: no need to parse YAML again
+            return compile_config(cached["source"], overlay) if overlay else cached
+
+        source = self._parse()
+        if self.cache:
+            self._write_cache(
+                {
+                    "version": CACHE_VERSION,
+                    "mtime_ns": stamp[1],
+                    "size": stamp[2],
+                    **compile_config(source, {}),
+                }
+            )
+        return compile_config(source, overlay)
+
+    def _parse(self) -> Dict[str, Any]:
+        """Parse the YAML configuration file."""
+        import yaml
+
+        with open(self.config_path, "r") as f:
+            return yaml.safe_load(f) or {}
+
+    def _read_cache(self) -> Optional[Dict[str, Any]]:
+        """Read the compiled snapshot, or None if missing or stale."""
+        try:
+            with open(self.cache_path, "r") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get("version") != CACHE_VERSION:
+            return None
+        return cached
+
+    def _write_cache(self, snapshot: Dict[str, Any]) -> None:
+        """Atomically write a compiled snapshot; skipped if it cannot round-trip."""
+        try:
+            text = json.dumps(snapshot)
+            # YAML allows dates and non-string keys, which JSON would change
+            if json.loads(text) != snapshot:
+                return
+            # The snapshot holds credentials, so keep it private like the YAML file
+            write_private(self.cache_path, text)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def _apply(self, compiled: Dict[str, Any]) -> None:
+        self._source = compiled["source"]
+        self._config = compiled["config"]
+        self._flat = compiled["flat"]
+        self._profiles = compiled["profiles"]
 
     def save(self) -> None:
         """Save configuration to file."""
+        import yaml
+
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
         with open(self.config_path, "w") as f:
-            yaml.dump(self._config, f, default_flow_style=False)
+            # Environment overrides are not written back
+            yaml.dump(self._source, f, default_flow_style=False)
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value.
@@ -46,13 +289,7 @@ class Config:
         Returns:
             Configuration value or default
         """
-        keys = key.split(".")
-        value = self._config
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-            else:
-                return default
+        value = self._flat.get(key)
         return value if value is not None else default
 
     def set(self, key: str, value: Any) -> None:
@@ -62,13 +299,37 @@ class Config:
             key: Configuration key (supports dot notation)
             value: Value to set
         """
-        keys = key.split(".")
-        config = self._config
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
-        config[keys[-1]] = value
+        # Snapshots may be shared with other instances, so copy before changing
+        source = copy.deepcopy(self._source)
+        _set_path(source, key, value)
+        self._apply(compile_config(source, _env_overlay()))
+
+    def cluster_names(self) -> List[str]:
+        """Get the names of the configured cluster profiles.
+
+        Returns:
+            Sorted list of profile names
+        """
+        return sorted(self._profiles)
+
+    def cluster(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """Get connection settings for a cluster profile.
+
+        Profile values override the top-level 'proxmox' section, so shared
+        settings (user, verify_ssl) only need to be given once.
+
+        Args:
+            name: Profile name under 'clusters', or None for the 'proxmox' section
+
+        Returns:
+            Connection settings dictionary
+
+        Raises:
+            KeyError: If the profile does not exist
+        """
+        if name is None:
+            return dict(self._config.get("proxmox") or {})
+        return dict(self._profiles[name])
 
     @staticmethod
     def _default_config() -> Dict[str, Any]:
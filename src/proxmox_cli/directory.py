@@ -0,0 +1,111 @@
+"""Expanded user and group listings joined in memory.
+
+``access/users?full=1`` returns every user with its group memberships and API
+tokens in one request. Together with the group listing, that is enough to
+build both sides of the membership matrix locally. Servers that ignore
+``full`` fall back to concurrent per-user ``access/users/<userid>`` reads.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from proxmox_cli.utils.concurrency import DEFAULT_MAX_WORKERS, fan_out
+from proxmox_cli.utils.helpers import split_list
+
+
+def _token_ids(tokens: Any) -> List[str]:
+    """Token ids from a full listing (list of dicts) or a user read (tokenid -> info)."""
+    if isinstance(tokens, dict):
+        return sorted(tokens)
+    return sorted(t["tokenid"] for t in tokens or [] if t.get("tokenid"))
+
+
+def _key(record: Dict[str, Any], field: str) -> Tuple[Optional[str], str]:
+    # Merged multi-cluster listings may repeat ids, one per cluster
+    return record.get("cluster"), record[field]
+
+
+class Directory:
+    """Users, groups and tokens of one snapshot, with memberships joined."""
+
+    def __init__(self, users: Iterable[Dict[str, Any]], groups: Iterable[Dict[str, Any]]):
+        """Join memberships from both listings.
+
+        Args:
+            users: Users with 'groups' and 'tokens' (from a full listing or user reads)
+            groups: Groups from access/groups; their 'users' field is merged in
+        """
+        self.users = {_key(u, "userid"): dict(u) for u in users}
+        self.groups = {_key(g, "groupid"): dict(g) for g in groups}
+        self.members: Dict[Tuple[Optional[str], str], set] = {k: set() for k in self.groups}
+        self.memberships: Dict[Tuple[Optional[str], str], set] = {k: set() for k in self.users}
+
+        for (cluster, userid), user in self.users.items():
+            for groupid in split_list(user.get("groups")):
+                self.members.setdefault((cluster, groupid), set()).add(userid)
+                self.memberships[(cluster, userid)].add(groupid)
+        for (cluster, groupid), group in self.groups.items():
+            for userid in split_list(group.get("users")):
+                self.members[(cluster, groupid)].add(userid)
+                self.memberships.setdefault((cluster, userid), set()).add(groupid)
+
+    def user_rows(self) -> Iterable[Dict[str, Any]]:
+        """Yield users with their groups and token ids as comma-separated lists."""
+        for key in sorted(self.users, key=lambda k: (k[0] or "", k[1])):
+            row = self.users[key]
+            row["groups"] = ",".join(sorted(self.memberships.get(key, ())))
+            row["tokens"] = ",".join(_token_ids(row.get("tokens")))
+            yield row
+
+    def group_rows(self) -> Iterable[Dict[str, Any]]:
+        """Yield groups with their member count and members."""
+        for key in sorted(self.groups, key=lambda k: (k[0] or "", k[1])):
+            row = self.groups[key]
+            members = sorted(self.members.get(key, ()))
+            row["count"] = len(members)
+            row["users"] = ",".join(members)
+            yield row
+
+
+def _read_users(client: Any, users: List[Dict[str, Any]], max_workers: int) -> List[Dict]:
+    """Fill in groups and tokens with one concurrent read per user."""
+
+    def read(user):
+        return client.api.access.users(user["userid"]).get()
+
+    expanded = []
+    for user, info, error in fan_out(read, users, max_workers):
+        if error is not None:
+            client.stats.incr("skipped_users")
+            expanded.append(user)
+            continue
+        expanded.append(
+            {**user, "groups": split_list(info.get("groups")), "tokens": info.get("tokens") or {}}
+        )
+    return expanded
+
+
+def fetch_directory(client: Any, max_workers: int = DEFAULT_MAX_WORKERS) -> Directory:
+    """Fetch the full user listing and the group listing concurrently.
+
+    Args:
+        client: ProxmoxClient instance
+        max_workers: Maximum concurrent reads
+
+    Returns:
+        Directory instance
+    """
+    reads = {
+        "users": lambda: client.get_users(full=True),
+        "groups": lambda: client.api.access.groups.get(),
+    }
+    data = {}
+    for name, result, error in fan_out(lambda name: reads[name](), list(reads), max_workers):
+        if error is not None:
+            raise error
+        data[name] = result
+
+    users = data["users"]
+    # Servers without 'full' support return bare records
+    if users and not any("groups" in u or "tokens" in u for u in users):
+        users = _read_users(client, users, max_workers)
+    return Directory(users, data["groups"])
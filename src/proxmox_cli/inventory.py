@@ -0,0 +1,239 @@
+"""Local inventory of object ids for shell completion.
+
+Commands that fetch complete listings (cluster resources, nodes, storages,
+pools, users, roles, container templates) record the ids they saw in a small
+JSON file per cluster profile. Shell completion only reads these files, so a
+TAB press never waits for the API; stale files are refreshed by a detached
+background process (``python -m proxmox_cli.inventory``).
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from proxmox_cli.config import cache_dir, cache_lock, write_private
+
+# Kinds of ids kept in the inventory
+KINDS = ("vmid", "ctid", "node", "storage", "pool", "user", "role", "template")
+
+# Seconds before an inventory is refreshed in the background
+INVENTORY_TTL = 300
+
+# Inventory name used when no --cluster profile is selected
+DEFAULT_NAME = "default"
+
+
+def inventory_path(cluster: Optional[str] = None) -> Path:
+    """Get the inventory file of a cluster profile.
+
+    Args:
+        cluster: Profile name, or None for the default connection
+
+    Returns:
+        Path of the JSON inventory file
+    """
+    return cache_dir() / f"inventory-{cluster or DEFAULT_NAME}.json"
+
+
+def inventory_names() -> List[str]:
+    """Get the profile names that have an inventory file.
+
+    Returns:
+        Sorted list of names (the default connection is 'default')
+    """
+    return sorted(p.stem[len("inventory-") :] for p in cache_dir().glob("inventory-*.json"))
+
+
+class Inventory:
+    """Ids of one cluster, recorded from complete API listings."""
+
+    def __init__(self, cluster: Optional[str] = None):
+        """Initialize inventory.
+
+        Args:
+            cluster: Profile name, or None for the default connection
+        """
+        self.cluster = cluster
+        self.path = inventory_path(cluster)
+
+    def load(self) -> Dict[str, Any]:
+        """Read the inventory file.
+
+        Returns:
+            Mapping of kind -> {'updated': timestamp, 'items': {id: description}},
+            empty if the file is missing or unreadable
+        """
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def items(self, kind: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """Get the recorded ids of one kind.
+
+        Args:
+            kind: One of KINDS
+            data: Previously loaded inventory (read from disk if None)
+
+        Returns:
+            Mapping of id -> short description
+        """
+        data = self.load() if data is None else data
+        entry = data.get(kind)
+        return entry.get("items", {}) if isinstance(entry, dict) else {}
+
+    def is_stale(self, data: Dict[str, Any], ttl: float = INVENTORY_TTL) -> bool:
+        """Whether any kind is missing or older than the TTL.
+
+        Args:
+            data: Loaded inventory
+            ttl: Maximum age in seconds
+
+        Returns:
+            True if the inventory should be refreshed
+        """
+        now = time.time()
+        return any(now - (data.get(kind) or {}).get("updated", 0) > ttl for kind in KINDS)
+
+    def update(self, listings: Dict[str, Dict[Any, Any]]) -> None:
+        """Replace the ids of each given kind with a complete listing.
+
+        Write errors are ignored; the inventory is only a completion aid.
+
+        Args:
+            listings: Mapping of kind -> {id: description}
+        """
+        if not listings:
+            return
+        # Concurrent listings (fan_out workers) must not drop each other's kinds
+        with cache_lock(self.path):
+            data = self.load()
+            now = time.time()
+            for kind, entries in listings.items():
+                data[kind] = {
+                    "updated": now,
+                    "items": {str(k): "" if v is None else str(v) for k, v in entries.items()},
+                }
+            try:
+                write_private(self.path, json.dumps(data))
+            except OSError:
+                pass
+
+    def record_resources(self, resources: Iterable[Any], resource_type: Optional[str]) -> None:
+        """Record the ids in a /cluster/resources listing.
+
+        Args:
+            resources: Resource records
+            resource_type: Type filter the listing was fetched with, or None
+        """
+        listings: Dict[str, Dict[Any, Any]] = {}
+        wanted = {
+            "vmid": resource_type in (None, "vm"),
+            "ctid": resource_type in (None, "vm"),
+            "node": resource_type in (None, "node"),
+            "storage": resource_type in (None, "storage"),
+            "pool": resource_type in (None, "pool"),
+        }
+        for kind, included in wanted.items():
+            if included:
+                listings[kind] = {}
+        for r in resources:
+            kind = {"qemu": "vmid", "lxc": "ctid"}.get(r.get("type"), r.get("type"))
+            if kind not in listings:
+                continue
+            if kind in ("vmid", "ctid"):
+                listings[kind][r.get("vmid")] = r.get("name")
+            elif kind == "node":
+                listings[kind][r.get("node")] = r.get("status")
+            elif kind == "storage":
+                listings[kind][r.get("storage")] = r.get("plugintype")
+            else:
+                listings[kind][r.get("pool")] = r.get("comment")
+        self.update(listings)
+
+    def refresh_in_background(
+        self, config_path: Optional[str] = None, ttl: float = INVENTORY_TTL
+    ) -> bool:
+        """Start a detached process refreshing this inventory.
+
+        At most one refresh is started per TTL, however often completion runs.
+
+        Args:
+            config_path: Configuration file to connect with
+            ttl: Seconds between refresh attempts
+
+        Returns:
+            True if a refresh process was started
+        """
+        marker = self.path.with_suffix(".refresh")
+        try:
+            if time.time() - marker.stat().st_mtime < ttl:
+                return False
+        except OSError:
+            pass
+        try:
+            marker.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            marker.touch()
+            command = [sys.executable, "-m", "proxmox_cli.inventory"]
+            if config_path:
+                command += ["--config", config_path]
+            if self.cluster:
+                command += ["--cluster", self.cluster]
+            subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except OSError:
+            return False
+        return True
+
+
+def refresh(config_path: Optional[str] = None, cluster: Optional[str] = None) -> None:
+    """Fetch every listing the inventory keeps, recording it as a side effect.
+
+    Args:
+        config_path: Configuration file to connect with
+        cluster: Profile name, or None for the default connection
+    """
+    # Only the refresh process pays for the HTTP client imports
+    from proxmox_cli.commands.helpers import build_client
+    from proxmox_cli.config import Config
+
+    config = Config(config_path)
+    client = build_client({}, config, config.cluster(cluster), inventory=Inventory(cluster))
+    fetches = (
+        client.get_cluster_resources,
+        client.get_users,
+        client.get_roles,
+        client.get_pools,
+        client.get_container_templates,
+    )
+    with client.request_scope():
+        for fetch in fetches:
+            try:
+                fetch()
+            except Exception:
+                # Missing privileges for one listing must not stop the others
+                continue
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Refresh an inventory from the command line."""
+    parser = argparse.ArgumentParser(description="Refresh the shell completion inventory")
+    parser.add_argument("--config", help="Path to configuration file")
+    parser.add_argument("--cluster", help="Cluster profile name")
+    args = parser.parse_args(argv)
+    refresh(args.config, args.cluster)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""Compact record models for Proxmox API data.
+
+API responses are plain JSON objects. Keeping tens of thousands of them as
+dicts costs a hash table per row; these models store the well-known fields
+in ``__slots__`` and only fall back to a dict for fields they do not know.
+
+Models behave like mutable mappings, so code written against the raw
+dictionaries (``record.get("maxmem")``, ``record["node"]``) keeps working.
+API keys containing dashes (``running-qemu``) are stored in slots with
+underscores.
+"""
+
+import time
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional, Tuple, Type, TypeVar
+
+R = TypeVar("R", bound="Record")
+
+
+def _slot_names(fields: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Get valid attribute names for API field names."""
+    return tuple(field.replace("-", "_") for field in fields)
+
+
+class Record(MutableMapping):
+    """Base class for slotted API records."""
+
+    FIELDS: Tuple[str, ...] = ()
+    # API field name -> slot attribute name
+    _field_slots: Dict[str, str] = {}
+    __slots__ = ("_extra",)
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, **fields: Any):
+        """Initialize record.
+
+        Args:
+            data: API response object
+            **fields: Additional field values
+        """
+        self._extra: Optional[Dict[str, Any]] = None
+        if data:
+            for key, value in data.items():
+                self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_api(cls: Type[R], data: Dict[str, Any]) -> R:
+        """Build a record from an API response object.
+
+        Args:
+            data: API response object
+
+        Returns:
+            Instance of the class it is called on
+        """
+        return cls(data)
+
+    def __getitem__(self, key: str) -> Any:
+        slot = self._field_slots.get(key)
+        if slot is not None:
+            try:
+                return getattr(self, slot)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        slot = self._field_slots.get(key)
+        if slot is not None:
+            setattr(self, slot, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        slot = self._field_slots.get(key)
+        if slot is not None:
+            try:
+                delattr(self, slot)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for field, slot in self._field_slots.items():
+            if hasattr(self, slot):
+                yield field
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary (e.g. for JSON output).
+
+        Returns:
+            Dictionary of all set fields
+        """
+        return {key: self[key] for key in self}
+
+    def _row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Prefix a display row with the record's cluster, if it has one."""
+        cluster = self.get("cluster")
+        return {"cluster": cluster, **row} if cluster is not None else row
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._field_slots = dict(zip(cls.FIELDS, _slot_names(cls.FIELDS)))
+
+
+def _gb(value: Any) -> str:
+    return f"{(value or 0) / (1024**3):.2f}GB"
+
+
+def _uptime(seconds: Any) -> str:
+    seconds = seconds or 0
+    return f"{seconds // 86400}d {(seconds % 86400) // 3600}h"
+
+
+class Guest(Record):
+    """A QEMU virtual machine or LXC container."""
+
+    FIELDS = (
+        "vmid",
+        "name",
+        "node",
+        "type",
+        "id",
+        "status",
+        "template",
+        "cpu",
+        "cpus",
+        "maxcpu",
+        "mem",
+        "maxmem",
+        "disk",
+        "maxdisk",
+        "diskread",
+        "diskwrite",
+        "netin",
+        "netout",
+        "swap",
+        "maxswap",
+        "uptime",
+        "pid",
+        "pool",
+        "tags",
+        "lock",
+        "hastate",
+        # Per-node listings (nodes/{node}/qemu, nodes/{node}/lxc)
+        "qmpstatus",
+        "running-qemu",
+        "running-machine",
+        "serial",
+        "balloon",
+        "balloon_min",
+        "freemem",
+        "shares",
+        "ha",
+        # Set on records merged from several clusters
+        "cluster",
+    )
+    __slots__ = _slot_names(FIELDS)
+
+    @property
+    def is_template(self) -> bool:
+        """Whether the guest is a template."""
+        return self.get("template", 0) == 1
+
+    def list_row(self) -> Dict[str, Any]:
+        """Format for `vm list` / `container list` output."""
+        row = {
+            "vmid": self.get("vmid"),
+            "name": self.get("name"),
+            "status": self.get("status"),
+            "cpu": f"{(self.get('cpu') or 0)*100:.2f}%",
+            "memory": f"{_gb(self.get('mem'))} / {_gb(self.get('maxmem'))}",
+            "uptime": _uptime(self.get("uptime")),
+        }
+        # Add template indicator if it's a template
+        if self.is_template:
+            row["template"] = "yes"
+        return self._row(row)
+
+    def template_row(self) -> Dict[str, Any]:
+        """Format for VM template listings."""
+        return self._row(
+            {
+                "vmid": self.get("vmid"),
+                "name": self.get("name"),
+                "node": self.get("node", "unknown"),
+                "disk": _gb(self.get("maxdisk")),
+                "memory": _gb(self.get("maxmem")),
+                "cpu": f"{self.get('cpus', 0)} cores",
+            }
+        )
+
+
+class Node(Record):
+    """A cluster node."""
+
+    FIELDS = (
+        "node",
+        "status",
+        "id",
+        "type",
+        "cpu",
+        "maxcpu",
+        "mem",
+        "maxmem",
+        "disk",
+        "maxdisk",
+        "uptime",
+        "level",
+        "ssl_fingerprint",
+        "cgroup-mode",
+        "cluster",
+    )
+    __slots__ = _slot_names(FIELDS)
+
+    def list_row(self) -> Dict[str, Any]:
+        """Format for `node list --watch` output."""
+        return self._row(
+            {
+                "node": self.get("node"),
+                "status": self.get("status"),
+                "cpu": f"{(self.get('cpu') or 0)*100:.2f}%",
+                "memory": f"{_gb(self.get('mem'))} / {_gb(self.get('maxmem'))}",
+                "disk": f"{_gb(self.get('disk'))} / {_gb(self.get('maxdisk'))}",
+                "uptime": _uptime(self.get("uptime")),
+            }
+        )
+
+
+class Storage(Record):
+    """A storage definition, or a per-node storage status entry."""
+
+    FIELDS = (
+        "storage",
+        "type",
+        "plugintype",
+        "node",
+        "id",
+        "status",
+        "content",
+        "path",
+        "shared",
+        "nodes",
+        "disk",
+        "maxdisk",
+        "disable",
+        "digest",
+        "prune-backups",
+        "server",
+        "export",
+        "pool",
+        "vgname",
+        "thinpool",
+        "datastore",
+        "fingerprint",
+        "username",
+        "mkdir",
+        "sparse",
+        "krbd",
+        "monhost",
+        "cluster",
+    )
+    __slots__ = _slot_names(FIELDS)
+
+    def usage_row(self) -> Dict[str, Any]:
+        """Format per-node usage for `storage list --watch` output."""
+        return self._row(
+            {
+                "storage": self.get("storage"),
+                "node": self.get("node"),
+                "type": self.get("plugintype"),
+                "status": self.get("status"),
+                "usage": f"{_gb(self.get('disk'))} / {_gb(self.get('maxdisk'))}",
+            }
+        )
+
+
+class Template(Record):
+    """An LXC container template stored on a storage."""
+
+    FIELDS = ("volid", "storage", "node", "size", "format", "cluster")
+    __slots__ = _slot_names(FIELDS)
+
+    @property
+    def template_name(self) -> str:
+        """Template file name extracted from the volume ID."""
+        # e.g. 'local:vztmpl/ubuntu-22.04.tar.zst'
+        volid = self.get("volid") or ""
+        return volid.split("/")[-1] if "/" in volid else volid
+
+    def list_row(self) -> Dict[str, Any]:
+        """Format for `container templates` output."""
+        return self._row(
+            {
+                "template": self.template_name,
+                "storage": self.get("storage"),
+                "node": self.get("node"),
+                "size": f"{(self.get('size') or 0) / (1024**2):.2f}MB",
+                "volid": self.get("volid", ""),
+            }
+        )
+
+
+class Backup(Record):
+    """A backup archive stored on a storage."""
+
+    FIELDS = (
+        "volid",
+        "vmid",
+        "ctime",
+        "size",
+        "format",
+        "subtype",
+        "content",
+        "notes",
+        "protected",
+        "verification",
+        "encrypted",
+        "storage",
+        "node",
+        "cluster",
+    )
+    __slots__ = _slot_names(FIELDS)
+
+    @property
+    def is_protected(self) -> bool:
+        """Whether the archive is protected from pruning and removal."""
+        return bool(int(self.get("protected") or 0))
+
+    def list_row(self) -> Dict[str, Any]:
+        """Format for `backup list` output."""
+        ctime = self.get("ctime")
+        return self._row(
+            {
+                "vmid": self.get("vmid"),
+                "type": self.get("subtype"),
+                "date": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ctime)) if ctime else "",
+                "size": _gb(self.get("size")),
+                "storage": self.get("storage"),
+                "node": self.get("node"),
+                "protected": "yes" if self.is_protected else "",
+                "volid": self.get("volid"),
+                "notes": self.get("notes") or "",
+            }
+        )
+
+
+# Model used for each /cluster/resources entry type
+RESOURCE_MODELS = {"qemu": Guest, "lxc": Guest, "node": Node, "storage": Storage}
+
+
+def resource_from_api(data: Dict[str, Any]) -> Any:
+    """Build the matching model for a /cluster/resources entry.
+
+    Args:
+        data: Cluster resource object
+
+    Returns:
+        Model instance, or the original dict for unmodelled types
+    """
+    model = RESOURCE_MODELS.get(data.get("type"))
+    return model.from_api(data) if model else data
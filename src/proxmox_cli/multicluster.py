@@ -0,0 +1,186 @@
+"""Read-only client spanning several clusters.
+
+Wraps one :class:`proxmox_cli.client.ProxmoxClient` per cluster profile and
+exposes the same listing methods. Every cluster is queried concurrently, and
+records are streamed as they arrive, each tagged with a 'cluster' key.
+"""
+
+from collections.abc import MutableMapping
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from proxmox_cli.client import ProxmoxClient
+from proxmox_cli.session import RequestStats
+from proxmox_cli.utils.concurrency import fan_in, fan_out
+
+# Client methods merged across clusters (each returns an iterable of records)
+MERGED_METHODS = (
+    "get_nodes",
+    "get_storage",
+    "get_cluster_resources",
+    "get_vms",
+    "iter_vms",
+    "get_containers",
+    "iter_containers",
+    "get_container_templates",
+    "iter_templates",
+    "iter_storage_content",
+    "get_pools",
+    "iter_pools",
+    "get_users",
+    "get_roles",
+    "get_tokens",
+    "iter_tokens",
+)
+
+
+class MultiClusterError(Exception):
+    """Raised for operations that need a single cluster."""
+
+
+def _tag(record: Any, cluster: str) -> Any:
+    if isinstance(record, MutableMapping):
+        record["cluster"] = cluster
+    return record
+
+
+class MergedResource:
+    """Read-only path builder fanning GET requests out to every cluster."""
+
+    def __init__(self, client: "MultiClusterClient", path: tuple = ()):
+        """Initialize resource.
+
+        Args:
+            client: Owning multi-cluster client
+            path: Attribute/call chain to replay on each cluster's API
+        """
+        self._client = client
+        self._path = path
+
+    def __getattr__(self, item: str) -> "MergedResource":
+        if item.startswith("_"):
+            raise AttributeError(item)
+        if item in ("post", "put", "delete", "create", "set"):
+            raise MultiClusterError(
+                "Changes cannot be sent to several clusters at once; select one with --cluster"
+            )
+        return MergedResource(self._client, self._path + ((item, None),))
+
+    def __call__(self, *resource_id: Any) -> "MergedResource":
+        return MergedResource(self._client, self._path + ((None, resource_id),))
+
+    def _resolve(self, api: Any) -> Any:
+        for attribute, resource_id in self._path:
+            api = getattr(api, attribute) if attribute is not None else api(*resource_id)
+        return api
+
+    def get(self, *args: Any, **params: Any) -> list:
+        """Send the GET to every cluster and merge the list results.
+
+        Returns:
+            Combined list of records tagged with 'cluster'
+
+        Raises:
+            MultiClusterError: If the endpoint returns a single object
+        """
+
+        def fetch(client):
+            result = self._resolve(client.api).get(*args, **params)
+            if not isinstance(result, list):
+                raise MultiClusterError(
+                    "This command returns a single object; select one cluster with --cluster"
+                )
+            return result
+
+        return list(self._client.merged(fetch))
+
+
+class MultiClusterClient:
+    """Query several clusters concurrently through one client-like object."""
+
+    def __init__(self, factories: Dict[str, Callable[[], ProxmoxClient]]):
+        """Connect to every cluster concurrently.
+
+        Clusters that cannot be reached are remembered and skipped by
+        queries; if no cluster can be reached, the first error is raised.
+
+        Args:
+            factories: Callables creating a ProxmoxClient, keyed by cluster name
+
+        Raises:
+            Exception: The connection error if every cluster failed
+        """
+        self.clients: Dict[str, ProxmoxClient] = {}
+        self.errors: Dict[str, BaseException] = {}
+        for name, client, error in fan_out(lambda n: factories[n](), list(factories), 16):
+            if error is not None:
+                self.errors[name] = error
+            else:
+                self.clients[name] = client
+        if not self.clients and self.errors:
+            raise next(iter(self.errors.values()))
+
+        self._stats = RequestStats()
+        self.api = MergedResource(self)
+
+        for method in MERGED_METHODS:
+            setattr(self, method, self._merged_method(method))
+
+    @property
+    def stats(self) -> RequestStats:
+        """Request statistics summed over all clusters."""
+        stats = RequestStats()
+        for source in [self._stats] + [c.stats for c in self.clients.values()]:
+            for name, value in source.to_dict().items():
+                stats.incr(name, value)
+        return stats
+
+    @contextmanager
+    def request_scope(self) -> Iterator[None]:
+        """Open a request scope on every cluster's client."""
+        with ExitStack() as stack:
+            for client in self.clients.values():
+                stack.enter_context(client.request_scope())
+            yield
+
+    def merged(self, fetch: Callable[[ProxmoxClient], Any]) -> Iterator[Any]:
+        """Run a query on every cluster concurrently and stream the combined records.
+
+        Clusters that fail are skipped (counted as 'skipped_clusters'); if
+        every cluster fails, the first error is raised.
+
+        Args:
+            fetch: Callable taking a ProxmoxClient and returning an iterable
+
+        Yields:
+            Records tagged with their cluster name
+        """
+        sources = {name: (lambda c=client: fetch(c)) for name, client in self.clients.items()}
+        first_error: Optional[BaseException] = None
+        failed = 0
+        for name, record, error in fan_in(sources):
+            if error is not None:
+                if isinstance(error, MultiClusterError):
+                    raise error
+                first_error = first_error or error
+                failed += 1
+                self._stats.incr("skipped_clusters")
+                continue
+            yield _tag(record, name)
+        if failed and failed == len(sources):
+            raise first_error
+
+    def _merged_method(self, method: str) -> Callable[..., Any]:
+        def call(*args: Any, **kwargs: Any) -> Any:
+            records = self.merged(lambda client: getattr(client, method)(*args, **kwargs))
+            return records if method.startswith("iter_") else list(records)
+
+        call.__name__ = method
+        call.__doc__ = f"Merged {method} across all clusters."
+        return call
+
+    def __getattr__(self, name: str) -> Any:
+        raise MultiClusterError(
+            f"'{name}' is not available for several clusters at once; "
+            "select one cluster with --cluster"
+        )
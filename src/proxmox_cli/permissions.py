@@ -0,0 +1,210 @@
+"""Effective permission resolution from ACLs, groups and roles.
+
+ACL entries, group memberships and role privileges are fetched once and
+loaded into a path trie. Effective permissions of a user or API token on a
+path are then resolved locally, following the Proxmox VE rules:
+
+* Walking from ``/`` to the path, ACLs on a more specific path replace
+  those inherited from its parents. Entries without ``propagate`` only apply
+  to their own path.
+* At each path, roles granted to the user directly replace roles granted
+  through the user's groups.
+* The ``NoAccess`` role removes every privilege.
+* A guest in a pool also gets the permissions granted on ``/pool/<pool>``.
+* A privilege-separated token is limited to the intersection of its own
+  ACLs and its user's permissions; ``root@pam`` has every privilege.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from proxmox_cli.utils.concurrency import DEFAULT_MAX_WORKERS, fan_out
+from proxmox_cli.utils.helpers import split_list
+
+# Role that revokes all privileges on a path
+NO_ACCESS = "NoAccess"
+
+# User with every privilege
+SUPERUSER = "root@pam"
+
+
+def _split(path: str) -> List[str]:
+    return [part for part in path.split("/") if part]
+
+
+class _Node:
+    """One path segment of the ACL trie."""
+
+    __slots__ = ("children", "acl")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # principal type ('user', 'group', 'token') -> ugid -> role -> propagate
+        self.acl: Dict[str, Dict[str, Dict[str, bool]]] = {}
+
+
+class PermissionResolver:
+    """Answer effective-permission queries from one snapshot of the ACLs."""
+
+    def __init__(
+        self,
+        acl: Iterable[Dict[str, Any]],
+        users: Iterable[Dict[str, Any]],
+        roles: Iterable[Dict[str, Any]],
+        groups: Iterable[Dict[str, Any]] = (),
+        guest_pools: Optional[Dict[str, str]] = None,
+    ):
+        """Build the trie.
+
+        Args:
+            acl: Entries from access/acl
+            users: Users from access/users?full=1 (with 'groups' and 'tokens')
+            roles: Roles from access/roles
+            groups: Groups from access/groups; used for members when the user
+                listing has no 'groups'
+            guest_pools: Optional vmid -> pool mapping
+        """
+        self.root = _Node()
+        self.paths: Set[str] = set()
+        for entry in acl:
+            node = self.root
+            for part in _split(entry["path"]):
+                node = node.children.setdefault(part, _Node())
+            principals = node.acl.setdefault(entry["type"], {})
+            principals.setdefault(entry["ugid"], {})[entry["roleid"]] = bool(
+                int(entry.get("propagate", 1))
+            )
+            self.paths.add(entry["path"])
+
+        self.privileges = {r["roleid"]: frozenset(split_list(r.get("privs"))) for r in roles}
+        self.all_privileges = frozenset().union(*self.privileges.values())
+
+        self.user_groups: Dict[str, List[str]] = {}
+        self.tokens: Dict[str, Dict[str, Any]] = {}
+        for user in users:
+            userid = user["userid"]
+            self.user_groups[userid] = split_list(user.get("groups"))
+            for token in user.get("tokens") or []:
+                self.tokens[f"{userid}!{token['tokenid']}"] = token
+        for group in groups:
+            for userid in split_list(group.get("users")):
+                memberships = self.user_groups.setdefault(userid, [])
+                if group["groupid"] not in memberships:
+                    memberships.append(group["groupid"])
+
+        self.guest_pools = guest_pools or {}
+        self._cache: Dict[Tuple[str, str], Tuple[frozenset, frozenset]] = {}
+
+    def _nodes(self, path: str) -> Iterator[Tuple[_Node, bool]]:
+        """Yield (node, is_target) for each ACL node from / down to the path."""
+        parts = _split(path)
+        node = self.root
+        yield node, not parts
+        for depth, part in enumerate(parts, 1):
+            child = node.children.get(part)
+            if child is None:
+                return
+            node = child
+            yield node, depth == len(parts)
+
+    def _path_roles(self, principal_type: str, ugid: str, path: str) -> Set[str]:
+        """Roles of one user or token on one path, before pool inheritance."""
+        groups = self.user_groups.get(ugid, []) if principal_type == "user" else []
+        roles: Dict[str, bool] = {}
+        for node, is_target in self._nodes(path):
+            direct = {
+                role: propagate
+                for role, propagate in node.acl.get(principal_type, {}).get(ugid, {}).items()
+                if is_target or propagate
+            }
+            if direct:
+                roles = direct
+                continue
+            via_groups: Dict[str, bool] = {}
+            group_acl = node.acl.get("group", {})
+            for group in groups:
+                for role, propagate in group_acl.get(group, {}).items():
+                    if is_target or propagate:
+                        via_groups[role] = propagate
+            if via_groups:
+                roles = via_groups
+        if NO_ACCESS in roles:
+            return set()
+        return set(roles)
+
+    def _roles(self, principal_type: str, ugid: str, path: str) -> Set[str]:
+        roles = self._path_roles(principal_type, ugid, path)
+        parts = _split(path)
+        if len(parts) == 2 and parts[0] == "vms" and parts[1] in self.guest_pools:
+            roles |= self._path_roles(principal_type, ugid, f"/pool/{self.guest_pools[parts[1]]}")
+        return roles
+
+    def _privileges(self, roles: Iterable[str]) -> frozenset:
+        return frozenset().union(*(self.privileges.get(role, ()) for role in roles))
+
+    def effective(self, ugid: str, path: str) -> Tuple[frozenset, frozenset]:
+        """Resolve the roles and privileges of a user or API token on a path.
+
+        Args:
+            ugid: User id ('alice@pve') or token id ('alice@pve!ci')
+            path: ACL path, e.g. '/vms/100'
+
+        Returns:
+            (roles, privileges) as frozensets
+        """
+        key = (ugid, path)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        userid, _, tokenid = ugid.partition("!")
+        if userid == SUPERUSER and not tokenid:
+            result = (frozenset(["Administrator"]), self.all_privileges)
+        elif tokenid:
+            user_roles, user_privileges = self.effective(userid, path)
+            token = self.tokens.get(ugid, {})
+            if int(token.get("privsep", 1)):
+                roles = frozenset(self._roles("token", ugid, path))
+                privileges = self._privileges(roles)
+                if userid != SUPERUSER:
+                    privileges &= user_privileges
+                result = (roles, privileges)
+            else:
+                result = (user_roles, user_privileges)
+        else:
+            roles = frozenset(self._roles("user", ugid, path))
+            result = (roles, self._privileges(roles))
+
+        self._cache[key] = result
+        return result
+
+    def principals(self) -> List[str]:
+        """Get every known user and token id."""
+        return sorted(set(self.user_groups) | set(self.tokens))
+
+
+def fetch_resolver(client: Any, max_workers: int = DEFAULT_MAX_WORKERS) -> PermissionResolver:
+    """Fetch ACLs, users, groups, roles and pool membership once, concurrently.
+
+    Args:
+        client: ProxmoxClient instance
+        max_workers: Maximum concurrent reads
+
+    Returns:
+        PermissionResolver instance
+    """
+    reads = {
+        "acl": lambda: client.api.access.acl.get(),
+        "users": lambda: client.get_users(full=True),
+        "groups": lambda: client.api.access.groups.get(),
+        "roles": client.get_roles,
+        "guests": lambda: client.get_cluster_resources("vm"),
+    }
+    data = {}
+    for name, result, error in fan_out(lambda name: reads[name](), list(reads), max_workers):
+        if error is not None:
+            raise error
+        data[name] = result
+    guest_pools = {str(g["vmid"]): g["pool"] for g in data["guests"] if g.get("pool")}
+    return PermissionResolver(
+        data["acl"], data["users"], data["roles"], data["groups"], guest_pools
+    )
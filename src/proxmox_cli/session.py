@@ -0,0 +1,611 @@
+"""HTTP session layers installed underneath proxmoxer.
+
+proxmoxer sends every API call through ``session.request(method, url, ...)``
+on one session shared by all resource objects. The classes here wrap that
+session to add behaviour for every call without touching the call sites.
+"""
+
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# urllib3's default number of pooled connections per host
+DEFAULT_POOL_SIZE = 10
+
+# Methods that are safe to send again; POST/PUT/DELETE are never replayed
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Gateway-style failures worth retrying. pveproxy reports ordinary API errors
+# ("VM 100 does not exist") as 500, so 500 and 501 are not retried; 595/596
+# are pveproxy's proxy connection errors.
+RETRY_STATUSES = frozenset({502, 503, 504, 595, 596, 599})
+
+try:
+    import httpx
+
+    RETRY_EXCEPTIONS: Tuple[type, ...] = (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        httpx.TransportError,
+    )
+except ImportError:
+    RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class RequestStats:
+    """Thread-safe counters describing the HTTP traffic of a client."""
+
+    def __init__(self):
+        """Initialize counters."""
+        self._lock = threading.Lock()
+        self.counters: Dict[str, float] = {}
+        self._sources: List[Callable[[], Dict[str, float]]] = []
+
+    def incr(self, name: str, amount: float = 1) -> None:
+        """Add to a counter.
+
+        Args:
+            name: Counter name
+            amount: Amount to add
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def get(self, name: str) -> float:
+        """Get a counter value (0 if never incremented).
+
+        Args:
+            name: Counter name
+
+        Returns:
+            Counter value
+        """
+        return self.counters.get(name, 0)
+
+    def add_source(self, source: Callable[[], Dict[str, float]]) -> None:
+        """Register a callable reporting extra values (e.g. connection pool state).
+
+        Args:
+            source: Callable returning a dictionary of values
+        """
+        self._sources.append(source)
+
+    def to_dict(self) -> Dict[str, float]:
+        """Get a snapshot of all counters.
+
+        Returns:
+            Dictionary of counter values
+        """
+        with self._lock:
+            values = dict(self.counters)
+        for source in self._sources:
+            values.update(source())
+        return dict(sorted(values.items()))
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTP adapter with a sized connection pool and connection statistics."""
+
+    def pool_stats(self) -> Dict[str, float]:
+        """Report how many connections were opened for how many requests.
+
+        Returns:
+            Dictionary with 'connections' and 'pooled_requests' totals
+        """
+        pools = self.poolmanager.pools
+        pools = [pool for pool in map(pools.get, pools.keys()) if pool is not None]
+        connections = sum(pool.num_connections for pool in pools)
+        pooled_requests = sum(pool.num_requests for pool in pools)
+        return {"connections": connections, "pooled_requests": pooled_requests}
+
+
+def configure_session(
+    session: Any,
+    stats: RequestStats,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    pool_block: bool = False,
+    keep_alive: bool = True,
+    connect_retries: int = 0,
+) -> Optional[PooledAdapter]:
+    """Mount a sized connection pool on a requests session.
+
+    Connections are kept alive and reused for every request to the same
+    host, which also avoids repeating the TLS handshake. Sessions that are
+    not requests sessions (e.g. test doubles) are left untouched.
+
+    Args:
+        session: requests.Session used by proxmoxer
+        stats: Statistics to report pool usage to
+        pool_size: Maximum pooled connections per host; size it to the
+            fan-out concurrency so parallel requests do not discard sockets
+        pool_block: Wait for a free connection instead of opening extra
+            unpooled ones when the pool is exhausted
+        keep_alive: Keep connections open between requests
+        connect_retries: Retries for failed connection attempts (the request
+            was never sent, so this is safe for every method)
+
+    Returns:
+        Mounted adapter, or None if the session does not support adapters
+    """
+    if not hasattr(session, "mount"):
+        return None
+
+    adapter = PooledAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        pool_block=pool_block,
+        max_retries=Retry(
+            total=connect_retries, connect=connect_retries, read=False, redirect=False, status=0
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+    stats.add_source(adapter.pool_stats)
+    return adapter
+
+
+class _AuthRequest:
+    """Minimal request object for proxmoxer's requests-style auth callables."""
+
+    def __init__(self, method: str):
+        self.method = method
+        self.headers: Dict[str, str] = {}
+        self.cert = None
+
+
+class HttpxSession:
+    """Drop-in replacement for proxmoxer's session using httpx.
+
+    With HTTP/2, concurrent requests are multiplexed as streams over one TLS
+    connection per host instead of a pool of HTTP/1.1 connections. pveproxy
+    negotiates HTTP/2 via ALPN; servers without it fall back to HTTP/1.1.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        stats: RequestStats,
+        http2: bool = True,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
+    ):
+        """Initialize httpx session from proxmoxer's requests session.
+
+        Args:
+            session: proxmoxer session to take auth, TLS and header settings from
+            stats: Statistics to report negotiated HTTP versions to
+            http2: Negotiate HTTP/2
+            pool_size: Maximum connections per host
+            keep_alive: Keep idle connections open between requests
+
+        Raises:
+            ImportError: If httpx (with h2 for HTTP/2) is not installed
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "The httpx transport requires httpx: pip install 'proxmox-cli[http2]'"
+            ) from None
+
+        self.auth = session.auth
+        self.stats = stats
+        self.headers = {
+            key: value for key, value in session.headers.items() if key.lower() != "connection"
+        }
+        limits = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size if keep_alive else 0,
+        )
+        self.client = httpx.Client(
+            http2=http2,
+            verify=self.auth.verify_ssl,
+            cert=session.cert,
+            timeout=self.auth.timeout,
+            limits=limits,
+            trust_env=True,
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Send a request with proxmoxer's authentication applied."""
+        # Lets ticket auth renew its ticket and add the CSRF header
+        auth_request = self.auth(_AuthRequest(method))
+        headers = dict(self.headers)
+        headers.update(auth_request.headers)
+        cookies = "; ".join(f"{c.name}={c.value}" for c in self.auth.get_cookies())
+        if cookies:
+            headers["Cookie"] = cookies
+
+        response = self.client.request(
+            method, url, params=params or None, data=data or None, headers=headers
+        )
+        self.stats.incr(response.http_version.lower().replace("/", "").replace(".", "_"))
+        return response
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.client.close()
+
+
+class SessionWrapper:
+    """Base class for session layers; unknown attributes go to the wrapped session."""
+
+    def __init__(self, session: Any, stats: RequestStats):
+        """Initialize wrapper.
+
+        Args:
+            session: Wrapped session (requests.Session or another wrapper)
+            stats: Shared statistics
+        """
+        self.session = session
+        self.stats = stats
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        """Send a request through the wrapped session."""
+        return self.session.request(method, url, **kwargs)
+
+
+# Request classes for rate limiting
+RATE_CLASSES = ("read", "write", "task")
+
+_NODE_RE = re.compile(r"/nodes/([^/?]+)")
+
+# Node-level POSTs that only change configuration instead of spawning a task
+_NON_TASK_POST_RE = re.compile(r"/nodes/[^/]+/(?:qemu|lxc)/\d+/(?:config|firewall|agent)")
+
+
+def classify_request(method: str, url: str) -> str:
+    """Get the rate-limit class of a request.
+
+    Most POSTs below /nodes/{node} (start, stop, create, clone, migrate,
+    vzdump, template downloads) start a worker task; other writes are
+    configuration changes handled by pmxcfs.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+
+    Returns:
+        'read', 'write' or 'task'
+    """
+    method = method.upper()
+    if method in IDEMPOTENT_METHODS:
+        return "read"
+    if method == "POST" and _NODE_RE.search(url) and not _NON_TASK_POST_RE.search(url):
+        return "task"
+    return "write"
+
+
+class TokenBucket:
+    """Thread-safe token bucket; callers block until a token is available."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """Initialize bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (default: one second's worth, at least 1)
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, possibly from the future.
+
+        Returns:
+            Seconds the caller has to wait before using the token
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+class RateLimitedSession(SessionWrapper):
+    """Limit request rates per request class and per node.
+
+    Limits are requests per second keyed by class ('read', 'write', 'task')
+    for the whole cluster, or 'node_<class>' for each node separately. A
+    request waits for a token from every bucket that applies to it, so
+    concurrent fan-outs and batch loops are paced alike.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        stats: RequestStats,
+        limits: Dict[str, float],
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize rate limiter.
+
+        Args:
+            session: Wrapped session
+            stats: Shared statistics ('throttled' and 'throttle_wait' seconds)
+            limits: Requests per second, e.g. {'task': 2, 'node_task': 1};
+                missing or non-positive entries are unlimited
+            sleep: Sleep function (overridable for tests)
+
+        Raises:
+            ValueError: If a limit key is unknown
+        """
+        super().__init__(session, stats)
+        valid = set(RATE_CLASSES) | {f"node_{c}" for c in RATE_CLASSES}
+        unknown = set(limits) - valid
+        if unknown:
+            raise ValueError(
+                f"Unknown rate limit {', '.join(sorted(unknown))} "
+                f"(choose from {', '.join(sorted(valid))})"
+            )
+        self.limits = {key: float(rate) for key, rate in limits.items() if rate and rate > 0}
+        self.sleep = sleep
+        self._buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key: str, node: Optional[str]) -> Optional[TokenBucket]:
+        rate = self.limits.get(key)
+        if rate is None:
+            return None
+        with self._lock:
+            bucket = self._buckets.get((key, node))
+            if bucket is None:
+                bucket = self._buckets[(key, node)] = TokenBucket(rate)
+            return bucket
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        """Send a request once the applicable buckets allow it."""
+        request_class = classify_request(method, url)
+        match = _NODE_RE.search(url)
+        node = match.group(1) if match else None
+
+        buckets = [self._bucket(request_class, None)]
+        if node is not None:
+            buckets.append(self._bucket(f"node_{request_class}", node))
+        wait = max((bucket.reserve() for bucket in buckets if bucket is not None), default=0.0)
+        if wait > 0:
+            self.stats.incr("throttled")
+            self.stats.incr("throttle_wait", wait)
+            self.sleep(wait)
+        return self.session.request(method, url, **kwargs)
+
+
+class RetryBudget:
+    """Shared limit on the number of retries for one client (one command).
+
+    Without a budget a cluster-wide outage turns every request into several,
+    so retries stop once the budget is spent.
+    """
+
+    def __init__(self, retries: int):
+        """Initialize budget.
+
+        Args:
+            retries: Total retries allowed
+        """
+        self._lock = threading.Lock()
+        self.remaining = retries
+
+    def take(self) -> bool:
+        """Spend one retry if any are left.
+
+        Returns:
+            True if a retry may be made
+        """
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+class RetryingSession(SessionWrapper):
+    """Retry idempotent requests with exponential backoff and full jitter.
+
+    Connection errors, timeouts and gateway errors (see RETRY_STATUSES) are
+    retried for GET/HEAD/OPTIONS only. Each retry waits a random time between
+    0 and ``backoff * 2**attempt`` seconds (capped at ``max_backoff``), or the
+    server's Retry-After, and spends one unit of the shared budget.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        stats: RequestStats,
+        retries: int = 3,
+        backoff: float = 0.2,
+        max_backoff: float = 5.0,
+        budget: Optional[RetryBudget] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize retry layer.
+
+        Args:
+            session: Wrapped session
+            stats: Shared statistics ('retries' and 'retry_wait' seconds)
+            retries: Maximum retries per request
+            backoff: Base delay in seconds
+            max_backoff: Maximum delay in seconds
+            budget: Optional shared retry budget
+            sleep: Sleep function (overridable for tests)
+        """
+        super().__init__(session, stats)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.sleep = sleep
+
+    def _delay(self, attempt: int, response: Any = None) -> float:
+        retry_after = getattr(response, "headers", {}).get("Retry-After") if response else None
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def _may_retry(self, attempt: int) -> bool:
+        if attempt >= self.retries:
+            return False
+        if self.budget is not None and not self.budget.take():
+            self.stats.incr("retry_budget_exhausted")
+            return False
+        return True
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        """Send a request, retrying transient failures of idempotent methods."""
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return self.session.request(method, url, **kwargs)
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except RETRY_EXCEPTIONS:
+                if not self._may_retry(attempt):
+                    raise
+                delay = self._delay(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES or not self._may_retry(attempt):
+                    return response
+                delay = self._delay(attempt, response)
+
+            self.stats.incr("retries")
+            self.stats.incr("retry_wait", delay)
+            self.sleep(delay)
+            attempt += 1
+
+
+class _Call:
+    """An in-flight GET that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class CoalescingSession(SessionWrapper):
+    """Share one HTTP request between identical GETs.
+
+    Identical GETs that are in flight at the same time always share one
+    request. Inside :meth:`scope`, completed GET responses are also reused by
+    later identical GETs until the scope ends or any non-GET request is sent.
+    Responses keep their body, so every caller decodes its own copy of the
+    result.
+    """
+
+    def __init__(self, session: Any, stats: RequestStats):
+        """Initialize coalescing layer.
+
+        Args:
+            session: Wrapped session
+            stats: Shared statistics
+        """
+        super().__init__(session, stats)
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple, _Call] = {}
+        self._scopes: List[Dict[Tuple, Any]] = []
+        # Bumped by every write so responses that raced a write are not cached
+        self._generation = 0
+
+    @contextmanager
+    def scope(self) -> Iterator[None]:
+        """Reuse completed GET responses until the block exits.
+
+        Scopes nest; an inner scope starts empty and the outer one is restored
+        afterwards. The scope stack is shared by all threads on purpose: a
+        command opens its scope on the main thread and fan_out() sends the
+        GETs from worker threads, which must see that scope. Scopes are
+        therefore opened per command (or per --watch poll), not per thread.
+        """
+        memo: Dict[Tuple, Any] = {}
+        with self._lock:
+            self._scopes.append(memo)
+        try:
+            yield
+        finally:
+            with self._lock:
+                # Memos compare equal when both are empty, so match by identity
+                for index in range(len(self._scopes) - 1, -1, -1):
+                    if self._scopes[index] is memo:
+                        del self._scopes[index]
+                        break
+
+    @staticmethod
+    def _key(url: str, params: Optional[Dict[str, Any]]) -> Tuple:
+        return (url, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        """Send a request, sharing identical GETs."""
+        if method.upper() != "GET":
+            # Writes may change anything we have seen so far
+            with self._lock:
+                self._generation += 1
+                for cached in self._scopes:
+                    cached.clear()
+            self.stats.incr("requests")
+            return self.session.request(method, url, **kwargs)
+
+        key = self._key(url, kwargs.get("params"))
+        with self._lock:
+            memo = self._scopes[-1] if self._scopes else None
+            if memo is not None and key in memo:
+                self.stats.incr("coalesced")
+                return memo[key]
+            generation = self._generation
+            call = self._inflight.get(key)
+            leader = call is None
+            if call is None:
+                call = self._inflight[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            self.stats.incr("coalesced")
+            if call.error is not None:
+                raise call.error
+            return call.response
+
+        self.stats.incr("requests")
+        try:
+            call.response = self.session.request(method, url, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                # Cache into the scope active when the call started, unless a
+                # write was sent meanwhile or the request failed
+                if (
+                    memo is not None
+                    and call.error is None
+                    and generation == self._generation
+                    and getattr(call.response, "status_code", 200) < 400
+                ):
+                    memo[key] = call.response
+            call.done.set()
+        return call.response
@@ -0,0 +1,508 @@
+"""Declarative desired state for pools and access control.
+
+A state file lists pools (with members), users (with group memberships and
+API tokens), groups, roles and ACL entries. Current state is fetched in a few
+bulk reads, diffed against the file, and only the missing changes are sent.
+Changes are grouped into phases: calls within a phase do not depend on each
+other and run concurrently; a phase starts once the previous one succeeded.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from proxmox_cli.utils.concurrency import DEFAULT_MAX_WORKERS, fan_out
+from proxmox_cli.utils.helpers import split_list
+
+# Top-level sections of a state file
+SECTIONS = ("pools", "users", "groups", "roles", "acl")
+
+# Phases, in execution order
+PHASE_REVOKE = 0  # ACL entries removed by --prune
+PHASE_CONTAINERS = 1  # groups, roles and pools
+PHASE_MEMBERS = 2  # users (with group membership) and pool members
+PHASE_TOKENS = 3  # API tokens of the users
+PHASE_GRANT = 4  # ACL entries
+PHASE_DELETE_USERS = 5  # users and tokens removed by --prune
+PHASE_DELETE = 6  # groups, roles and pools removed by --prune
+
+# User fields compared with the current state (password is only set on create)
+USER_FIELDS = ("email", "firstname", "lastname", "comment", "enable", "expire", "groups")
+
+# Token fields compared with the current state
+TOKEN_FIELDS = ("comment", "expire", "privsep")
+
+# Users that --prune never deletes
+PROTECTED_USERS = ("root@pam",)
+
+# ACL principal types and the PUT /access/acl parameter for each
+ACL_PRINCIPALS = {"user": "users", "group": "groups", "token": "tokens"}
+
+
+class StateError(ValueError):
+    """Raised for invalid state files."""
+
+
+class Action:
+    """One planned API call."""
+
+    __slots__ = ("phase", "method", "path", "params", "summary")
+
+    def __init__(
+        self, phase: int, method: str, path: str, params: Dict[str, Any], summary: str
+    ) -> None:
+        """Initialize action.
+
+        Args:
+            phase: Execution phase (PHASE_*)
+            method: HTTP method ('post', 'put' or 'delete')
+            path: API path, e.g. 'access/users/alice@pve'
+            params: Request parameters
+            summary: Human-readable description
+        """
+        self.phase = phase
+        self.method = method
+        self.path = path
+        self.params = params
+        self.summary = summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Format for plan output, with passwords masked."""
+        params = {k: ("***" if k == "password" else v) for k, v in self.params.items()}
+        return {
+            "phase": self.phase,
+            "method": self.method.upper(),
+            "path": f"/{self.path}",
+            "params": params,
+            "summary": self.summary,
+        }
+
+    def run(self, client: Any) -> Any:
+        """Send the call through a ProxmoxClient.
+
+        Args:
+            client: ProxmoxClient instance
+
+        Returns:
+            API response data
+        """
+        return getattr(client.api(self.path), self.method)(**self.params)
+
+
+def _flag(value: Any, default: int = 1) -> int:
+    """Normalise a boolean-ish value to 0/1."""
+    if value is None or value == "":
+        return default
+    if isinstance(value, str):
+        return 0 if value.lower() in ("0", "false", "no", "off") else 1
+    return 1 if value else 0
+
+
+def _id_key(value: str):
+    """Sort numeric ids numerically, others alphabetically."""
+    return (0, int(value), "") if value.isdigit() else (1, 0, value)
+
+
+def _normalise_field(field: str, value: Any) -> Any:
+    """Normalise a user or token field for comparison and sending."""
+    if field == "groups":
+        return ",".join(sorted(split_list(value)))
+    if field in ("enable", "privsep"):
+        return _flag(value)
+    if field == "expire":
+        return int(value or 0)
+    return "" if value is None else str(value)
+
+
+def load_state(path: str) -> Dict[str, Any]:
+    """Read and validate a state file.
+
+    Args:
+        path: Path to a YAML (or JSON) state file
+
+    Returns:
+        State dictionary with only known sections
+
+    Raises:
+        StateError: If the file has unknown sections or malformed entries
+    """
+    import yaml
+
+    with open(path, "r") as f:
+        state = yaml.safe_load(f) or {}
+    if not isinstance(state, dict):
+        raise StateError("State file must contain a mapping of sections")
+    unknown = sorted(set(state) - set(SECTIONS))
+    if unknown:
+        raise StateError(f"Unknown section(s): {', '.join(unknown)}")
+    for section in ("pools", "users", "groups", "roles"):
+        if not isinstance(state.get(section) or {}, dict):
+            raise StateError(f"'{section}' must be a mapping of id -> settings")
+    for entry in state.get("acl") or []:
+        if not isinstance(entry, dict) or not entry.get("path") or not entry.get("roles"):
+            raise StateError("Each 'acl' entry needs a path and roles")
+    return state
+
+
+def fetch_current(
+    client: Any, desired: Dict[str, Any], max_workers: int = DEFAULT_MAX_WORKERS
+) -> Dict[str, Any]:
+    """Fetch the current state in bulk.
+
+    Users (with groups and tokens, via ``access/users?full=1``), groups,
+    roles, ACLs and pools are read concurrently in one request each. Pool
+    members are fetched only for pools in the state file. On servers whose
+    user listing lacks tokens, tokens are read for the listed users only.
+
+    Args:
+        client: ProxmoxClient instance
+        desired: State from load_state()
+        max_workers: Maximum concurrent reads
+
+    Returns:
+        Dictionary of current 'users', 'groups', 'roles', 'acl', 'pools' and
+        'members', plus the number of 'reads' it took
+    """
+    bulk: Dict[str, Callable[[], Any]] = {
+        "users": lambda: client.get_users(full=True),
+        "groups": lambda: client.api.access.groups.get(),
+        "roles": client.get_roles,
+        "acl": lambda: client.api.access.acl.get(),
+        "pools": client.get_pools,
+    }
+    current: Dict[str, Any] = {"reads": 0}
+    for name, result, error in fan_out(lambda name: bulk[name](), list(bulk), max_workers):
+        if error is not None:
+            raise error
+        current[name] = result
+        current["reads"] += 1
+
+    users = {u["userid"]: dict(u) for u in current["users"]}
+    missing_tokens = [
+        userid
+        for userid, settings in (desired.get("users") or {}).items()
+        if (settings or {}).get("tokens") is not None
+        and userid in users
+        and "tokens" not in users[userid]
+    ]
+    for userid, tokens, error in fan_out(
+        lambda userid: client.api.access.users(userid).token.get(), missing_tokens, max_workers
+    ):
+        if error is not None:
+            raise error
+        users[userid]["tokens"] = tokens
+        current["reads"] += 1
+    current["users"] = users
+
+    existing_pools = {p["poolid"] for p in current["pools"]}
+    wanted = [p for p in desired.get("pools") or {} if p in existing_pools]
+    current["members"] = {}
+    for poolid, pool, error in fan_out(client.get_pool, wanted, max_workers):
+        if error is not None:
+            raise error
+        current["members"][poolid] = pool.get("members") or []
+        current["reads"] += 1
+    return current
+
+
+def _diff_fields(
+    desired: Dict[str, Any], current: Dict[str, Any], fields: Iterable[str]
+) -> Dict[str, Any]:
+    """Get the fields set in the state file whose values differ from the server."""
+    changes = {}
+    for field in fields:
+        if field not in desired:
+            continue
+        wanted = _normalise_field(field, desired[field])
+        if wanted != _normalise_field(field, current.get(field)):
+            changes[field] = wanted
+    return changes
+
+
+def _plan_groups(desired, current, prune) -> Iterator[Action]:
+    existing = {g["groupid"]: g for g in current["groups"]}
+    for groupid, settings in (desired.get("groups") or {}).items():
+        settings = settings or {}
+        if groupid not in existing:
+            params = {"groupid": groupid}
+            if settings.get("comment"):
+                params["comment"] = settings["comment"]
+            yield Action(
+                PHASE_CONTAINERS, "post", "access/groups", params, f"create group {groupid}"
+            )
+        elif "comment" in settings and (existing[groupid].get("comment") or "") != (
+            settings["comment"] or ""
+        ):
+            yield Action(
+                PHASE_CONTAINERS,
+                "put",
+                f"access/groups/{groupid}",
+                {"comment": settings["comment"] or ""},
+                f"update group {groupid}",
+            )
+    if prune and "groups" in desired:
+        for groupid in sorted(set(existing) - set(desired["groups"] or {})):
+            yield Action(
+                PHASE_DELETE, "delete", f"access/groups/{groupid}", {}, f"delete group {groupid}"
+            )
+
+
+def _plan_roles(desired, current, prune) -> Iterator[Action]:
+    existing = {r["roleid"]: r for r in current["roles"]}
+    for roleid, settings in (desired.get("roles") or {}).items():
+        privs = sorted(set(split_list((settings or {}).get("privs"))))
+        if roleid not in existing:
+            yield Action(
+                PHASE_CONTAINERS,
+                "post",
+                "access/roles",
+                {"roleid": roleid, "privs": ",".join(privs)},
+                f"create role {roleid}",
+            )
+        elif set(split_list(existing[roleid].get("privs"))) != set(privs):
+            yield Action(
+                PHASE_CONTAINERS,
+                "put",
+                f"access/roles/{roleid}",
+                {"privs": ",".join(privs)},
+                f"set privileges of role {roleid}",
+            )
+    if prune and "roles" in desired:
+        for roleid in sorted(set(existing) - set(desired["roles"] or {})):
+            # Built-in roles cannot be deleted
+            if existing[roleid].get("special"):
+                continue
+            yield Action(
+                PHASE_DELETE, "delete", f"access/roles/{roleid}", {}, f"delete role {roleid}"
+            )
+
+
+def _member_ids(members: Iterable[Dict[str, Any]]) -> Tuple[Set[str], Set[str]]:
+    """Split pool members into guest ids and storage ids."""
+    vms, storages = set(), set()
+    for member in members:
+        if member.get("type") == "storage":
+            storages.add(str(member.get("storage")))
+        elif member.get("vmid") is not None:
+            vms.add(str(member["vmid"]))
+    return vms, storages
+
+
+def _plan_pools(desired, current, prune) -> Iterator[Action]:
+    existing = {p["poolid"]: p for p in current["pools"]}
+    for poolid, settings in (desired.get("pools") or {}).items():
+        settings = settings or {}
+        if poolid not in existing:
+            params = {"poolid": poolid}
+            if settings.get("comment"):
+                params["comment"] = settings["comment"]
+            yield Action(PHASE_CONTAINERS, "post", "pools", params, f"create pool {poolid}")
+        elif "comment" in settings and (existing[poolid].get("comment") or "") != (
+            settings["comment"] or ""
+        ):
+            yield Action(
+                PHASE_CONTAINERS,
+                "put",
+                f"pools/{poolid}",
+                {"comment": settings["comment"] or ""},
+                f"update pool {poolid}",
+            )
+
+        vms, storages = _member_ids(current["members"].get(poolid, []))
+        add, remove = {}, {}
+        for key, have in (("vms", vms), ("storage", storages)):
+            if key not in settings:
+                continue
+            want = set(split_list(settings[key]))
+            if want - have:
+                add[key] = ",".join(sorted(want - have, key=_id_key))
+            if have - want:
+                remove[key] = ",".join(sorted(have - want, key=_id_key))
+        # One PUT adds all guests and storages; one more removes the extras
+        if add:
+            yield Action(
+                PHASE_MEMBERS, "put", f"pools/{poolid}", add, f"add members to pool {poolid}"
+            )
+        if remove:
+            yield Action(
+                PHASE_MEMBERS,
+                "put",
+                f"pools/{poolid}",
+                {**remove, "delete": 1},
+                f"remove members from pool {poolid}",
+            )
+    if prune and "pools" in desired:
+        for poolid in sorted(set(existing) - set(desired["pools"] or {})):
+            yield Action(PHASE_DELETE, "delete", f"pools/{poolid}", {}, f"delete pool {poolid}")
+
+
+def _plan_users(desired, current, prune) -> Iterator[Action]:
+    existing = current["users"]
+    for userid, settings in (desired.get("users") or {}).items():
+        settings = settings or {}
+        fields = {k: v for k, v in settings.items() if k != "tokens"}
+        if userid not in existing:
+            params = {"userid": userid}
+            for field, value in fields.items():
+                params[field] = value if field == "password" else _normalise_field(field, value)
+            yield Action(PHASE_MEMBERS, "post", "access/users", params, f"create user {userid}")
+            current_tokens = {}
+        else:
+            changes = _diff_fields(fields, existing[userid], USER_FIELDS)
+            if changes:
+                yield Action(
+                    PHASE_MEMBERS,
+                    "put",
+                    f"access/users/{userid}",
+                    changes,
+                    f"update user {userid} ({', '.join(sorted(changes))})",
+                )
+            current_tokens = {t["tokenid"]: t for t in existing[userid].get("tokens") or []}
+
+        tokens = settings.get("tokens")
+        if tokens is None:
+            continue
+        for tokenid, token in tokens.items():
+            token = token or {}
+            path = f"access/users/{userid}/token/{tokenid}"
+            if tokenid not in current_tokens:
+                params = {f: _normalise_field(f, token[f]) for f in TOKEN_FIELDS if f in token}
+                yield Action(PHASE_TOKENS, "post", path, params, f"create token {userid}!{tokenid}")
+                continue
+            changes = _diff_fields(token, current_tokens[tokenid], TOKEN_FIELDS)
+            if changes:
+                yield Action(PHASE_TOKENS, "put", path, changes, f"update token {userid}!{tokenid}")
+        if prune:
+            for tokenid in sorted(set(current_tokens) - set(tokens)):
+                yield Action(
+                    PHASE_DELETE_USERS,
+                    "delete",
+                    f"access/users/{userid}/token/{tokenid}",
+                    {},
+                    f"delete token {userid}!{tokenid}",
+                )
+    if prune and "users" in desired:
+        for userid in sorted(set(existing) - set(desired["users"] or {})):
+            if userid in PROTECTED_USERS:
+                continue
+            yield Action(
+                PHASE_DELETE_USERS, "delete", f"access/users/{userid}", {}, f"delete user {userid}"
+            )
+
+
+def _acl_key(entry: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    return entry["path"], entry["type"], entry["ugid"], entry["roleid"]
+
+
+def _desired_acl(entries: Iterable[Dict[str, Any]]) -> Dict[Tuple[str, str, str, str], int]:
+    """Expand state file ACL entries to (path, type, ugid, role) -> propagate."""
+    acl = {}
+    for entry in entries:
+        propagate = _flag(entry.get("propagate"))
+        for principal_type, param in ACL_PRINCIPALS.items():
+            for ugid in split_list(entry.get(param)):
+                for role in split_list(entry["roles"]):
+                    acl[(entry["path"], principal_type, ugid, role)] = propagate
+    return acl
+
+
+def _acl_calls(
+    entries: Dict[Tuple[str, str, str, str], int], phase: int, delete: bool
+) -> Iterator[Action]:
+    """Batch ACL changes into as few PUT /access/acl calls as possible.
+
+    Principals that need exactly the same roles on a path share one call.
+    """
+    roles: Dict[Tuple[str, int, str, str], Set[str]] = {}
+    for (path, principal_type, ugid, role), propagate in entries.items():
+        roles.setdefault((path, propagate, principal_type, ugid), set()).add(role)
+
+    batches: Dict[Tuple[str, int, Tuple[str, ...]], Dict[str, List[str]]] = {}
+    for (path, propagate, principal_type, ugid), role_set in roles.items():
+        principals = batches.setdefault((path, propagate, tuple(sorted(role_set))), {})
+        principals.setdefault(ACL_PRINCIPALS[principal_type], []).append(ugid)
+
+    for (path, propagate, role_list), principals in sorted(batches.items()):
+        params: Dict[str, Any] = {"path": path, "roles": ",".join(role_list)}
+        for param, ugids in sorted(principals.items()):
+            params[param] = ",".join(sorted(ugids))
+        if delete:
+            params["delete"] = 1
+            summary = f"revoke {params['roles']} on {path}"
+        else:
+            params["propagate"] = propagate
+            summary = f"grant {params['roles']} on {path}"
+        who = ", ".join(u for param in sorted(principals) for u in sorted(principals[param]))
+        yield Action(phase, "put", "access/acl", params, f"{summary} to {who}")
+
+
+def _plan_acl(desired, current, prune) -> Iterator[Action]:
+    if "acl" not in desired:
+        return
+    existing = {_acl_key(e): _flag(e.get("propagate")) for e in current["acl"]}
+    wanted = _desired_acl(desired["acl"] or [])
+    # Missing entries, and entries whose propagate flag differs (a PUT updates it)
+    grants = {key: p for key, p in wanted.items() if existing.get(key) != p}
+    yield from _acl_calls(grants, PHASE_GRANT, delete=False)
+    if prune:
+        revokes = {key: p for key, p in existing.items() if key not in wanted}
+        yield from _acl_calls(revokes, PHASE_REVOKE, delete=True)
+
+
+def plan(desired: Dict[str, Any], current: Dict[str, Any], prune: bool = False) -> List[Action]:
+    """Compute the API calls that make the server match the state file.
+
+    Objects are only created or changed for fields the file sets. With
+    ``prune``, objects in a section of the file that the file does not list
+    are deleted (built-in roles and root@pam excepted).
+
+    Args:
+        desired: State from load_state()
+        current: Current state from fetch_current()
+        prune: Delete unlisted objects
+
+    Returns:
+        Actions sorted by phase
+    """
+    actions: List[Action] = []
+    for planner in (_plan_groups, _plan_roles, _plan_pools, _plan_users, _plan_acl):
+        actions.extend(planner(desired, current, prune))
+    return sorted(actions, key=lambda action: action.phase)
+
+
+def apply_plan(
+    client: Any,
+    actions: List[Action],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """Run planned actions phase by phase, concurrently within each phase.
+
+    A failed call stops the run after its phase, since later phases may
+    depend on it (a user's tokens, ACLs naming a new group).
+
+    Args:
+        client: ProxmoxClient instance
+        actions: Actions from plan()
+        max_workers: Maximum concurrent calls
+        on_result: Optional callback receiving each result as it completes
+
+    Returns:
+        Result dictionaries with 'summary', 'success' and 'error' or 'data'
+    """
+    results = []
+    phases = sorted({action.phase for action in actions})
+    for phase in phases:
+        batch = [action for action in actions if action.phase == phase]
+        failed = False
+        for action, data, error in fan_out(lambda a: a.run(client), batch, max_workers):
+            result = {"summary": action.summary, "success": error is None}
+            if error is not None:
+                result["error"] = str(error)
+                failed = True
+            elif data:
+                result["data"] = data
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+        if failed:
+            break
+    return results
@@ -0,0 +1,171 @@
+"""One-pass group-by aggregation for list commands.
+
+Aggregates are given as a comma-separated list such as
+``sum(mem),count(),max(cpu)`` and are computed while records stream in;
+only one accumulator per group and aggregate is kept in memory.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from proxmox_cli.utils.filters import to_number
+
+AGGREGATE_FUNCTIONS = ("count", "sum", "min", "max", "avg")
+
+_AGGREGATE_RE = re.compile(r"^\s*(\w+)\s*\(\s*([\w.-]*)\s*\)\s*$")
+
+# Tags are stored by Proxmox as a single string separated by ';' (older
+# releases also accept ',' and spaces)
+_TAG_SPLIT_RE = re.compile(r"[;,\s]+")
+
+
+class AggregateError(ValueError):
+    """Raised when an aggregate specification cannot be parsed."""
+
+
+def parse_aggregates(spec: str) -> List[Tuple[str, Optional[str]]]:
+    """Parse an aggregate specification.
+
+    Args:
+        spec: Comma-separated aggregates, e.g. 'sum(mem),count(),max(cpu)'
+
+    Returns:
+        List of (function, field) tuples; field is None for count()
+
+    Raises:
+        AggregateError: If the specification is invalid
+    """
+    aggregates = []
+    for part in re.split(r",(?![^(]*\))", spec):
+        if not part.strip():
+            continue
+        match = _AGGREGATE_RE.match(part)
+        if not match:
+            raise AggregateError(f"Invalid aggregate {part.strip()!r}, expected e.g. sum(mem)")
+        func, field = match.group(1).lower(), match.group(2) or None
+        if func not in AGGREGATE_FUNCTIONS:
+            raise AggregateError(
+                f"Unknown aggregate function {func!r} "
+                f"(choose from {', '.join(AGGREGATE_FUNCTIONS)})"
+            )
+        if func != "count" and field is None:
+            raise AggregateError(f"{func}() requires a field name")
+        aggregates.append((func, field))
+    if not aggregates:
+        raise AggregateError("No aggregates given")
+    return aggregates
+
+
+def split_tags(value: Optional[str]) -> List[str]:
+    """Split a Proxmox tags string into individual tags.
+
+    Args:
+        value: Tags field, e.g. 'db;prod'
+
+    Returns:
+        List of tags
+    """
+    return [t for t in _TAG_SPLIT_RE.split(value or "") if t]
+
+
+def group_keys(record: Any, group_by: str) -> List[Any]:
+    """Get the group key(s) a record belongs to.
+
+    Tags are multi-valued, so a record with several tags is counted once in
+    each tag's group.
+
+    Args:
+        record: Record with a ``get`` method
+        group_by: Field to group by ('tag' splits the 'tags' field)
+
+    Returns:
+        List of group keys
+    """
+    if group_by == "tag":
+        return split_tags(record.get("tags")) or [None]
+    return [record.get(group_by)]
+
+
+class Aggregator:
+    """Streaming accumulator for grouped aggregates."""
+
+    def __init__(self, aggregates: List[Tuple[str, Optional[str]]], group_by: Optional[str] = None):
+        """Initialize aggregator.
+
+        Args:
+            aggregates: Parsed aggregates from parse_aggregates()
+            group_by: Optional field to group by
+        """
+        self.aggregates = aggregates
+        self.group_by = group_by
+        self.labels = [f"{func}({field or ''})" for func, field in aggregates]
+        # Per group: one [value, count] accumulator per aggregate
+        self._groups: Dict[Any, List[List[Any]]] = {}
+
+    def add(self, record: Any) -> None:
+        """Fold one record into the running aggregates.
+
+        Args:
+            record: Record with a ``get`` method
+        """
+        keys = group_keys(record, self.group_by) if self.group_by else [None]
+        for key in keys:
+            accumulators = self._groups.get(key)
+            if accumulators is None:
+                accumulators = [[None, 0] for _ in self.aggregates]
+                self._groups[key] = accumulators
+
+            for (func, field), acc in zip(self.aggregates, accumulators):
+                if func == "count":
+                    acc[1] += 1
+                    continue
+                value = to_number(record.get(field))
+                if value is None:
+                    continue
+                if acc[0] is None:
+                    acc[0] = value
+                elif func in ("sum", "avg"):
+                    acc[0] += value
+                elif func == "min":
+                    acc[0] = min(acc[0], value)
+                elif func == "max":
+                    acc[0] = max(acc[0], value)
+                acc[1] += 1
+
+    def consume(self, records: Iterable[Any]) -> "Aggregator":
+        """Fold every record from an iterable.
+
+        Args:
+            records: Iterable of records
+
+        Returns:
+            The aggregator itself
+        """
+        for record in records:
+            self.add(record)
+        return self
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Get one result row per group.
+
+        Returns:
+            List of dictionaries keyed by group field and aggregate labels
+        """
+        results = []
+        for key in sorted(self._groups, key=lambda k: (k is None, str(k))):
+            row: Dict[str, Any] = {}
+            if self.group_by:
+                row[self.group_by] = key if key is not None else "-"
+            for (func, _), label, (value, count) in zip(
+                self.aggregates, self.labels, self._groups[key]
+            ):
+                if func == "count":
+                    row[label] = count
+                elif func == "avg":
+                    row[label] = value / count if count else None
+                elif value is not None and float(value).is_integer():
+                    row[label] = int(value)
+                else:
+                    row[label] = value
+            results.append(row)
+        return results
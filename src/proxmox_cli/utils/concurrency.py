@@ -0,0 +1,152 @@
+"""Concurrent fan-out and fan-in helpers for per-node, per-storage and per-cluster calls."""
+
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+K = TypeVar("K", bound=Hashable)
+
+# Default number of API requests in flight at once
+DEFAULT_MAX_WORKERS = 8
+
+# Items buffered by fan_in() before producers wait for the consumer
+FAN_IN_BUFFER = 1000
+
+_DONE = object()
+
+
+def fan_out(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Iterator[Tuple[T, R, Optional[BaseException]]]:
+    """Call a function for each item concurrently, yielding results as they complete.
+
+    Items are pulled lazily, so ``items`` may itself be a generator fed by
+    another fan-out. At most ``max_workers`` calls are in flight; results come
+    back in completion order, not input order. Abandoning the generator
+    cancels calls that have not started yet.
+
+    Args:
+        func: Function to call with each item
+        items: Iterable of items
+        max_workers: Maximum concurrent calls (1 runs sequentially in-thread)
+
+    Yields:
+        (item, result, error) tuples; result is None whenever error is set,
+        so callers check error first and need no None check on result
+    """
+    # Typed as R so callers that handle errors first see a plain result
+    failed = cast(R, None)
+    iterator = iter(items)
+
+    if max_workers <= 1:
+        for item in iterator:
+            try:
+                result = func(item)
+            except Exception as e:
+                yield item, failed, e
+            else:
+                yield item, result, None
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {}
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_workers:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(func, item)] = item
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                yield item, failed if error is not None else future.result(), error
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def fan_in(
+    sources: Dict[K, Callable[[], Iterable[Any]]],
+    buffer: int = FAN_IN_BUFFER,
+) -> Iterator[Tuple[K, Any, Optional[BaseException]]]:
+    """Consume several iterables concurrently and interleave their items.
+
+    Each source runs in its own thread; items are yielded as soon as any
+    source produces them. A bounded buffer keeps fast sources from running
+    far ahead of the consumer. Abandoning the generator stops the producers
+    at their next item.
+
+    Args:
+        sources: Callables returning iterables, keyed by source name
+        buffer: Maximum items waiting to be consumed
+
+    Yields:
+        (key, item, None) for each item, and (key, None, error) when a source fails
+    """
+    if not sources:
+        return
+
+    items: "queue.Queue[Tuple[Any, Any, Optional[BaseException]]]" = queue.Queue(buffer)
+    stop = threading.Event()
+
+    def put(entry):
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(key, source):
+        try:
+            for item in source():
+                if not put((key, item, None)):
+                    return
+        except Exception as e:
+            put((key, _DONE, e))
+        else:
+            put((key, _DONE, None))
+
+    executor = ThreadPoolExecutor(max_workers=len(sources))
+    try:
+        for key, source in sources.items():
+            executor.submit(produce, key, source)
+        running = len(sources)
+        while running:
+            key, item, error = items.get()
+            if item is _DONE:
+                running -= 1
+                if error is not None:
+                    yield key, None, error
+            else:
+                yield key, item, None
+    finally:
+        stop.set()
+        executor.shutdown(wait=False)
@@ -0,0 +1,301 @@
+"""Filter expression engine for list commands.
+
+Expressions are parsed once into a tree of closures and then evaluated per
+record, e.g.::
+
+    status==running and maxmem>8G and name~"^db-"
+
+Supported operators are ``==``, ``!=``, ``>``, ``>=``, ``<``, ``<=``, ``~``
+(regex search) and ``!~`` (negated regex search), combined with ``and``,
+``or``, ``not`` and parentheses. Numeric values accept size units via
+:func:`proxmox_cli.utils.helpers.parse_size` (``512M``, ``8G``).
+"""
+
+import re
+from typing import Any, Callable, List, Optional, Tuple
+
+from proxmox_cli.utils.helpers import parse_size
+
+# A compiled node evaluates a record and returns True, False or None (unknown).
+Evaluator = Callable[[Any], Optional[bool]]
+
+_TOKEN_RE = re.compile(
+    r"""
+    \s*(?:
+        (?P<lparen>\() |
+        (?P<rparen>\)) |
+        (?P<op>==|!=|>=|<=|!~|>|<|~|=) |
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*') |
+        (?P<word>[^\s()=!<>~"']+)
+    )
+    """,
+    re.VERBOSE,
+)
+
+_KEYWORDS = {"and", "or", "not"}
+
+# Fields that are known before any per-node API call is made
+NODE_FIELDS = frozenset({"node"})
+
+
+class FilterError(ValueError):
+    """Raised when a filter expression cannot be parsed."""
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        match = _TOKEN_RE.match(expression, pos)
+        if not match or match.end() == pos:
+            raise FilterError(f"Unexpected character at position {pos}: {expression[pos:]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "word" and value.lower() in _KEYWORDS:
+            kind = value.lower()
+        elif kind == "string":
+            value = re.sub(r"\\(.)", r"\1", value[1:-1])
+        elif kind == "op" and value == "=":
+            value = "=="
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+def to_number(value: Any) -> Optional[float]:
+    """Coerce a record or literal value to a number, honouring size units."""
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        size = parse_size(value)
+        if size is not None:
+            return float(size)
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _compile_comparison(field: str, op: str, literal: str) -> Evaluator:
+    if op in ("~", "!~"):
+        try:
+            pattern = re.compile(literal)
+        except re.error as e:
+            raise FilterError(f"Invalid regular expression {literal!r}: {e}")
+        negate = op == "!~"
+
+        def regex(record: Any) -> Optional[bool]:
+            value = record.get(field)
+            if value is None:
+                return negate
+            return bool(pattern.search(str(value))) != negate
+
+        return regex
+
+    number = to_number(literal)
+    if op in (">", ">=", "<", "<="):
+        if number is None:
+            raise FilterError(f"Operator {op} requires a numeric value, got {literal!r}")
+        compare = {
+            ">": number.__lt__,
+            ">=": number.__le__,
+            "<": number.__gt__,
+            "<=": number.__ge__,
+        }[op]
+
+        def ordered(record: Any) -> Optional[bool]:
+            value = to_number(record.get(field))
+            return value is not None and compare(value)
+
+        return ordered
+
+    negate = op == "!="
+
+    def equals(record: Any) -> Optional[bool]:
+        value = record.get(field)
+        if value is None:
+            return negate
+        if number is not None:
+            value_number = to_number(value)
+            if value_number is not None:
+                return (value_number == number) != negate
+        return (str(value) == literal) != negate
+
+    return equals
+
+
+def _and(left: Evaluator, right: Evaluator) -> Evaluator:
+    def evaluate(record: Any) -> Optional[bool]:
+        a = left(record)
+        if a is False:
+            return False
+        b = right(record)
+        if b is False:
+            return False
+        return None if a is None or b is None else True
+
+    return evaluate
+
+
+def _or(left: Evaluator, right: Evaluator) -> Evaluator:
+    def evaluate(record: Any) -> Optional[bool]:
+        a = left(record)
+        if a is True:
+            return True
+        b = right(record)
+        if b is True:
+            return True
+        return None if a is None or b is None else False
+
+    return evaluate
+
+
+def _not(operand: Evaluator) -> Evaluator:
+    def evaluate(record: Any) -> Optional[bool]:
+        value = operand(record)
+        return None if value is None else not value
+
+    return evaluate
+
+
+class _Parser:
+    """Recursive-descent parser producing two evaluators per expression.
+
+    The first evaluator runs against full records; the second runs against a
+    partial record holding only node-level fields and yields None for terms
+    that cannot be decided yet.
+    """
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+        self.fields: List[str] = []
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def take(self, kind: str) -> str:
+        if self.peek() != kind:
+            found = self.tokens[self.pos][1] if self.pos < len(self.tokens) else "end of input"
+            raise FilterError(f"Expected {kind}, found {found!r}")
+        value = self.tokens[self.pos][1]
+        self.pos += 1
+        return value
+
+    def parse(self) -> Tuple[Evaluator, Evaluator]:
+        result = self.parse_or()
+        if self.pos != len(self.tokens):
+            raise FilterError(f"Unexpected token {self.tokens[self.pos][1]!r}")
+        return result
+
+    def parse_or(self) -> Tuple[Evaluator, Evaluator]:
+        full, partial = self.parse_and()
+        while self.peek() == "or":
+            self.pos += 1
+            right_full, right_partial = self.parse_and()
+            full, partial = _or(full, right_full), _or(partial, right_partial)
+        return full, partial
+
+    def parse_and(self) -> Tuple[Evaluator, Evaluator]:
+        full, partial = self.parse_not()
+        while self.peek() == "and":
+            self.pos += 1
+            right_full, right_partial = self.parse_not()
+            full, partial = _and(full, right_full), _and(partial, right_partial)
+        return full, partial
+
+    def parse_not(self) -> Tuple[Evaluator, Evaluator]:
+        if self.peek() == "not":
+            self.pos += 1
+            full, partial = self.parse_not()
+            return _not(full), _not(partial)
+        return self.parse_atom()
+
+    def parse_atom(self) -> Tuple[Evaluator, Evaluator]:
+        if self.peek() == "lparen":
+            self.pos += 1
+            result = self.parse_or()
+            self.take("rparen")
+            return result
+
+        field = self.take("word")
+        op = self.take("op")
+        if self.peek() in ("word", "string"):
+            literal = self.tokens[self.pos][1]
+            self.pos += 1
+        else:
+            raise FilterError(f"Missing value after '{field}{op}'")
+
+        self.fields.append(field)
+        full = _compile_comparison(field, op, literal)
+        if field in NODE_FIELDS:
+            partial = full
+        else:
+
+            def partial(record: Any) -> Optional[bool]:
+                return None
+
+        return full, partial
+
+
+class Filter:
+    """A compiled filter expression.
+
+    Instances are callable with a record (anything with a ``get`` method) and
+    return whether the record matches.
+    """
+
+    def __init__(self, expression: str):
+        """Parse and compile a filter expression.
+
+        Args:
+            expression: Filter expression string
+
+        Raises:
+            FilterError: If the expression is invalid
+        """
+        self.expression = expression
+        tokens = _tokenize(expression)
+        if not tokens:
+            raise FilterError("Empty filter expression")
+        parser = _Parser(tokens)
+        self._evaluate, self._evaluate_node = parser.parse()
+        self.fields = frozenset(parser.fields)
+
+    def __call__(self, record: Any) -> bool:
+        return bool(self._evaluate(record))
+
+    def __repr__(self) -> str:
+        return f"Filter({self.expression!r})"
+
+    def matches_node(self, node: str) -> bool:
+        """Check whether any record on a node could match.
+
+        Only node-level terms are evaluated; everything else is treated as
+        unknown, so a node is skipped only when no record on it can match.
+
+        Args:
+            node: Node name
+
+        Returns:
+            False if the node can be skipped, True otherwise
+        """
+        return self._evaluate_node({"node": node}) is not False
+
+
+def compile_filter(expression: Optional[str]) -> Optional[Filter]:
+    """Compile a filter expression, passing None through.
+
+    Args:
+        expression: Filter expression string or None
+
+    Returns:
+        Compiled Filter or None
+    """
+    if expression is None:
+        return None
+    return Filter(expression)
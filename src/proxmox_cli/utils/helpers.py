@@ -1,7 +1,7 @@
 """Helper utility functions."""
 
 import re
-from typing import Optional
+from typing import Any, List, Optional
 
 
 def validate_vmid(vmid: str) -> bool:
@@ -94,3 +94,22 @@ def format_uptime(seconds: int) -> str:
         parts.append(f"{seconds}s")
 
     return " ".join(parts)
+
+
+def split_list(value: Any) -> List[str]:
+    """Normalise a list or comma-separated string to a list of strings.
+
+    The API returns fields such as groups, privileges and storage content
+    either as 'a,b' strings or as lists, depending on the endpoint.
+
+    Args:
+        value: List, comma-separated string or None
+
+    Returns:
+        List of non-empty strings
+    """
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    return [str(v) for v in value]
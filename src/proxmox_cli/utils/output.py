@@ -1,12 +1,16 @@
 """Output formatting utilities."""
 
+import csv
+import io
 import json
+import sys
+from collections.abc import Mapping
 from enum import Enum
-from typing import Any, Dict, List
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, List, Optional
 
 from rich.console import Console
 from rich.table import Table
-from tabulate import tabulate
 
 
 class OutputFormat(Enum):
@@ -16,10 +20,28 @@ class OutputFormat(Enum):
     JSON = "json"
     YAML = "yaml"
     PLAIN = "plain"
+    CSV = "csv"
+    TSV = "tsv"
+
+
+# Field delimiters for the delimited output formats
+DELIMITERS = {OutputFormat.CSV: ",", OutputFormat.TSV: "\t"}
 
 
 console = Console()
 
+# Diagnostics go to stderr so they never mix with JSON/CSV output
+err_console = Console(stderr=True)
+
+# Results up to this many rows are rendered as a fully measured rich table
+STREAMING_THRESHOLD = 500
+
+# Rows inspected to fix column widths for streamed tables
+WIDTH_SAMPLE_ROWS = 100
+
+# Streamed cells longer than this are truncated
+MAX_COLUMN_WIDTH = 48
+
 
 def format_output(
     data: Any, format: OutputFormat = OutputFormat.TABLE, headers: List[str] = None
@@ -35,10 +57,12 @@ def format_output(
         Formatted string
     """
     if format == OutputFormat.JSON:
-        return json.dumps(data, indent=2)
+        return json.dumps(data, indent=2, default=_json_default)
 
     elif format == OutputFormat.TABLE:
         if isinstance(data, list) and data:
+            from tabulate import tabulate
+
             if headers is None:
                 headers = list(data[0].keys()) if isinstance(data[0], dict) else []
             return tabulate(data, headers="keys" if not headers else headers, tablefmt="grid")
@@ -49,6 +73,11 @@ def format_output(
 
         return yaml.dump(data, default_flow_style=False)
 
+    elif format in DELIMITERS:
+        buffer = io.StringIO()
+        write_delimited(data if isinstance(data, list) else [data], DELIMITERS[format], buffer)
+        return buffer.getvalue()
+
     else:  # PLAIN
         return str(data)
 
@@ -77,6 +106,151 @@ def print_table(data: List[Dict[str, Any]], title: str = None) -> None:
     console.print(table)
 
 
+class StreamingTable:
+    """Plain-text table printed row by row with fixed column widths.
+
+    Column widths are measured once on a bounded sample instead of on the
+    whole result set, so memory use and time to first row stay constant.
+    """
+
+    def __init__(
+        self,
+        columns: List[Any],
+        sample: List[Dict[str, Any]],
+        title: Optional[str] = None,
+        page_size: Optional[int] = None,
+        max_width: int = MAX_COLUMN_WIDTH,
+        file: Any = None,
+    ):
+        """Initialize streaming table.
+
+        Args:
+            columns: Column keys, in display order
+            sample: Rows used to measure column widths
+            title: Optional table title
+            page_size: Optional number of rows per page (header is repeated)
+            max_width: Maximum cell width; longer cells are truncated
+            file: Output stream (default: sys.stdout)
+        """
+        self.columns = columns
+        self.title = title
+        self.page_size = page_size
+        self.max_width = max_width
+        self.file = file or sys.stdout
+        self.widths = []
+        for column in columns:
+            width = len(str(column))
+            for row in sample:
+                width = max(width, len(self._cell(row.get(column))))
+            self.widths.append(min(width, max_width))
+
+    @staticmethod
+    def _cell(value: Any) -> str:
+        return "" if value is None else str(value)
+
+    def _format(self, values: Iterable[str]) -> str:
+        cells = []
+        for value, width in zip(values, self.widths):
+            # Cells wider than the sample push the row out rather than lose
+            # data; only cells beyond max_width are truncated
+            if len(value) > self.max_width:
+                value = value[: self.max_width - 1] + "…"
+            cells.append(value.ljust(width))
+        return "  ".join(cells).rstrip() + "\n"
+
+    def _write_header(self) -> None:
+        self.file.write(self._format(str(c).upper() for c in self.columns))
+        self.file.write("  ".join("-" * w for w in self.widths) + "\n")
+
+    def print_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Print rows as they arrive.
+
+        Args:
+            rows: Iterable of row dictionaries
+
+        Returns:
+            Number of rows printed
+        """
+        if self.title:
+            self.file.write(f"{self.title}\n\n")
+        self._write_header()
+        count = 0
+        for row in rows:
+            if self.page_size and count and count % self.page_size == 0:
+                self.file.write("\n")
+                self._write_header()
+            self.file.write(self._format(self._cell(row.get(c)) for c in self.columns))
+            count += 1
+        self.file.flush()
+        return count
+
+
+def print_rows(
+    rows: Iterable[Dict[str, Any]], title: str = None, page_size: Optional[int] = None
+) -> None:
+    """Print rows as a table, streaming large results.
+
+    Small results keep the measured rich table from print_table(); results
+    larger than STREAMING_THRESHOLD rows, or any paginated output, are
+    printed with a StreamingTable as rows arrive.
+
+    Args:
+        rows: Iterable of row dictionaries (may be a generator)
+        title: Optional table title
+        page_size: Optional number of rows per page
+    """
+    rows = iter(rows)
+    buffered = list(islice(rows, STREAMING_THRESHOLD + 1))
+    if page_size is None and len(buffered) <= STREAMING_THRESHOLD:
+        print_table(buffered, title=title)
+        return
+
+    table = StreamingTable(
+        list(buffered[0].keys()), buffered[:WIDTH_SAMPLE_ROWS], title=title, page_size=page_size
+    )
+    table.print_rows(chain(buffered, rows))
+
+
+def _delimited_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+def write_delimited(
+    rows: Iterable[Dict[str, Any]],
+    delimiter: str = ",",
+    file: Any = None,
+    headers: Optional[List[str]] = None,
+) -> int:
+    """Write rows as CSV/TSV as they arrive.
+
+    The header is fixed from ``headers`` or the first row's keys; later rows
+    are written in that column order, with missing keys left empty.
+
+    Args:
+        rows: Iterable of row dictionaries (may be a generator)
+        delimiter: Field delimiter (',' for CSV, '\\t' for TSV)
+        file: Output stream (default: sys.stdout)
+        headers: Optional column keys
+
+    Returns:
+        Number of data rows written
+    """
+    writer = csv.writer(file or sys.stdout, delimiter=delimiter, lineterminator="\n")
+    count = 0
+    for row in rows:
+        if headers is None:
+            headers = list(row.keys())
+        if count == 0:
+            writer.writerow(headers)
+        writer.writerow([_delimited_value(row.get(h)) for h in headers])
+        count += 1
+    return count
+
+
 def print_success(message: str) -> None:
     """Print success message.
 
@@ -95,13 +269,14 @@ def print_error(message: str) -> None:
     console.print(f"[red]✗[/red] {message}", style="red")
 
 
-def print_warning(message: str) -> None:
+def print_warning(message: str, err: bool = False) -> None:
     """Print warning message.
 
     Args:
         message: Warning message to print
+        err: Print to stderr, keeping machine-readable stdout clean
     """
-    console.print(f"[yellow]⚠[/yellow] {message}", style="yellow")
+    (err_console if err else console).print(f"[yellow]⚠[/yellow] {message}", style="yellow")
 
 
 def print_info(message: str) -> None:
@@ -113,10 +288,30 @@ def print_info(message: str) -> None:
     console.print(f"[blue]ℹ[/blue] {message}", style="blue")
 
 
+def print_stats(stats: Dict[str, Any]) -> None:
+    """Print request statistics to stderr.
+
+    Args:
+        stats: Counter values keyed by name
+    """
+    values = " ".join(
+        f"{name}={value:.2f}" if isinstance(value, float) else f"{name}={value}"
+        for name, value in stats.items()
+    )
+    err_console.print(f"[dim]stats: {values or 'no requests'}[/dim]", highlight=False)
+
+
+def _json_default(value: Any) -> Any:
+    # Record models are mappings but not dicts
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def print_json(data: Any) -> None:
     """Print data as JSON.
 
     Args:
         data: Data to output as JSON
     """
-    print(json.dumps(data, indent=2))
+    print(json.dumps(data, indent=2, default=_json_default))
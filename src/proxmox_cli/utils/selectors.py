@@ -0,0 +1,109 @@
+"""Guest selectors for bulk operations.
+
+A selector picks guests from one ``/cluster/resources`` snapshot by name
+glob, tag, node and ``--where`` expression. Different criteria must all
+match; repeated values of one criterion match if any of them does::
+
+    --name 'web-*' --name 'api-*' --tag prod --node pve1
+
+selects guests named ``web-*`` or ``api-*`` that are tagged ``prod`` and run
+on ``pve1``. Explicit ids are always selected, whether or not they appear in
+the snapshot.
+"""
+
+from fnmatch import fnmatchcase
+from typing import Any, Iterable, List, Optional
+
+from proxmox_cli.utils.aggregate import split_tags
+from proxmox_cli.utils.filters import Filter
+
+
+class GuestSelector:
+    """Match guests by name glob, tag, node, filter expression or id."""
+
+    def __init__(
+        self,
+        names: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        nodes: Iterable[str] = (),
+        where: Optional[Filter] = None,
+        ids: Iterable[Any] = (),
+    ):
+        """Initialize selector.
+
+        Args:
+            names: Name globs ('web-*')
+            tags: Tags, any of which must be set on the guest
+            nodes: Node names
+            where: Optional compiled filter expression
+            ids: Explicit VM/container ids
+        """
+        self.names = list(names)
+        self.tags = set(tags)
+        self.nodes = set(nodes)
+        self.where = where
+        self.ids = {int(i) for i in ids}
+
+    @property
+    def has_criteria(self) -> bool:
+        """Whether the selector needs a resource snapshot to be resolved."""
+        return bool(self.names or self.tags or self.nodes or self.where)
+
+    def __bool__(self) -> bool:
+        return self.has_criteria or bool(self.ids)
+
+    def matches(self, guest: Any) -> bool:
+        """Whether one guest record is selected.
+
+        Args:
+            guest: Guest record from /cluster/resources
+
+        Returns:
+            True if the guest matches
+        """
+        if int(guest.get("vmid")) in self.ids:
+            return True
+        if not self.has_criteria:
+            return False
+        if self.names and not any(fnmatchcase(guest.get("name") or "", n) for n in self.names):
+            return False
+        if self.tags and not self.tags.intersection(split_tags(guest.get("tags"))):
+            return False
+        if self.nodes and guest.get("node") not in self.nodes:
+            return False
+        return self.where is None or self.where(guest)
+
+    def select(self, guests: Iterable[Any]) -> List[int]:
+        """Resolve the selector against a snapshot.
+
+        Args:
+            guests: Guest records from /cluster/resources
+
+        Returns:
+            Sorted list of selected ids, including explicit ids not in the snapshot
+        """
+        selected = set(self.ids)
+        for guest in guests:
+            if guest.get("type") in ("qemu", "lxc") and self.matches(guest):
+                selected.add(int(guest["vmid"]))
+        return sorted(selected)
+
+
+def parse_ids(text: str) -> List[int]:
+    """Parse VM/container ids separated by whitespace or commas.
+
+    Args:
+        text: Input text, e.g. read from stdin
+
+    Returns:
+        List of ids
+
+    Raises:
+        ValueError: If a token is not a numeric id
+    """
+    ids = []
+    for token in text.replace(",", " ").split():
+        if not token.isdigit():
+            raise ValueError(f"Invalid VM/container id: {token!r}")
+        ids.append(int(token))
+    return ids
@@ -0,0 +1,78 @@
+"""Polling and snapshot diffing for --watch mode."""
+
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# (event, key, row) where event is 'added', 'changed' or 'removed'
+Event = Tuple[str, Any, Dict[str, Any]]
+
+
+def diff_snapshots(
+    previous: Dict[Any, Dict[str, Any]], current: Dict[Any, Dict[str, Any]]
+) -> List[Event]:
+    """Compute row-level changes between two keyed snapshots.
+
+    Args:
+        previous: Rows from the previous poll keyed by id
+        current: Rows from the current poll keyed by id
+
+    Returns:
+        List of (event, key, row) tuples; removed events carry the last known row
+    """
+    events = []
+    for key, row in current.items():
+        old = previous.get(key)
+        if old is None:
+            events.append(("added", key, row))
+        elif old != row:
+            events.append(("changed", key, row))
+    for key, row in previous.items():
+        if key not in current:
+            events.append(("removed", key, row))
+    return events
+
+
+def poll_changes(
+    fetch: Callable[[], Iterable[Dict[str, Any]]],
+    key: Callable[[Dict[str, Any]], Any],
+    interval: float,
+    max_ticks: Optional[int] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    on_error: Optional[Callable[[Exception], None]] = None,
+) -> Iterator[List[Event]]:
+    """Poll a data source and yield the changes seen on each tick.
+
+    The first tick reports every row as added. The interval is measured from
+    the start of each poll, so slow responses do not stretch the cadence.
+
+    Args:
+        fetch: Callable returning the current rows (one API request per call)
+        key: Callable extracting a stable id from a row
+        interval: Seconds between polls
+        max_ticks: Optional number of polls before stopping
+        sleep: Sleep function (overridable for tests)
+        on_error: Optional callback for failed polls; the previous snapshot is
+            kept and the tick yields no events. Without it errors propagate.
+
+    Yields:
+        List of events for each tick
+    """
+    previous: Dict[Any, Dict[str, Any]] = {}
+    tick = 0
+    while True:
+        started = time.monotonic()
+        try:
+            current = {key(row): row for row in fetch()}
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            yield []
+        else:
+            yield diff_snapshots(previous, current)
+            previous = current
+
+        tick += 1
+        if max_ticks is not None and tick >= max_ticks:
+            return
+        sleep(max(0.0, interval - (time.monotonic() - started)))
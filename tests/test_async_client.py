@@ -0,0 +1,99 @@
+"""Tests for the asyncio Proxmox client."""
+
+import asyncio
+from urllib.parse import parse_qs
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from proxmoxer import ResourceException  # noqa: E402
+
+from proxmox_cli.async_client import AsyncProxmoxClient  # noqa: E402
+
+NODES = {
+    "pve1": [{"vmid": 100, "name": "db-1"}, {"vmid": 101, "name": "web-1"}],
+    "pve2": [{"vmid": 200, "name": "db-2"}],
+}
+
+
+def make_client(max_concurrency=2, **kwargs):
+    """Client backed by a mock transport tracking peak concurrency."""
+    state = {"active": 0, "peak": 0, "requests": []}
+
+    async def handler(request):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        try:
+            await asyncio.sleep(0.01)
+            path = request.url.path.replace("/api2/json", "")
+            state["requests"].append((request.method, path, request))
+            if path == "/access/ticket":
+                ticket = {"ticket": "T", "CSRFPreventionToken": "C"}
+                return httpx.Response(200, json={"data": ticket})
+            if path == "/nodes":
+                return httpx.Response(200, json={"data": [{"node": n} for n in NODES]})
+            if path.startswith("/nodes/") and path.endswith("/qemu"):
+                return httpx.Response(200, json={"data": NODES[path.split("/")[2]]})
+            if path == "/nodes/offline/status":
+                return httpx.Response(595, text="no route to host")
+            if path == "/pools" and request.method == "POST":
+                return httpx.Response(200, json={"data": None})
+            return httpx.Response(500, json={"errors": {"path": "unknown"}})
+        finally:
+            state["active"] -= 1
+
+    client = AsyncProxmoxClient(
+        "pve",
+        "root@pam",
+        max_concurrency=max_concurrency,
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+    return client, state
+
+
+def test_get_vms_concurrent_and_bounded():
+    """Test guests are collected from every node under the concurrency bound."""
+
+    async def run():
+        client, state = make_client(max_concurrency=1, token_name="ci", token_value="secret")
+        async with client:
+            vms = await client.get_vms()
+        return vms, state
+
+    vms, state = asyncio.run(run())
+
+    assert sorted((v["vmid"], v["node"]) for v in vms) == [
+        (100, "pve1"),
+        (101, "pve1"),
+        (200, "pve2"),
+    ]
+    assert state["peak"] == 1
+    assert state["requests"][0][2].headers["Authorization"] == "PVEAPIToken=root@pam!ci=secret"
+
+
+def test_ticket_auth_and_errors():
+    """Test password login, CSRF header on writes and API errors."""
+
+    async def run():
+        client, state = make_client(password="secret")
+        async with client:
+            await client.create_pool("ops", comment=None)
+            with pytest.raises(ResourceException):
+                await client.api.nodes("pve1").qemu(100).config.get()
+            with pytest.raises(ResourceException) as proxy_error:
+                await client.api.nodes("offline").status.get()
+        assert proxy_error.value.status_code == 595
+        return state
+
+    state = asyncio.run(run())
+
+    methods = [(method, path) for method, path, _ in state["requests"]]
+    assert methods[:2] == [("POST", "/access/ticket"), ("POST", "/pools")]
+    post = state["requests"][1][2]
+    assert post.headers["CSRFPreventionToken"] == "C"
+    assert post.headers["Cookie"] == "PVEAuthCookie=T"
+    assert parse_qs(post.content.decode()) == {"poolid": ["ops"]}
+    login = parse_qs(state["requests"][0][2].content.decode())
+    assert login == {"username": ["root@pam"], "password": ["secret"]}
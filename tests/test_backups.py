@@ -0,0 +1,138 @@
+"""Tests for the backup catalog."""
+
+import json
+import time
+from unittest import mock
+
+import pytest
+from click.testing import CliRunner
+
+from proxmox_cli.backups import (
+    BackupCache,
+    RetentionError,
+    backup_targets,
+    mark_group,
+    parse_retention,
+    parse_volid,
+    scan_catalog,
+)
+from proxmox_cli.cli import main
+from proxmox_cli.models import Backup, Node, Storage
+from proxmox_cli.session import RequestStats
+
+STORAGES = [
+    {"storage": "local", "type": "dir", "content": "iso,backup"},
+    {"storage": "nfs", "type": "nfs", "content": "backup"},
+    {"storage": "pbs", "type": "pbs", "content": "backup", "nodes": "pve2"},
+    {"storage": "lvm", "type": "lvmthin", "content": "images"},
+    {"storage": "old", "type": "dir", "content": "backup", "disable": 1},
+]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep the backup cache in a temporary directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+
+@pytest.fixture
+def client():
+    """Client listing one backup per node-local storage and two on NFS."""
+    client = mock.Mock()
+    client.stats = RequestStats()
+    client.get_storage.return_value = [Storage.from_api(s) for s in STORAGES]
+    client.get_nodes.return_value = [
+        Node.from_api({"node": n, "status": s})
+        for n, s in (("pve1", "online"), ("pve2", "online"), ("pve3", "offline"))
+    ]
+    content = {
+        ("pve1", "local"): [{"volid": "local:backup/vzdump-qemu-100-2024_01_01-00_00_00.vma"}],
+        ("pve2", "local"): [{"volid": "local:backup/vzdump-lxc-200-2024_01_01-00_00_00.tar"}],
+        ("pve1", "nfs"): [
+            {"volid": "nfs:backup/a.vma", "vmid": 100, "ctime": 10, "size": 1},
+            {"volid": "nfs:backup/b.vma", "vmid": 100, "ctime": 20, "size": 2},
+        ],
+        ("pve2", "pbs"): [],
+    }
+    client.get_storage_content.side_effect = lambda n, s, content_type: content[(n, s)]
+    return client
+
+
+def test_backup_targets_list_shared_storages_once():
+    """Test shared storages are listed through one node and local ones on each node."""
+    storages = [Storage.from_api(s) for s in STORAGES]
+
+    assert backup_targets(storages, ["pve2", "pve1"]) == [
+        ("pve1/local", "pve1", "local"),
+        ("pve2/local", "pve2", "local"),
+        ("nfs", "pve1", "nfs"),
+        ("pbs", "pve2", "pbs"),
+    ]
+    assert backup_targets(storages, ["pve1", "pve2"], node="pve2", storage="nfs") == [
+        ("nfs", "pve2", "nfs")
+    ]
+    assert parse_volid("pbs:backup/ct/200/2024-01-31T02:00:05Z") == ("lxc", 200, 1706666405)
+
+
+def test_scan_catalog_indexes_and_caches_listings(client):
+    """Test archives are indexed by guest and cached listings are reused."""
+    cache = BackupCache()
+    catalog = scan_catalog(client, cache=cache, max_age=60)
+
+    assert len(catalog) == 4
+    assert catalog.vmids() == [100, 200]
+    assert catalog.latest(100)["volid"].startswith("local:backup/vzdump-qemu-100-2024")
+    assert [b["volid"] for b in catalog.query([100], latest=True)] == [catalog.latest(100)["volid"]]
+    assert client.get_storage_content.call_count == 4
+
+    assert len(scan_catalog(client, cache=cache, max_age=60)) == 4
+    assert client.get_storage_content.call_count == 4
+
+
+def _archives(*days, protected=()):
+    """Build one guest's archives created at noon on the given days of January 2024."""
+    return [
+        Backup.from_api(
+            {
+                "volid": f"nfs:backup/{day}.vma",
+                "vmid": 100,
+                "ctime": int(time.mktime((2024, 1, day, 12, 0, 0, 0, 0, -1))),
+                "protected": int(day in protected),
+            }
+        )
+        for day in days
+    ]
+
+
+def test_mark_group_follows_prune_backups_rules():
+    """Test keep-* options apply in order, skipping covered buckets and protected archives."""
+    archives = _archives(1, 2, 3, 8, 9, 10, 10, protected=(9,))
+    marks = mark_group(archives, parse_retention("keep-last=1,keep-daily=2,keep-weekly=2"))
+    by_day = [(time.localtime(a["ctime"]).tm_mday, mark, rule) for a, mark, rule in marks]
+
+    assert by_day == [
+        (10, "keep", "keep-last"),
+        (10, "remove", None),
+        (9, "protected", None),
+        (8, "keep", "keep-daily"),
+        (3, "keep", "keep-daily"),
+        (2, "remove", None),
+        # ISO weeks 1 and 2 are already covered by archives kept above
+        (1, "remove", None),
+    ]
+    assert {mark for _, mark, _ in mark_group(archives, {})} == {"keep", "protected"}
+    with pytest.raises(RetentionError):
+        parse_retention("keep-forever=1")
+
+
+def test_prune_plan_execute_deletes_removed_archives(client):
+    """Test prune-plan --execute deletes only archives marked for removal."""
+    client.max_workers = 4
+    runner = CliRunner()
+    with mock.patch("proxmox_cli.commands.backup.get_proxmox_client", return_value=client):
+        result = runner.invoke(
+            main, ["backup", "prune-plan", "--prune-backups", "keep-last=1", "--execute"]
+        )
+    assert result.exit_code == 0
+    client.delete_storage_content.assert_called_once_with("pve1", "nfs", "nfs:backup/a.vma")
+    assert json.loads(result.output)["reclaimed_bytes"] == 1
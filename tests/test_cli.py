@@ -1,9 +1,14 @@
 """Tests for CLI commands."""
 
+import time
+from unittest import mock
+
 import pytest
 from click.testing import CliRunner
 
 from proxmox_cli.cli import main
+from proxmox_cli.commands.top import compute_rates, top_guests
+from proxmox_cli.session import RequestStats
 
 
 def test_cli_version():
@@ -93,3 +98,167 @@ def test_storage_create_command():
     assert result.exit_code == 0
     assert "create" in result.output.lower()
     assert "storage" in result.output.lower()
+
+
+def test_vm_list_where_option():
+    """Test vm list rejects invalid --where expressions before connecting."""
+    runner = CliRunner()
+    result = runner.invoke(main, ["vm", "list", "--where", "status=="])
+    assert result.exit_code != 0
+    assert "where" in result.output.lower()
+
+
+def test_top_command():
+    """Test top command help."""
+    runner = CliRunner()
+    result = runner.invoke(main, ["top", "--help"])
+    assert result.exit_code == 0
+    assert "dashboard" in result.output.lower()
+
+
+def test_top_rates_and_ranking():
+    """Test rates come from sample deltas and top-k ordering."""
+    previous = {"qemu/100": {"netin": 1000, "diskread": 500}, "qemu/101": {"netin": 10}}
+    current = {
+        "qemu/100": {"id": "qemu/100", "netin": 3000, "diskread": 100, "cpu": 0.1},
+        "qemu/101": {"id": "qemu/101", "netin": 20, "cpu": 0.9},
+        "qemu/102": {"id": "qemu/102", "netin": 99999, "cpu": 0.5},
+    }
+    rows = {r["id"]: r for r in compute_rates(previous, current, elapsed=2)}
+    assert rows["qemu/100"]["netin_rate"] == 1000
+    assert rows["qemu/100"]["diskread_rate"] == 0  # counter reset
+    assert rows["qemu/102"]["netin_rate"] == 0  # no previous sample
+
+    assert [r["id"] for r in top_guests(rows.values(), "cpu", 2)] == ["qemu/101", "qemu/102"]
+    assert top_guests(rows.values(), "netin", 1)[0]["id"] == "qemu/100"
+
+
+def test_list_limit_offset():
+    """Test --offset/--limit slice list output."""
+    client = mock.Mock()
+    client.get_nodes.return_value = [{"node": f"pve{i}"} for i in range(5)]
+    runner = CliRunner()
+    with mock.patch("proxmox_cli.commands.node.get_proxmox_client", return_value=client):
+        result = runner.invoke(main, ["--offset", "1", "--limit", "2", "node", "list"])
+    assert result.exit_code == 0
+    assert '"pve1"' in result.output and '"pve2"' in result.output
+    assert '"pve0"' not in result.output and '"pve3"' not in result.output
+
+
+def test_list_csv_output():
+    """Test -o csv writes a header and one line per row."""
+    client = mock.Mock()
+    client.get_nodes.return_value = [{"node": "pve1", "status": "online"}]
+    runner = CliRunner()
+    with mock.patch("proxmox_cli.commands.node.get_proxmox_client", return_value=client):
+        result = runner.invoke(main, ["-o", "csv", "node", "list"])
+    assert result.exit_code == 0
+    assert result.output == "node,status\npve1,online\n"
+
+
+def test_image_info_finds_node():
+    """Test image info locates the template node when --node is omitted."""
+    client = mock.MagicMock()
+    client.get_nodes.return_value = [{"node": "pve1"}, {"node": "pve2"}]
+    client.api.nodes.return_value.qemu.get.side_effect = [
+        [{"vmid": 100, "template": 0}],
+        [{"vmid": 900, "template": 1}],
+    ]
+    client.api.nodes.return_value.qemu.return_value.config.get.return_value = {
+        "name": "debian-12",
+        "template": 1,
+        "memory": "2048",
+    }
+    runner = CliRunner()
+    with mock.patch("proxmox_cli.commands.image.get_proxmox_client", return_value=client):
+        result = runner.invoke(main, ["image", "info", "900"])
+    assert result.exit_code == 0
+    assert '"node": "pve2"' in result.output
+    assert '"name": "debian-12"' in result.output
+
+
+def test_token_list_all_users_summary():
+    """Test token list --all-users --summary counts tokens per user."""
+    now = int(time.time())
+    client = mock.Mock(stats=RequestStats())
+
+    def iter_tokens():
+        yield {"userid": "a@pve", "tokenid": "old", "expire": now - 60}
+        yield {"userid": "a@pve", "tokenid": "ci", "expire": now + 86400, "privsep": 0}
+        client.stats.incr("skipped_users")
+        yield {"userid": "b@pve", "tokenid": "ro", "expire": 0}
+
+    client.iter_tokens.side_effect = iter_tokens
+    runner = CliRunner()
+    with mock.patch("proxmox_cli.commands.token.get_proxmox_client", return_value=client):
+        result = runner.invoke(main, ["-o", "csv", "token", "list", "--all-users", "--summary"])
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == [
+        "userid,tokens,expired,expiring,no_expiry,no_privsep",
+        "a@pve,2,1,1,0,1",
+        "b@pve,1,0,0,1,0",
+        "TOTAL,3,1,1,1,1",
+    ]
+    assert "Skipped 1 user(s)" in result.stderr
+
+
+def test_token_list_requires_userid_or_all_users():
+    """Test token list exits with a usage error without USERID or --all-users."""
+    runner = CliRunner()
+    with mock.patch("proxmox_cli.commands.token.get_proxmox_client") as client:
+        result = runner.invoke(main, ["token", "list"])
+    assert result.exit_code == 2
+    assert "Give either USERID or --all-users" in result.output
+    client.assert_not_called()
+
+
+def test_pool_sync_batches_changes():
+    """Test pool sync adds and removes members in batched requests."""
+    client = mock.Mock()
+    client.get_cluster_resources.return_value = [
+        {"type": "qemu", "vmid": 100, "name": "web-1", "pool": "web"},
+        {"type": "qemu", "vmid": 101, "name": "web-2"},
+        {"type": "qemu", "vmid": 102, "name": "web-3", "pool": "other"},
+        {"type": "qemu", "vmid": 103, "name": "db-1", "pool": "web"},
+    ]
+    client.add_pool_members.return_value = 1
+    client.remove_pool_members.return_value = 1
+    runner = CliRunner()
+    with mock.patch("proxmox_cli.commands.pool.get_proxmox_client", return_value=client):
+        result = runner.invoke(main, ["pool", "sync", "web", "--name", "web-*"])
+    assert result.exit_code == 0
+    client.add_pool_members.assert_called_once_with("web", [101], allow_move=False)
+    client.remove_pool_members.assert_called_once_with("web", [103])
+    assert '"skipped": [\n    102\n  ]' in result.output
+
+
+def test_pool_list_usage_joins_cluster_resources():
+    """Test pool list --usage totals member usage from the resource snapshot."""
+    client = mock.Mock()
+    client.iter_pools.return_value = iter(
+        [
+            {
+                "poolid": "web",
+                "members": [
+                    {"id": "qemu/100", "type": "qemu", "vmid": 100},
+                    {"id": "lxc/101", "type": "lxc", "vmid": 101, "mem": 5, "maxmem": 10},
+                    {"id": "storage/pve1/nfs", "type": "storage", "storage": "nfs"},
+                    {"id": "storage/pve2/nfs", "type": "storage", "storage": "nfs"},
+                ],
+            }
+        ]
+    )
+    client.get_cluster_resources.return_value = [
+        {"id": "qemu/100", "status": "running", "cpu": 0.5, "maxcpu": 4, "mem": 1, "maxmem": 2},
+        {"id": "storage/pve1/nfs", "shared": 1, "disk": 30, "maxdisk": 100},
+        {"id": "storage/pve2/nfs", "shared": 1, "disk": 30, "maxdisk": 100},
+    ]
+    runner = CliRunner()
+    with mock.patch("proxmox_cli.commands.pool.get_proxmox_client", return_value=client):
+        result = runner.invoke(main, ["-o", "csv", "pool", "list", "--with-members", "--usage"])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [
+        "poolid,comment,guests,storages,running,cpu,maxcpu,mem,maxmem,disk,maxdisk,"
+        "storage_used,storage_total,members",
+        'web,,2,1,1,2.0,4,6,12,0,0,30,100,"100,101,nfs"',
+    ]
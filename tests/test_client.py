@@ -0,0 +1,333 @@
+"""Tests for the Proxmox API client wrapper."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+import requests
+
+from proxmox_cli.client import ProxmoxClient
+from proxmox_cli.session import (
+    CoalescingSession,
+    HttpxSession,
+    RateLimitedSession,
+    RequestStats,
+    RetryBudget,
+    RetryingSession,
+    classify_request,
+    configure_session,
+)
+from proxmox_cli.utils.filters import Filter
+
+
+@pytest.fixture
+def client():
+    """Client with a mocked proxmoxer API."""
+    with mock.patch("proxmox_cli.client.ProxmoxAPI") as api:
+        proxmox = ProxmoxClient("pve", "root@pam", password="secret", max_workers=4)
+    nodes = {
+        "pve1": [{"vmid": 100, "name": "db-1"}, {"vmid": 101, "name": "web-1"}],
+        "pve2": [{"vmid": 200, "name": "db-2"}],
+    }
+    api.return_value.nodes.get.return_value = [{"node": n} for n in nodes] + [{"node": "down"}]
+
+    def node(name):
+        resource = mock.MagicMock()
+        if name == "down":
+            resource.qemu.get.side_effect = ConnectionError("offline")
+        else:
+            resource.qemu.get.return_value = nodes[name]
+        resource.storage.get.return_value = [{"storage": "local", "type": "dir"}]
+        resource.storage.return_value.content.get.return_value = [
+            {"volid": f"local:vztmpl/{name}.tar.zst", "size": 1}
+        ]
+        return resource
+
+    api.return_value.nodes.side_effect = node
+    return proxmox
+
+
+def test_iter_vms_tags_nodes_and_skips_unreachable(client):
+    """Test concurrent VM iteration across nodes."""
+    vms = sorted(client.iter_vms(), key=lambda v: v["vmid"])
+
+    assert [(v["vmid"], v["node"]) for v in vms] == [(100, "pve1"), (101, "pve1"), (200, "pve2")]
+    assert sorted(v["vmid"] for v in client.iter_vms(where=Filter('name~"^db-"'))) == [100, 200]
+
+
+def test_iter_vms_raises_for_requested_node(client):
+    """Test errors propagate when a specific node was requested."""
+    with pytest.raises(ConnectionError):
+        list(client.iter_vms(node="down"))
+
+
+def test_iter_templates(client):
+    """Test templates are collected per node and storage."""
+    templates = client.get_container_templates(where=Filter("node==pve2"))
+
+    assert [t.template_name for t in templates] == ["pve2.tar.zst"]
+
+
+def test_iter_tokens_fetches_users_concurrently(client):
+    """Test tokens of every user are fetched and unreadable users skipped."""
+    client.api.access.users.get.return_value = [{"userid": "a@pve"}, {"userid": "b@pve"}]
+    tokens = {"a@pve": [{"tokenid": "ci"}, {"tokenid": "ro"}]}
+
+    def user(userid):
+        resource = mock.MagicMock()
+        if userid in tokens:
+            resource.token.get.return_value = [dict(t) for t in tokens[userid]]
+        else:
+            resource.token.get.side_effect = PermissionError("denied")
+        return resource
+
+    client.api.access.users.side_effect = user
+
+    assert sorted(t["id"] for t in client.iter_tokens()) == ["a@pve!ci", "a@pve!ro"]
+    assert client.stats.get("skipped_users") == 1
+    with pytest.raises(PermissionError):
+        client.get_tokens("b@pve")
+
+
+def test_pool_members_are_batched(client):
+    """Test pool member updates send POOL_MEMBER_BATCH ids per request."""
+    with mock.patch("proxmox_cli.client.POOL_MEMBER_BATCH", 2):
+        assert client.add_pool_members("web", [1, 2, 3], ["local"], allow_move=True) == 2
+        assert client.remove_pool_members("web", [4]) == 1
+
+    calls = client.api.pools.return_value.put.call_args_list
+    assert [c.kwargs for c in calls] == [
+        {"allow-move": 1, "vms": "1,2", "storage": "local"},
+        {"allow-move": 1, "vms": "3"},
+        {"delete": 1, "vms": "4"},
+    ]
+
+
+class FakeSession:
+    """Session recording requests and returning a fresh response per call."""
+
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        time.sleep(self.delay)
+        return mock.Mock(status_code=200, url=url)
+
+
+def test_coalescing_shares_concurrent_gets():
+    """Test identical in-flight GETs share one request."""
+    backend = FakeSession(delay=0.05)
+    session = CoalescingSession(backend, RequestStats())
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(pool.map(lambda _: session.request("GET", "/nodes"), range(4)))
+
+    assert len(backend.calls) == 1
+    assert all(r is responses[0] for r in responses)
+    assert session.stats.get("coalesced") == 3
+
+
+def test_coalescing_scope_reuses_until_write():
+    """Test back-to-back GETs share a response within a scope."""
+    backend = FakeSession()
+    session = CoalescingSession(backend, RequestStats())
+
+    session.request("GET", "/nodes")
+    session.request("GET", "/nodes")
+    assert len(backend.calls) == 2
+
+    with session.scope():
+        session.request("GET", "/nodes", params={"a": 1})
+        session.request("GET", "/nodes", params={"a": 1})
+        session.request("GET", "/nodes", params={"a": 2})
+        assert len(backend.calls) == 4
+
+        session.request("POST", "/pools", data={"poolid": "x"})
+        session.request("GET", "/nodes", params={"a": 1})
+        assert len(backend.calls) == 6
+
+
+def test_coalescing_nested_scopes_unwind_by_identity():
+    """Test leaving an empty inner scope restores the outer scope's memo."""
+    backend = FakeSession()
+    session = CoalescingSession(backend, RequestStats())
+
+    with session.scope():
+        with session.scope():
+            pass
+        session.request("GET", "/nodes")
+        session.request("GET", "/nodes")
+        with session.scope():
+            session.request("GET", "/nodes")
+        assert len(backend.calls) == 2
+    assert session._scopes == []
+
+
+def test_configure_session_reuses_connections():
+    """Test pooled keep-alive connections are reused and reported."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = b'{"data": []}'
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    session = requests.Session()
+    session.trust_env = False
+    try:
+        stats = RequestStats()
+        configure_session(session, stats, pool_size=2)
+        for _ in range(5):
+            session.get(f"http://127.0.0.1:{server.server_port}/api2/json/nodes", timeout=5)
+
+        assert stats.to_dict() == {"connections": 1, "pooled_requests": 5}
+    finally:
+        # Close the keep-alive connection so the handler thread can exit
+        session.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_iter_storage_content_raises_for_requested_storage(client):
+    """Test content errors propagate when node and storage were both requested."""
+    client.api.nodes.side_effect = None
+    resource = client.api.nodes.return_value
+    resource.storage.get.return_value = [{"storage": "local", "type": "dir"}]
+    resource.storage.return_value.content.get.side_effect = PermissionError("denied")
+
+    assert list(client.iter_storage_content(node="pve1")) == []
+    with pytest.raises(PermissionError):
+        list(client.iter_storage_content(node="pve1", storage="local"))
+    with pytest.raises(PermissionError):
+        client.get_container_templates(node="pve1", storage="local")
+
+
+def test_httpx_session_applies_proxmoxer_auth():
+    """Test the httpx transport sends proxmoxer's token header and decodes like requests."""
+    httpx = pytest.importorskip("httpx")
+    from proxmoxer.backends.https import ProxmoxHTTPApiTokenAuth
+
+    seen = {}
+
+    def handler(request):
+        seen["auth"] = request.headers["Authorization"]
+        seen["query"] = request.url.query
+        return httpx.Response(200, json={"data": [{"node": "pve1"}]})
+
+    base = requests.Session()
+    base.auth = ProxmoxHTTPApiTokenAuth("root@pam", "ci", "secret", verify_ssl=False, timeout=5)
+    stats = RequestStats()
+    session = HttpxSession(base, stats)
+    session.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    response = session.request("GET", "https://pve:8006/api2/json/nodes", params={"type": "vm"})
+
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"node": "pve1"}]
+    assert seen == {"auth": "PVEAPIToken=root@pam!ci=secret", "query": b"type=vm"}
+    assert stats.to_dict() == {"http1_1": 1}
+
+
+class FlakySession:
+    """Session failing with the given outcomes before succeeding."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else 200
+        if isinstance(outcome, Exception):
+            raise outcome
+        return mock.Mock(status_code=outcome, headers={})
+
+
+def test_retrying_session_retries_idempotent_requests():
+    """Test GETs are retried on connection errors and gateway errors with backoff."""
+    backend = FlakySession(requests.ConnectionError("reset"), 503)
+    delays = []
+    session = RetryingSession(backend, RequestStats(), retries=3, sleep=delays.append)
+
+    assert session.request("GET", "/nodes").status_code == 200
+    assert backend.calls == 3
+    assert session.stats.get("retries") == 2
+    assert len(delays) == 2 and all(0 <= d <= 0.4 for d in delays)
+
+    # pveproxy reports API errors as 500; those are not retried
+    backend = FlakySession(500)
+    session = RetryingSession(backend, RequestStats(), sleep=delays.append)
+    assert session.request("GET", "/nodes/pve1/qemu/100/config").status_code == 500
+    assert backend.calls == 1
+
+
+def test_retrying_session_never_replays_writes():
+    """Test POSTs are sent once even when they fail."""
+    backend = FlakySession(requests.ConnectionError("reset"))
+    session = RetryingSession(backend, RequestStats(), sleep=lambda _: None)
+
+    with pytest.raises(requests.ConnectionError):
+        session.request("POST", "/nodes/pve1/qemu/100/status/start")
+    assert backend.calls == 1
+
+
+def test_retry_budget_is_shared():
+    """Test retries stop once the shared budget is spent."""
+    budget = RetryBudget(1)
+    stats = RequestStats()
+    first = RetryingSession(FlakySession(503, 503), stats, budget=budget, sleep=lambda _: None)
+    second = RetryingSession(FlakySession(503), stats, budget=budget, sleep=lambda _: None)
+
+    assert first.request("GET", "/a").status_code == 503
+    assert second.request("GET", "/b").status_code == 503
+    assert stats.get("retries") == 1
+    assert stats.get("retry_budget_exhausted") == 2
+
+
+def test_classify_request():
+    """Test requests are classified as read, write or task-spawning."""
+    base = "https://pve:8006/api2/json"
+    assert classify_request("GET", f"{base}/nodes/pve1/qemu") == "read"
+    assert classify_request("POST", f"{base}/nodes/pve1/qemu/100/status/start") == "task"
+    assert classify_request("POST", f"{base}/nodes/pve1/qemu/100/config") == "write"
+    assert classify_request("PUT", f"{base}/pools/ops") == "write"
+    assert classify_request("POST", f"{base}/access/users") == "write"
+
+
+def test_rate_limited_session_paces_per_class_and_node():
+    """Test token buckets delay requests beyond the configured rates."""
+    delays = []
+    session = RateLimitedSession(
+        FakeSession(), RequestStats(), {"write": 2, "node_task": 1}, sleep=delays.append
+    )
+    base = "https://pve:8006/api2/json"
+
+    for _ in range(3):
+        session.request("PUT", f"{base}/pools/ops")
+    assert len(delays) == 1 and 0.4 < delays[0] <= 0.5
+
+    session.request("POST", f"{base}/nodes/pve1/qemu/100/status/start")
+    session.request("POST", f"{base}/nodes/pve2/qemu/200/status/start")
+    session.request("GET", f"{base}/nodes/pve1/qemu")
+    assert len(delays) == 1
+    session.request("POST", f"{base}/nodes/pve1/qemu/101/status/start")
+    assert len(delays) == 2 and 0.9 < delays[1] <= 1.0
+    assert session.stats.get("throttled") == 2
+
+    with pytest.raises(ValueError):
+        RateLimitedSession(FakeSession(), RequestStats(), {"writes": 1})
@@ -0,0 +1,111 @@
+"""Tests for inventory-backed shell completion."""
+
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from click.shell_completion import ShellComplete
+
+from proxmox_cli import inventory as inventory_module
+from proxmox_cli.cli import main
+from proxmox_cli.inventory import KINDS, Inventory
+
+RESOURCES = [
+    {"type": "qemu", "vmid": 101, "name": "db"},
+    {"type": "qemu", "vmid": 100, "name": "web"},
+    {"type": "qemu", "vmid": 2000, "name": "batch"},
+    {"type": "lxc", "vmid": 200, "name": "proxy"},
+    {"type": "node", "node": "pve1", "status": "online"},
+    {"type": "storage", "storage": "local", "plugintype": "dir"},
+]
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Point the inventory at a temporary cache directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return tmp_path / "proxmox-cli"
+
+
+def complete(args, incomplete):
+    """Get completion values for a partial command line."""
+    completer = ShellComplete(main, {}, "proxmox-cli", "_PROXMOX_CLI_COMPLETE")
+    return [item.value for item in completer.get_completions(args, incomplete)]
+
+
+def test_completion_reads_recorded_inventory(cache, monkeypatch):
+    """Test ids recorded from listings are offered without calling the API."""
+    inventory = Inventory()
+    inventory.record_resources(RESOURCES, None)
+    inventory.update({kind: {} for kind in ("user", "role", "template")})
+    monkeypatch.setattr(
+        Inventory, "refresh_in_background", lambda *a, **k: pytest.fail("refresh started")
+    )
+
+    assert complete(["vm", "start"], "1") == ["100", "101"]
+    assert complete(["vm", "start"], "") == ["100", "101", "2000"]
+    assert complete(["container", "start"], "") == ["200"]
+    assert complete(["vm", "start", "100", "--node"], "p") == ["pve1"]
+    assert complete(["storage", "create", "x", "--nodes"], "a,p") == ["a,pve1"]
+
+
+def test_concurrent_inventory_updates_keep_every_kind(cache, monkeypatch):
+    """Test listings recorded from parallel threads do not overwrite each other."""
+    load = Inventory.load
+
+    def slow_load(self):
+        data = load(self)
+        time.sleep(0.01)
+        return data
+
+    monkeypatch.setattr(Inventory, "load", slow_load)
+    with ThreadPoolExecutor(len(KINDS)) as pool:
+        list(pool.map(lambda kind: Inventory().update({kind: {kind: None}}), KINDS))
+
+    data = Inventory().load()
+    assert {kind: list(Inventory().items(kind, data)) for kind in KINDS} == {
+        kind: [kind] for kind in KINDS
+    }
+    assert not list(cache.glob("*.tmp"))
+
+
+def test_stale_inventory_refreshes_in_background_once(cache, monkeypatch):
+    """Test a missing inventory starts one detached refresh and returns at once."""
+    started = []
+    monkeypatch.setattr(inventory_module.subprocess, "Popen", lambda cmd, **k: started.append(cmd))
+
+    assert complete(["vm", "start"], "") == []
+    assert complete(["vm", "start"], "") == []
+    assert len(started) == 1
+    assert started[0][1:3] == ["-m", "proxmox_cli.inventory"]
+    assert not Inventory().is_stale({k: {"updated": 1e12} for k in KINDS})
+
+
+def test_completion_does_not_import_http_stack(cache):
+    """Test completing a command imports neither the client nor the HTTP libraries."""
+    code = (
+        "import sys\n"
+        "from proxmox_cli.cli import main\n"
+        "try:\n"
+        "    main(prog_name='proxmox-cli')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print([m for m in ('proxmox_cli.client', 'proxmoxer', 'requests', 'yaml')"
+        " if m in sys.modules])\n"
+    )
+    env = dict(
+        os.environ,
+        COMP_WORDS="proxmox-cli vm start 1",
+        COMP_CWORD="3",
+        _PROXMOX_CLI_COMPLETE="bash_complete",
+    )
+    # Keep the background refresh from touching the network
+    (cache).mkdir(parents=True)
+    (cache / "inventory-default.refresh").touch()
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=30
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
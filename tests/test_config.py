@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+from proxmox_cli import config as config_module
 from proxmox_cli.config import Config
 
 
@@ -28,3 +29,84 @@ def test_config_nested_keys():
     config = Config()
     config.set("level1.level2.level3", "nested_value")
     assert config.get("level1.level2.level3") == "nested_value"
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the compiled config cache at a temporary directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr(config_module, "_compiled", {})
+    return tmp_path / "cache" / "proxmox-cli"
+
+
+def test_config_cluster_profiles(tmp_path, cache_dir):
+    """Test cluster profiles overlay the proxmox section."""
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "proxmox:\n  user: root@pam\n  verify_ssl: false\n"
+        "clusters:\n  lab:\n    host: lab.example\n  prod:\n    host: prod.example\n"
+    )
+    config = Config(str(path))
+
+    assert config.cluster_names() == ["lab", "prod"]
+    assert config.cluster("prod") == {
+        "user": "root@pam",
+        "verify_ssl": False,
+        "host": "prod.example",
+    }
+    with pytest.raises(KeyError):
+        config.cluster("missing")
+
+
+def test_config_warm_start_skips_yaml(tmp_path, cache_dir, monkeypatch):
+    """Test a second load reads the compiled snapshot instead of parsing YAML."""
+    path = tmp_path / "config.yaml"
+    path.write_text("proxmox:\n  host: pve.example\nhttp:\n  timeout: 10\n")
+    Config(str(path))
+    assert len(list(cache_dir.glob("config-*.json"))) == 1
+
+    monkeypatch.setattr(config_module, "_compiled", {})
+    monkeypatch.setattr(Config, "_parse", lambda self: pytest.fail("YAML parsed on warm start"))
+    config = Config(str(path))
+    assert config.get("proxmox.host") == "pve.example"
+    assert config.get("http") == {"timeout": 10}
+
+    # A changed file (new size) is parsed again
+    monkeypatch.undo()
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_dir.parent))
+    path.write_text("proxmox:\n  host: other.example\n")
+    assert Config(str(path)).get("proxmox.host") == "other.example"
+
+
+def test_config_env_overlay(tmp_path, cache_dir, monkeypatch):
+    """Test PROXMOX_CLI_* variables override keys without being saved."""
+    path = tmp_path / "config.yaml"
+    path.write_text("proxmox:\n  host: pve.example\nclusters:\n  lab: {}\n")
+    monkeypatch.setenv("PROXMOX_CLI_HTTP__TIMEOUT", "5")
+    monkeypatch.setenv("PROXMOX_CLI_PROXMOX__HOST", "env.example")
+
+    config = Config(str(path))
+    assert config.get("http.timeout") == 5
+    assert config.cluster("lab")["host"] == "env.example"
+
+    config.save()
+    assert "env.example" not in path.read_text()
+
+
+def test_config_env_overlay_keeps_secrets_out_of_cache(tmp_path, cache_dir, monkeypatch):
+    """Test env credentials stay strings and are never written to the cache."""
+    path = tmp_path / "config.yaml"
+    path.write_text("proxmox:\n  host: pve.example\n")
+    monkeypatch.setenv("PROXMOX_CLI_PROXMOX__PASSWORD", "hunter2")
+    monkeypatch.setenv("PROXMOX_CLI_PROXMOX__TOKEN_VALUE", "1e3")
+    monkeypatch.setenv("PROXMOX_CLI_PROXMOX__USER", "true")
+    monkeypatch.setenv("PROXMOX_CLI_PROXMOX__VERIFY_SSL", "false")
+
+    config = Config(str(path))
+    assert config.get("proxmox.token_value") == "1e3"
+    assert config.get("proxmox.user") == "true"
+    assert config.get("proxmox.verify_ssl") is False
+
+    text = next(cache_dir.glob("config-*.json")).read_text()
+    assert "hunter2" not in text and "1e3" not in text
+    assert not any("hunter2" in str(key) for key in config_module._compiled)
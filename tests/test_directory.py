@@ -0,0 +1,49 @@
+"""Tests for expanded user and group listings."""
+
+from unittest import mock
+
+from proxmox_cli.directory import Directory, fetch_directory
+from proxmox_cli.session import RequestStats
+
+
+def test_directory_joins_both_membership_sides():
+    """Test memberships from the user and group listings are merged."""
+    users = [
+        {"userid": "alice@pve", "groups": "ops", "tokens": [{"tokenid": "ci"}]},
+        {"userid": "bob@pve", "groups": []},
+    ]
+    groups = [{"groupid": "ops", "users": "bob@pve"}, {"groupid": "empty"}]
+    directory = Directory(users, groups)
+
+    assert [(u["userid"], u["groups"], u["tokens"]) for u in directory.user_rows()] == [
+        ("alice@pve", "ops", "ci"),
+        ("bob@pve", "ops", ""),
+    ]
+    assert [(g["groupid"], g["count"], g["users"]) for g in directory.group_rows()] == [
+        ("empty", 0, ""),
+        ("ops", 2, "alice@pve,bob@pve"),
+    ]
+
+
+def test_fetch_directory_falls_back_to_user_reads():
+    """Test bare user listings are expanded with concurrent per-user reads."""
+    client = mock.MagicMock()
+    client.stats = RequestStats()
+    client.get_users.return_value = [{"userid": "alice@pve"}, {"userid": "bob@pve"}]
+    client.api.access.groups.get.return_value = [{"groupid": "ops"}]
+
+    def user(userid):
+        resource = mock.MagicMock()
+        if userid == "bob@pve":
+            resource.get.side_effect = PermissionError("denied")
+        else:
+            resource.get.return_value = {"groups": ["ops"], "tokens": {"ci": {"privsep": 1}}}
+        return resource
+
+    client.api.access.users.side_effect = user
+    rows = {u["userid"]: u for u in fetch_directory(client, 4).user_rows()}
+
+    client.get_users.assert_called_once_with(full=True)
+    assert (rows["alice@pve"]["groups"], rows["alice@pve"]["tokens"]) == ("ops", "ci")
+    assert rows["bob@pve"]["groups"] == ""
+    assert client.stats.get("skipped_users") == 1
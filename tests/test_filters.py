@@ -0,0 +1,48 @@
+"""Tests for the --where filter expression engine."""
+
+import pytest
+
+from proxmox_cli.utils.filters import FilterError, compile_filter
+
+
+def test_filter_comparisons():
+    """Test basic comparison operators and size units."""
+    vm = {"name": "db-01", "status": "running", "maxmem": 16 * 1024**3, "cpu": 0.25}
+    assert compile_filter("status==running")(vm) is True
+    assert compile_filter("status!=running")(vm) is False
+    assert compile_filter("maxmem>8G")(vm) is True
+    assert compile_filter("maxmem<=8G")(vm) is False
+    assert compile_filter("cpu>=0.25")(vm) is True
+    assert compile_filter('name~"^db-"')(vm) is True
+    assert compile_filter('name!~"^db-"')(vm) is False
+
+
+def test_filter_boolean_logic():
+    """Test and/or/not with parentheses."""
+    where = compile_filter("status==running and (name~web or not maxmem>1G)")
+    assert where({"status": "running", "name": "web-1", "maxmem": 4 * 1024**3}) is True
+    assert where({"status": "running", "name": "db-1", "maxmem": 512 * 1024**2}) is True
+    assert where({"status": "stopped", "name": "web-1", "maxmem": 0}) is False
+
+
+def test_filter_missing_field():
+    """Test that missing fields never satisfy positive comparisons."""
+    where = compile_filter("maxmem>1G")
+    assert where({}) is False
+
+
+def test_filter_matches_node():
+    """Test node-level pruning only skips nodes that cannot match."""
+    where = compile_filter("node==pve1 and status==running")
+    assert where.matches_node("pve1") is True
+    assert where.matches_node("pve2") is False
+    assert compile_filter("node==pve1 or status==running").matches_node("pve2") is True
+    assert compile_filter("not node==pve1").matches_node("pve1") is False
+
+
+def test_filter_syntax_errors():
+    """Test invalid expressions raise FilterError."""
+    assert compile_filter(None) is None
+    for expression in ["", "status==", "maxmem>big", "(status==running", 'name~"["']:
+        with pytest.raises(FilterError):
+            compile_filter(expression)
@@ -0,0 +1,45 @@
+"""Tests for record models."""
+
+from proxmox_cli.models import Guest, Node, Template, resource_from_api
+
+
+def test_guest_behaves_like_mapping():
+    """Test records support the mapping protocol, including unknown keys."""
+    guest = Guest.from_api({"vmid": 100, "name": "db-1", "maxmem": 1024, "custom": "x"})
+
+    assert guest["vmid"] == 100
+    assert guest.get("status") is None
+    assert guest["custom"] == "x"
+    assert dict(guest) == {"vmid": 100, "name": "db-1", "maxmem": 1024, "custom": "x"}
+
+    guest.setdefault("node", "pve1")
+    del guest["custom"]
+    assert guest.to_dict() == {"vmid": 100, "name": "db-1", "node": "pve1", "maxmem": 1024}
+
+
+def test_guest_rows():
+    """Test guest list and template row formatting."""
+    guest = Guest({"vmid": 900, "name": "tpl", "template": 1, "maxmem": 2 * 1024**3})
+
+    assert guest.is_template
+    assert guest.list_row()["template"] == "yes"
+    assert guest.template_row()["memory"] == "2.00GB"
+
+
+def test_template_name_and_resource_dispatch():
+    """Test template names and cluster resource model selection."""
+    template = Template(volid="local:vztmpl/debian-12.tar.zst", size=1024**2)
+
+    assert template.template_name == "debian-12.tar.zst"
+    assert template.list_row()["size"] == "1.00MB"
+    assert isinstance(resource_from_api({"type": "node", "node": "pve1"}), Node)
+    assert resource_from_api({"type": "sdn", "sdn": "zone"}) == {"type": "sdn", "sdn": "zone"}
+
+
+def test_dashed_api_fields_use_slots():
+    """Test API keys with dashes are stored in slots, not the extra dict."""
+    guest = Guest.from_api({"vmid": 100, "running-qemu": "8.1.5", "qmpstatus": "running"})
+
+    assert guest["running-qemu"] == "8.1.5"
+    assert guest._extra is None
+    assert list(guest) == ["vmid", "qmpstatus", "running-qemu"]
@@ -0,0 +1,75 @@
+"""Tests for the multi-cluster client."""
+
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import pytest
+
+from proxmox_cli.models import Guest
+from proxmox_cli.multicluster import MultiClusterClient, MultiClusterError
+from proxmox_cli.session import RequestStats
+
+
+def fake_client(vms):
+    """Build a client double returning the given VM records."""
+    client = MagicMock()
+    client.stats = RequestStats()
+    client.get_vms.side_effect = lambda **kwargs: [Guest(vm) for vm in vms]
+    client.iter_vms.side_effect = lambda **kwargs: iter([Guest(vm) for vm in vms])
+    client.api.cluster.resources.get.return_value = [dict(vm) for vm in vms]
+    client.api.version.get.return_value = {"version": "8.2"}
+
+    @contextmanager
+    def scope():
+        yield
+
+    client.request_scope.side_effect = scope
+    return client
+
+
+def test_merged_listing_tags_records_with_cluster():
+    """Test listings from several clusters are merged and tagged."""
+    multi = MultiClusterClient(
+        {
+            "lab": lambda: fake_client([{"vmid": 100, "name": "a"}]),
+            "prod": lambda: fake_client([{"vmid": 100, "name": "b"}, {"vmid": 101}]),
+        }
+    )
+
+    vms = multi.get_vms()
+    assert sorted((vm["cluster"], vm["vmid"]) for vm in vms) == [
+        ("lab", 100),
+        ("prod", 100),
+        ("prod", 101),
+    ]
+    assert vms[0].list_row()["cluster"] in ("lab", "prod")
+    assert len(list(multi.iter_vms())) == 3
+    assert len(multi.api.cluster.resources.get(type="vm")) == 3
+
+
+def test_failed_cluster_is_skipped():
+    """Test an unreachable cluster is skipped unless every cluster fails."""
+    broken = fake_client([])
+    broken.get_vms.side_effect = ConnectionError("unreachable")
+    multi = MultiClusterClient(
+        {"lab": lambda: fake_client([{"vmid": 100}]), "prod": lambda: broken}
+    )
+
+    assert [vm["cluster"] for vm in multi.get_vms()] == ["lab"]
+    assert multi.stats.get("skipped_clusters") == 1
+
+    only_broken = MultiClusterClient({"prod": lambda: broken})
+    with pytest.raises(ConnectionError):
+        only_broken.get_vms()
+
+
+def test_single_object_requests_need_one_cluster():
+    """Test endpoints returning one object or changing state are refused."""
+    multi = MultiClusterClient({"lab": lambda: fake_client([]), "prod": lambda: fake_client([])})
+
+    with pytest.raises(MultiClusterError):
+        multi.api.version.get()
+    with pytest.raises(MultiClusterError):
+        multi.api.nodes("pve").qemu.post(vmid=100)
+    with pytest.raises(MultiClusterError):
+        multi.create_container("pve", 100, "tmpl")
@@ -0,0 +1,70 @@
+"""Tests for effective permission resolution."""
+
+import time
+
+from proxmox_cli.permissions import PermissionResolver
+
+ROLES = [
+    {"roleid": "PVEAuditor", "privs": "Sys.Audit,VM.Audit"},
+    {"roleid": "PVEVMUser", "privs": "VM.Audit,VM.Console,VM.PowerMgmt"},
+    {"roleid": "NoAccess", "privs": ""},
+    {"roleid": "Administrator", "privs": "Sys.Audit,VM.Audit,VM.Console,VM.PowerMgmt,VM.Allocate"},
+]
+
+USERS = [
+    {"userid": "alice@pve", "groups": ["ops"], "tokens": [{"tokenid": "ci", "privsep": 1}]},
+    {"userid": "bob@pve", "groups": "ops,dev"},
+    {"userid": "carol@pve", "tokens": [{"tokenid": "full", "privsep": 0}]},
+]
+
+ACL = [
+    {"path": "/", "type": "group", "ugid": "ops", "roleid": "PVEAuditor", "propagate": 1},
+    {"path": "/vms", "type": "user", "ugid": "alice@pve", "roleid": "PVEVMUser", "propagate": 1},
+    {"path": "/vms/100", "type": "user", "ugid": "bob@pve", "roleid": "NoAccess", "propagate": 1},
+    {"path": "/nodes", "type": "group", "ugid": "dev", "roleid": "PVEVMUser", "propagate": 0},
+    {"path": "/pool/prod", "type": "user", "ugid": "carol@pve", "roleid": "PVEVMUser"},
+    {"path": "/vms", "type": "token", "ugid": "alice@pve!ci", "roleid": "Administrator"},
+]
+
+
+def resolver():
+    """Build a resolver over the sample data."""
+    return PermissionResolver(ACL, USERS, ROLES, guest_pools={"200": "prod"})
+
+
+def test_inheritance_override_and_no_access():
+    """Test propagation, user-over-group precedence and NoAccess."""
+    r = resolver()
+
+    assert r.effective("alice@pve", "/")[0] == {"PVEAuditor"}
+    # A user ACL on /vms replaces the group role inherited from /
+    assert r.effective("alice@pve", "/vms/100")[0] == {"PVEVMUser"}
+    assert r.effective("bob@pve", "/vms/101")[1] == {"Sys.Audit", "VM.Audit"}
+    assert r.effective("bob@pve", "/vms/100") == (frozenset(), frozenset())
+    # Non-propagating entries only apply to their own path
+    assert "PVEVMUser" in r.effective("bob@pve", "/nodes")[0]
+    assert r.effective("bob@pve", "/nodes/pve1")[0] == {"PVEAuditor"}
+
+
+def test_pool_and_token_permissions():
+    """Test pool inheritance for guests and token privilege separation."""
+    r = resolver()
+
+    assert r.effective("carol@pve", "/vms/200")[0] == {"PVEVMUser"}
+    assert r.effective("carol@pve", "/vms/201")[0] == set()
+    assert r.effective("carol@pve!full", "/vms/200") == r.effective("carol@pve", "/vms/200")
+    # A privilege-separated token is capped by its user's privileges
+    roles, privileges = r.effective("alice@pve!ci", "/vms/100")
+    assert roles == {"Administrator"}
+    assert privileges == {"VM.Audit", "VM.Console", "VM.PowerMgmt"}
+    assert r.effective("root@pam", "/vms/1")[1] == r.all_privileges
+
+
+def test_bulk_queries_are_local():
+    """Test thousands of queries resolve quickly from the trie."""
+    r = resolver()
+    started = time.perf_counter()
+    for vmid in range(5000):
+        r.effective("bob@pve", f"/vms/{vmid}")
+    assert time.perf_counter() - started < 1.0
+    assert r.principals() == ["alice@pve", "alice@pve!ci", "bob@pve", "carol@pve", "carol@pve!full"]
@@ -0,0 +1,123 @@
+"""Tests for the declarative state planner."""
+
+from unittest.mock import MagicMock
+
+from proxmox_cli.state import (
+    PHASE_CONTAINERS,
+    PHASE_GRANT,
+    PHASE_TOKENS,
+    apply_plan,
+    fetch_current,
+    plan,
+)
+
+CURRENT = {
+    "users": {
+        "alice@pve": {"userid": "alice@pve", "email": "a@example.com", "groups": ["ops"]},
+        "root@pam": {"userid": "root@pam"},
+        "old@pve": {"userid": "old@pve", "tokens": [{"tokenid": "ci", "privsep": 1}]},
+    },
+    "groups": [{"groupid": "ops", "comment": "Operators"}],
+    "roles": [
+        {"roleid": "PVEAuditor", "privs": "Sys.Audit,VM.Audit", "special": 1},
+        {"roleid": "Backup", "privs": "VM.Backup"},
+    ],
+    "acl": [
+        {"path": "/", "type": "group", "ugid": "ops", "roleid": "PVEAuditor", "propagate": 1},
+        {"path": "/vms", "type": "user", "ugid": "old@pve", "roleid": "Backup", "propagate": 1},
+    ],
+    "pools": [{"poolid": "prod"}],
+    "members": {"prod": [{"type": "qemu", "vmid": 100}, {"type": "qemu", "vmid": 101}]},
+    "reads": 6,
+}
+
+DESIRED = {
+    "groups": {"ops": {"comment": "Operators"}, "dev": {"comment": "Developers"}},
+    "roles": {"Backup": {"privs": ["VM.Backup", "Datastore.AllocateSpace"]}},
+    "pools": {"prod": {"vms": [100, 102, 103]}},
+    "users": {
+        "alice@pve": {"email": "a@example.com", "groups": ["ops", "dev"]},
+        "bob@pve": {"groups": "dev", "tokens": {"ci": {"privsep": False}}},
+    },
+    "acl": [
+        {"path": "/", "roles": "PVEAuditor", "groups": "ops"},
+        {"path": "/pool/prod", "roles": ["PVEVMUser"], "users": ["alice@pve", "bob@pve"]},
+    ],
+}
+
+
+def test_plan_sends_only_missing_changes():
+    """Test the planner diffs every section and batches changes."""
+    actions = plan(DESIRED, CURRENT)
+    summaries = [a.summary for a in actions]
+
+    assert "create group dev" in summaries
+    assert "set privileges of role Backup" in summaries
+    assert "update user alice@pve (groups)" in summaries
+    assert "create user bob@pve" in summaries
+    # Pool members: one PUT adding, one PUT removing
+    pool_calls = [a for a in actions if a.path == "pools/prod"]
+    assert [a.params for a in pool_calls] == [{"vms": "102,103"}, {"vms": "101", "delete": 1}]
+    # Both users get the same role on the same path: one ACL call
+    grants = [a for a in actions if a.phase == PHASE_GRANT]
+    assert len(grants) == 1
+    assert grants[0].params["users"] == "alice@pve,bob@pve"
+    assert [a.phase for a in actions] == sorted(a.phase for a in actions)
+    assert len(actions) == 8
+
+    # Applying the same state again is a no-op apart from unmanaged objects
+    assert not any("old@pve" in s or "group ops" in s for s in summaries)
+
+
+def test_plan_prune_deletes_unlisted_objects():
+    """Test --prune removes unlisted objects but never built-ins or root@pam."""
+    summaries = [a.summary for a in plan(DESIRED, CURRENT, prune=True)]
+
+    assert "delete user old@pve" in summaries
+    assert "revoke Backup on /vms to old@pve" in summaries
+    assert "delete user root@pam" not in summaries
+    assert not any("PVEAuditor" in s and "delete" in s for s in summaries)
+
+
+def test_fetch_and_apply_run_phases_in_order():
+    """Test current state is read in bulk and phases run in dependency order."""
+    client = MagicMock()
+    client.get_users.return_value = [{"userid": "alice@pve"}]
+    client.get_roles.return_value = []
+    client.get_pools.return_value = [{"poolid": "prod"}]
+    client.get_pool.return_value = {"members": [{"type": "qemu", "vmid": 100}]}
+    client.api.access.groups.get.return_value = []
+    client.api.access.acl.get.return_value = []
+
+    current = fetch_current(client, DESIRED, max_workers=4)
+    assert current["reads"] == 6
+    client.get_users.assert_called_once_with(full=True)
+
+    calls = []
+    client.api.side_effect = lambda path: MagicMock(
+        post=lambda **p: calls.append(("post", path)),
+        put=lambda **p: calls.append(("put", path)),
+    )
+    actions = plan(DESIRED, current)
+    results = apply_plan(client, actions, max_workers=4)
+
+    assert all(r["success"] for r in results) and len(calls) == len(actions)
+    phases = {a.path: a.phase for a in actions}
+    assert phases["access/groups"] == PHASE_CONTAINERS
+    assert phases["access/users/bob@pve/token/ci"] == PHASE_TOKENS
+    assert calls.index(("post", "access/groups")) < calls.index(("put", "access/acl"))
+
+
+def test_apply_stops_after_failed_phase():
+    """Test a failure stops later phases from running."""
+    client = MagicMock()
+
+    def api(path):
+        resource = MagicMock()
+        resource.post.side_effect = RuntimeError("denied") if path == "access/groups" else None
+        return resource
+
+    client.api.side_effect = api
+    results = apply_plan(client, plan({"groups": {"dev": {}}, "acl": DESIRED["acl"]}, CURRENT))
+
+    assert [r["success"] for r in results] == [False]
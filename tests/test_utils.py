@@ -1,14 +1,23 @@
 """Tests for utility functions."""
 
+import io
+
 import pytest
 
+from proxmox_cli.utils.aggregate import AggregateError, Aggregator, parse_aggregates
+from proxmox_cli.utils.concurrency import fan_in, fan_out
+from proxmox_cli.utils.filters import compile_filter
 from proxmox_cli.utils.helpers import (
     format_size,
     format_uptime,
     parse_size,
+    split_list,
     validate_ip,
     validate_vmid,
 )
+from proxmox_cli.utils.output import StreamingTable, write_delimited
+from proxmox_cli.utils.selectors import GuestSelector, parse_ids
+from proxmox_cli.utils.watch import diff_snapshots, poll_changes
 
 
 def test_validate_vmid():
@@ -49,3 +58,174 @@ def test_format_uptime():
     assert format_uptime(90) == "1m 30s"
     assert format_uptime(3661) == "1h 1m 1s"
     assert format_uptime(86400) == "1d"
+
+
+def test_split_list():
+    """Test lists and comma-separated strings normalise to the same list."""
+    assert split_list("a, b,,c") == ["a", "b", "c"]
+    assert split_list(["a", 1]) == ["a", "1"]
+    assert split_list(None) == split_list("") == split_list([]) == []
+
+
+def test_aggregate_group_by():
+    """Test one-pass grouped aggregation."""
+    records = [
+        {"node": "pve1", "mem": 100, "cpu": 0.5, "tags": "db;prod"},
+        {"node": "pve1", "mem": 300, "cpu": 0.1, "tags": "web"},
+        {"node": "pve2", "mem": 50, "cpu": 0.9},
+    ]
+    aggregates = parse_aggregates("sum(mem),count(),max(cpu)")
+    rows = Aggregator(aggregates, "node").consume(records).rows()
+    assert rows == [
+        {"node": "pve1", "sum(mem)": 400, "count()": 2, "max(cpu)": 0.5},
+        {"node": "pve2", "sum(mem)": 50, "count()": 1, "max(cpu)": 0.9},
+    ]
+
+    tag_rows = Aggregator([("count", None)], "tag").consume(records).rows()
+    assert [(r["tag"], r["count()"]) for r in tag_rows] == [
+        ("db", 1),
+        ("prod", 1),
+        ("web", 1),
+        ("-", 1),
+    ]
+
+
+def test_parse_aggregates_invalid():
+    """Test invalid aggregate specifications."""
+    for spec in ["", "median(mem)", "sum()", "mem"]:
+        with pytest.raises(AggregateError):
+            parse_aggregates(spec)
+
+
+def test_diff_snapshots():
+    """Test added/changed/removed detection between snapshots."""
+    previous = {1: {"status": "running"}, 2: {"status": "stopped"}}
+    current = {1: {"status": "stopped"}, 3: {"status": "running"}}
+    assert sorted(diff_snapshots(previous, current)) == [
+        ("added", 3, {"status": "running"}),
+        ("changed", 1, {"status": "stopped"}),
+        ("removed", 2, {"status": "stopped"}),
+    ]
+    assert diff_snapshots(current, current) == []
+
+
+def test_poll_changes_keeps_snapshot_on_error():
+    """Test a failed poll yields no events and keeps the previous snapshot."""
+    responses = [[{"id": 1}], RuntimeError("boom"), [{"id": 1}, {"id": 2}]]
+    errors = []
+
+    def fetch():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    ticks = list(
+        poll_changes(
+            fetch,
+            key=lambda r: r["id"],
+            interval=1,
+            max_ticks=3,
+            sleep=lambda s: None,
+            on_error=errors.append,
+        )
+    )
+    assert [[e[:2] for e in tick] for tick in ticks] == [[("added", 1)], [], [("added", 2)]]
+    assert len(errors) == 1
+
+
+def test_streaming_table_fixed_widths():
+    """Test streamed tables size columns from the sample and truncate the rest."""
+    out = io.StringIO()
+    rows = [{"vmid": 100, "name": "web"}, {"vmid": 101, "name": "a-very-long-database-name"}]
+    table = StreamingTable(["vmid", "name"], rows[:1], page_size=1, max_width=10, file=out)
+    assert table.print_rows(iter(rows)) == 2
+
+    lines = out.getvalue().splitlines()
+    assert lines[0].split() == ["VMID", "NAME"]
+    assert lines[2].split() == ["100", "web"]
+    # Header is repeated for each page; only cells beyond max_width are cut
+    assert lines[4].split() == ["VMID", "NAME"]
+    assert lines[6].split() == ["101", "a-very-lo…"]
+
+
+def test_write_delimited_streams_rows():
+    """Test CSV/TSV writing with a fixed header from the first row."""
+    out = io.StringIO()
+    rows = (r for r in [{"vmid": 100, "name": "a,b"}, {"name": "c", "vmid": 101, "extra": 1}])
+    assert write_delimited(rows, ",", out) == 2
+    assert out.getvalue() == 'vmid,name\n100,"a,b"\n101,c\n'
+
+    out = io.StringIO()
+    write_delimited([{"vmid": 100, "tags": None, "groups": ["x"]}], "\t", out)
+    assert out.getvalue() == 'vmid\ttags\tgroups\n100\t\t"[""x""]"\n'
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_fan_out_collects_results_and_errors(max_workers):
+    """Test fan-out yields every item with its result or error."""
+
+    def square(n):
+        if n == 3:
+            raise RuntimeError("boom")
+        return n * n
+
+    results = {
+        item: (result, error) for item, result, error in fan_out(square, range(5), max_workers)
+    }
+
+    assert sorted(results) == [0, 1, 2, 3, 4]
+    assert results[4] == (16, None)
+    assert isinstance(results[3][1], RuntimeError)
+
+
+def test_fan_out_pulls_items_lazily():
+    """Test fan-out does not drain its input before yielding."""
+    pulled = []
+
+    def items():
+        for n in range(100):
+            pulled.append(n)
+            yield n
+
+    stream = fan_out(lambda n: n, items(), max_workers=2)
+    next(stream)
+    stream.close()
+
+    assert len(pulled) < 100
+
+
+def test_fan_in_interleaves_sources_and_reports_errors():
+    """Test fan-in yields every item tagged with its source and surfaces failures."""
+
+    def failing():
+        yield 1
+        raise RuntimeError("down")
+
+    results = list(fan_in({"a": lambda: [1, 2, 3], "b": failing}))
+
+    assert sorted(item for key, item, error in results if key == "a") == [1, 2, 3]
+    assert ("b", 1, None) in results
+    errors = [error for key, item, error in results if error is not None]
+    assert len(errors) == 1 and isinstance(errors[0], RuntimeError)
+
+
+def test_guest_selector_combines_criteria():
+    """Test criteria are ANDed, repeated values ORed and explicit ids always kept."""
+    guests = [
+        {"type": "qemu", "vmid": 100, "name": "web-1", "tags": "prod;eu", "node": "pve1"},
+        {"type": "qemu", "vmid": 101, "name": "api-1", "tags": "prod", "node": "pve2"},
+        {"type": "lxc", "vmid": 102, "name": "web-2", "tags": "dev", "node": "pve1"},
+        {"type": "qemu", "vmid": 103, "name": "db-1", "tags": "prod", "node": "pve1"},
+    ]
+    selector = GuestSelector(names=["web-*", "api-*"], tags=["prod"], ids=[900])
+
+    assert selector.select(guests) == [100, 101, 900]
+    assert GuestSelector(nodes=["pve1"], where=compile_filter("vmid>100")).select(guests) == [
+        102,
+        103,
+    ]
+    assert not GuestSelector()
+    assert parse_ids("100, 101\n102") == [100, 101, 102]
+    with pytest.raises(ValueError):
+        parse_ids("100 web-1")